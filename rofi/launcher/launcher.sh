@@ -4,6 +4,9 @@ dir="$HOME/.config/rofi/launcher/"
 theme='launcher'
 
 ## Run
+# Script mode instead of `-show drun`: launcher.py keeps a parsed index of the
+# desktop entries and ranks them by how often and how recently they were used
 rofi \
-    -show drun \
+    -modi "apps:$HOME/.config/scripts/launcher.py" \
+    -show apps \
     -theme ${dir}/${theme}.rasi \
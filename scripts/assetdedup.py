@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+
+# Asset dedup + lossless SVG minifier for the bundled icon, cursor and GTK themes
+# 1. Every SVG is minified: comments, <metadata>, editor (Inkscape/Sodipodi)
+#    elements, attributes and namespaces and inter-tag whitespace are dropped,
+#    and numbers lose redundant zeros. The result is parsed and compared with
+#    the original element by element; a file is only rewritten if they match.
+# 2. Files are hashed (after minifying) and exact duplicates inside the same
+#    theme become relative symlinks to one copy. Links never cross a theme
+#    directory, so `cp -r theme /usr/share/icons/` keeps working.
+#
+# Dry run by default: prints what would change and the before/after totals.
+#
+#   assetdedup.py [--apply] [--no-minify] [--no-dedup] [PATH ...]
+#
+# PATH defaults to the themes in this repo (.icons, sys/icons, .themes,
+# sys/cursors); each child directory of those is treated as one theme.
+
+import hashlib
+import os
+import re
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parent.parent
+DEFAULT_ROOTS = [REPO / ".icons", REPO / "sys" / "icons", REPO / ".themes", REPO / "sys" / "cursors"]
+
+EDITOR_PREFIXES = ('sodipodi', 'inkscape')
+METADATA_PREFIXES = ('rdf', 'cc', 'dc')
+EDITOR_NAMESPACES = (
+    'http://sodipodi.sourceforge.net/DTD/sodipodi-0.dtd',
+    'http://www.inkscape.org/namespaces/inkscape',
+)
+# Attributes whose values are names, not numbers
+KEEP_ATTRIBUTES = {'id', 'class', 'href', 'xlink:href', 'version'}
+
+COMMENT_RE = re.compile(r'<!--.*?-->', re.S)
+METADATA_RE = re.compile(r'<metadata\b[^>]*?(?:/>|>.*?</metadata\s*>)', re.S)
+EDITOR_ELEMENT_RE = re.compile(
+    r'<((?:sodipodi|inkscape):[\w.-]+)\b[^>]*?(?:/>|>.*?</\1\s*>)', re.S)
+ATTRIBUTE_RE = re.compile(r'(\s+)([\w:.-]+)(\s*=\s*)("[^"]*"|\'[^\']*\')')
+TAG_RE = re.compile(r'<[^!?/][^>]*>', re.S)
+BETWEEN_TAGS_RE = re.compile(r'>\s+<')
+NUMBER_RE = re.compile(r'(?<![\w#.])(-?\d*\.\d+|-?\d+\.)(?![\w.])')
+# Any number in an attribute value, for checking the minified values
+VALUE_NUMBER_RE = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+BLOCK_SIZE = 4096  # Disk usage is estimated as whole blocks of this size
+
+def trim_number(match):
+    """'1.500' -> '1.5', '2.0' -> '2', '-0.0' -> '0'; never changes the value"""
+    text = match.group(0)
+    integer, _, fraction = text.partition('.')
+    fraction = fraction.rstrip('0')
+    if fraction:
+        return f"{integer}.{fraction}"
+    return '0' if integer in ('', '-', '-0') else integer
+
+def minify_tag(tag, drop_prefixes):
+    def attribute(match):
+        _, name, _, value = match.groups()
+        prefix = name.split(':', 1)[0] if ':' in name else None
+        if prefix in drop_prefixes or (prefix == 'xmlns' and name.split(':', 1)[1] in drop_prefixes):
+            return ''
+        if name not in KEEP_ATTRIBUTES and not name.startswith('xmlns'):
+            value = value[0] + NUMBER_RE.sub(trim_number, value[1:-1]) + value[-1]
+        return f" {name}={value}"
+    return ATTRIBUTE_RE.sub(attribute, tag)
+
+def minify_svg(text):
+    """Return minified SVG text, or None if it can't be done safely"""
+    if 'xml:space' in text or '<text' in text or '<tspan' in text:
+        return None  # Whitespace in text content is significant
+    out = COMMENT_RE.sub('', text)
+    out = METADATA_RE.sub('', out)
+    out = EDITOR_ELEMENT_RE.sub('', out)
+    # Only drop a namespace once nothing uses its prefix any more
+    drop = tuple(p for p in EDITOR_PREFIXES + METADATA_PREFIXES
+                 if not re.search(rf'<{p}:', out))
+    out = TAG_RE.sub(lambda m: minify_tag(m.group(0), drop), out)
+    out = BETWEEN_TAGS_RE.sub('><', out).strip() + "\n"
+    return out
+
+def parsed_value(value):
+    """An attribute value as (text with numbers blanked out, numbers as floats)"""
+    return VALUE_NUMBER_RE.sub('\0', value), [float(n) for n in VALUE_NUMBER_RE.findall(value)]
+
+def _comparable(element, skip_namespaces):
+    """(tag, attributes, text, children) with editor bits removed and numbers as values"""
+    attributes = {}
+    for name, value in element.attrib.items():
+        if any(name.startswith('{' + ns) for ns in skip_namespaces):
+            continue
+        if name.rsplit('}', 1)[-1] not in KEEP_ATTRIBUTES:
+            value = parsed_value(value)
+        attributes[name] = value
+    children = [_comparable(child, skip_namespaces) for child in element
+                if isinstance(child.tag, str)
+                and not child.tag.endswith('}metadata') and child.tag != 'metadata'
+                and not any(child.tag.startswith('{' + ns) for ns in skip_namespaces)]
+    return element.tag, attributes, (element.text or '').strip(), children
+
+def equivalent(original, minified):
+    """
+    True if both documents parse to the same rendering-relevant tree. Numbers
+    are compared by value as written in each file, independently of
+    trim_number, so a trimming mistake shows up as a mismatch.
+    """
+    try:
+        a = ET.fromstring(original)
+        b = ET.fromstring(minified)
+    except ET.ParseError:
+        return False
+    return _comparable(a, EDITOR_NAMESPACES) == _comparable(b, EDITOR_NAMESPACES)
+
+def theme_dirs(paths):
+    """Each child directory of a root is one theme; a plain directory is one theme itself"""
+    for path in paths:
+        path = Path(path)
+        if path.is_dir() and not (path / "index.theme").exists() and any(p.is_dir() for p in path.iterdir()):
+            yield from sorted(p for p in path.iterdir() if p.is_dir() and not p.is_symlink())
+        elif path.is_dir():
+            yield path
+
+def walk(theme):
+    for directory, dirs, files in os.walk(theme):
+        dirs.sort()
+        for name in sorted(files):
+            yield Path(directory, name)
+
+def disk_usage(size):
+    """Bytes a file of SIZE occupies, counted in whole BLOCK_SIZE blocks"""
+    return -(-size // BLOCK_SIZE) * BLOCK_SIZE
+
+class Totals:
+    # Symlinks are counted as inodes only; short targets live inside the inode
+    def __init__(self):
+        self.files = 0
+        self.symlinks = 0
+        self.bytes = 0
+        self.blocks = 0
+
+    def add(self, path):
+        st = os.lstat(path)
+        if path.is_symlink():
+            self.symlinks += 1
+        else:
+            self.files += 1
+            self.bytes += st.st_size
+            self.blocks += disk_usage(st.st_size)
+
+def process_theme(theme, minify, dedup, apply):
+    """Returns (before, after, actions) for one theme"""
+    before, after = Totals(), Totals()
+    contents = {}  # path -> bytes after minifying
+    actions = []
+    for path in walk(theme):
+        before.add(path)
+        if path.is_symlink():
+            continue
+        data = path.read_bytes()
+        if minify and path.suffix == '.svg':
+            try:
+                text = data.decode()
+            except UnicodeDecodeError:
+                text = None
+            small = text and minify_svg(text)
+            if small and len(small.encode()) < len(data) and equivalent(data, small.encode()):
+                actions.append(('minify', path, len(data) - len(small.encode())))
+                data = small.encode()
+                if apply:
+                    tmp = path.with_name(f".{path.name}.tmp")
+                    tmp.write_bytes(data)
+                    os.replace(tmp, path)
+        contents[path] = data
+
+    if dedup:
+        by_hash = {}
+        for path, data in contents.items():
+            by_hash.setdefault(hashlib.sha256(data).digest(), []).append(path)
+        for paths in by_hash.values():
+            if len(paths) < 2:
+                continue
+            # Shortest path wins, so links point towards the plainest name
+            keep, *duplicates = sorted(paths, key=lambda p: (len(p.parts), str(p)))
+            for path in duplicates:
+                target = os.path.relpath(keep, path.parent)
+                actions.append(('link', path, len(contents[path]), target))
+                if apply:
+                    tmp = path.with_name(f".{path.name}.lnk")
+                    os.symlink(target, tmp)
+                    os.replace(tmp, path)
+                contents[path] = None
+
+    if apply:
+        for path in walk(theme):
+            after.add(path)
+    else:
+        # Project the result without touching anything, estimated like before
+        after.symlinks = before.symlinks
+        for path, data in contents.items():
+            if data is None:
+                after.symlinks += 1
+            else:
+                after.files += 1
+                after.bytes += len(data)
+                after.blocks += disk_usage(len(data))
+    return before, after, actions
+
+def report(name, before, after):
+    # A symlink still takes an inode, so dedup moves inodes from "files" to
+    # "symlinks" rather than freeing them; what it frees is the data blocks.
+    print(f"{name}")
+    print(f"  inodes    {before.files + before.symlinks:>8} -> {after.files + after.symlinks:<8}"
+          f" (files {before.files} -> {after.files}, symlinks {before.symlinks} -> {after.symlinks})")
+    print(f"  bytes     {before.bytes:>8} -> {after.bytes:<8} ({before.bytes - after.bytes:+d} saved)")
+    print(f"  on disk   {before.blocks:>8} -> {after.blocks:<8} ({before.blocks - after.blocks:+d} saved,"
+          f" {BLOCK_SIZE // 1024} KiB blocks)")
+
+def main():
+    args = sys.argv[1:]
+    apply = '--apply' in args
+    verbose = '--verbose' in args
+    paths = [a for a in args if not a.startswith('--')] or [p for p in DEFAULT_ROOTS if p.exists()]
+
+    total_before, total_after = Totals(), Totals()
+    for theme in theme_dirs(paths):
+        before, after, actions = process_theme(theme, minify='--no-minify' not in args,
+                                               dedup='--no-dedup' not in args, apply=apply)
+        if verbose:
+            for action in actions:
+                if action[0] == 'minify':
+                    print(f"  minify {action[1]} (-{action[2]} bytes)")
+                else:
+                    print(f"  link   {action[1]} -> {action[3]}")
+        report(theme, before, after)
+        for total, part in ((total_before, before), (total_after, after)):
+            total.files += part.files
+            total.symlinks += part.symlinks
+            total.bytes += part.bytes
+            total.blocks += part.blocks
+
+    report("total", total_before, total_after)
+    if not apply:
+        print("\nDry run; pass --apply to rewrite files and create symlinks.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+
+# Waybar module host
+# Runs the salaat and temperature modules in one asyncio process. Each module
+# says when it next needs to run and how late it may run; the host wakes at
+# the earliest "latest allowed" time and runs every module that is due by
+# then, so modules share wakeups instead of each keeping its own timer.
+# Every run is its own task on a worker thread, so a module blocked on the
+# network (salaat with USE_API) only delays itself, not cpu/gpu.
+# The latest JSON line of each module is published on a Unix socket; waybar
+# runs barread.py per module, which just relays lines to stdout.
+#
+#   barhost.py              Run the host (autostart; barread.py starts it if needed)
+#   barhost.py stats        Print per-module timing and wakeup counts as JSON
+#
+# Socket protocol: send "<module>\n" to subscribe (the current line is sent
+# at once, then every change), or "stats\n" for a single JSON reply.
+
+import asyncio
+import fcntl
+import json
+import os
+import sys
+import time
+
+SOCKET_PATH = os.path.join(os.environ.get("XDG_RUNTIME_DIR", "/tmp"), "neon-barhost.sock")
+
+class Module:
+    """A waybar module: update() returns the payload, delay() the seconds until the next run"""
+    name = None
+    slack = 1.0  # How late the module may run so it can share a wakeup
+    interval = 60.0  # Seconds until the next run when delay() itself fails
+
+    def update(self):
+        raise NotImplementedError
+
+    def delay(self):
+        raise NotImplementedError
+
+class SalaatModule(Module):
+    name = 'salaat'
+    slack = 2.0  # A prayer boundary shown a second or two late is fine
+
+    def __init__(self):
+        import salaat
+        self.salaat = salaat
+        self.times = None
+
+    def update(self):
+        output, self.times = self.salaat.build_output()
+        return output or self.salaat.ERROR_OUTPUT
+
+    def delay(self):
+        return self.salaat.refresh_delay(self.times)
+
+class TemperatureModule(Module):
+    def __init__(self, name):
+        from hwmon import TemperatureReader
+        self.name = name
+        self.reader = TemperatureReader(name)
+
+    def update(self):
+        return self.reader.sample()
+
+    def delay(self):
+        return self.reader.delay()
+
+MODULES = {
+    'salaat': SalaatModule,
+    'cpu': lambda: TemperatureModule('cpu'),
+    'gpu': lambda: TemperatureModule('gpu'),
+}
+
+class Stats:
+    def __init__(self):
+        self.runs = 0
+        self.published = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_ms = 0.0
+
+    def add(self, elapsed_ms):
+        self.runs += 1
+        self.last_ms = elapsed_ms
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def as_dict(self):
+        return {
+            'runs': self.runs,
+            'published': self.published,
+            'last_ms': round(self.last_ms, 3),
+            'avg_ms': round(self.total_ms / self.runs, 3) if self.runs else 0,
+            'max_ms': round(self.max_ms, 3),
+        }
+
+class BarHost:
+    def __init__(self, modules):
+        self.modules = modules
+        self.deadlines = {m.name: 0.0 for m in modules}  # Run everything on start
+        self.lines = {}
+        self.subscribers = {m.name: set() for m in modules}
+        self.stats = {m.name: Stats() for m in modules}
+        self.wakeups = 0
+        self.started = time.monotonic()
+        self.running = set()  # Tasks of module runs still in flight
+        self.rescheduled = asyncio.Event()  # A run finished and set a new deadline
+
+    def due(self):
+        """Modules to run at the next wakeup, and when that wakeup is"""
+        wake = min(self.deadlines[m.name] + m.slack for m in self.modules)
+        return [m for m in self.modules if self.deadlines[m.name] <= wake], wake
+
+    async def run_module(self, module):
+        start = time.perf_counter()
+        try:
+            # Modules may block (salaat can hit the network on a cache miss)
+            output = await asyncio.to_thread(module.update)
+        except Exception as e:
+            output = {'text': "N/A", 'tooltip': f"{module.name}: {e}", 'class': 'error'}
+        self.stats[module.name].add((time.perf_counter() - start) * 1000)
+        try:
+            delay = module.delay()
+        except Exception as e:
+            print(f"barhost: {module.name}: delay() failed ({e}), retrying in {module.interval:g}s",
+                  file=sys.stderr)
+            delay = module.interval
+        self.deadlines[module.name] = time.monotonic() + delay
+        self.rescheduled.set()
+        self.publish(module.name, json.dumps(output))
+
+    def publish(self, name, line):
+        if self.lines.get(name) == line:
+            return
+        self.lines[name] = line
+        self.stats[name].published += 1
+        for writer in list(self.subscribers[name]):
+            try:
+                writer.write(line.encode() + b"\n")
+            except (ConnectionError, RuntimeError):
+                self.subscribers[name].discard(writer)
+
+    async def tick_loop(self):
+        while True:
+            modules, wake = self.due()
+            delay = wake - time.monotonic()
+            if delay > 0:
+                # Sleep until the wakeup, or until a run in flight moves its deadline
+                self.rescheduled.clear()
+                try:
+                    await asyncio.wait_for(self.rescheduled.wait(), None if delay == float('inf') else delay)
+                    continue
+                except asyncio.TimeoutError:
+                    pass
+            self.wakeups += 1
+            for module in modules:
+                self.deadlines[module.name] = float('inf')  # Not due again until this run finishes
+                task = asyncio.create_task(self.run_module(module))
+                self.running.add(task)
+                task.add_done_callback(self.running.discard)
+
+    def report(self):
+        return {
+            'uptime_s': round(time.monotonic() - self.started, 1),
+            'wakeups': self.wakeups,
+            'modules': {name: stats.as_dict() for name, stats in self.stats.items()},
+        }
+
+    async def handle_client(self, reader, writer):
+        request = (await reader.readline()).decode().strip()
+        if request == 'stats':
+            writer.write(json.dumps(self.report()).encode() + b"\n")
+            await writer.drain()
+            writer.close()
+            return
+        if request not in self.subscribers:
+            writer.write(json.dumps({'text': "N/A", 'tooltip': f"Unknown module {request}",
+                                     'class': 'error'}).encode() + b"\n")
+            writer.close()
+            return
+
+        self.subscribers[request].add(writer)
+        if request in self.lines:
+            writer.write(self.lines[request].encode() + b"\n")
+        try:
+            await reader.read()  # Readers never send more; EOF means waybar went away
+        finally:
+            self.subscribers[request].discard(writer)
+            writer.close()
+
+    async def serve(self):
+        server = await asyncio.start_unix_server(self.handle_client, SOCKET_PATH)
+        os.chmod(SOCKET_PATH, 0o600)  # Only this user's waybar may subscribe
+        async with server:
+            await self.tick_loop()
+
+def acquire_lock():
+    """Hold an exclusive lock for the host's lifetime; None if another host runs"""
+    lock = open(SOCKET_PATH + ".lock", "w")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock.close()
+        return None
+    return lock
+
+def print_stats():
+    import socket
+    with socket.socket(socket.AF_UNIX) as sock:
+        sock.connect(SOCKET_PATH)
+        sock.sendall(b"stats\n")
+        reply = sock.makefile().readline()
+    print(json.dumps(json.loads(reply), indent=2))
+
+def main():
+    if sys.argv[1:] == ['stats']:
+        try:
+            print_stats()
+        except OSError as e:
+            print(f"barhost: not running ({e})", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    lock = acquire_lock()
+    if lock is None:
+        return  # Already running
+    try:
+        os.unlink(SOCKET_PATH)  # Left over from a host that died
+    except FileNotFoundError:
+        pass
+    host = BarHost([factory() for factory in MODULES.values()])
+    try:
+        asyncio.run(host.serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        lock.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+
+# Thin waybar reader for barhost.py
+# Subscribes to one module on the host's socket and copies its JSON lines to
+# stdout. Starts the host if it isn't running, and reconnects if it restarts.
+# Deliberately imports nothing heavy: it sits blocked in recv() all day.
+#
+#   barread.py salaat|cpu|gpu
+
+import os
+import socket
+import subprocess
+import sys
+import time
+
+SOCKET_PATH = os.path.join(os.environ.get("XDG_RUNTIME_DIR", "/tmp"), "neon-barhost.sock")
+HOST = os.path.join(os.path.dirname(os.path.abspath(__file__)), "barhost.py")
+RETRY_DELAY = 0.2
+RECONNECT_DELAY = 2
+
+def connect(module):
+    """Connect and subscribe, starting the host on the first failure"""
+    started = False
+    for _ in range(50):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM | socket.SOCK_CLOEXEC)
+        try:
+            sock.connect(SOCKET_PATH)
+            sock.sendall(module.encode() + b"\n")
+            return sock
+        except OSError:
+            sock.close()
+        if not started:
+            subprocess.Popen([sys.executable, HOST], start_new_session=True,
+                             stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL)
+            started = True
+        time.sleep(RETRY_DELAY)
+    return None
+
+def main():
+    if len(sys.argv) != 2:
+        print("usage: barread.py MODULE", file=sys.stderr)
+        sys.exit(2)
+    module = sys.argv[1]
+    out = sys.stdout.buffer
+    try:
+        while True:
+            sock = connect(module)
+            if sock:
+                with sock:
+                    while data := sock.recv(4096):
+                        out.write(data)
+                        out.flush()
+            time.sleep(RECONNECT_DELAY)
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+
+# Benchmark: HyprBinds TreeView vs the old per-row Label grid
+# Generates a config with N binds, then times window construction, the first
+# frame, and a filter keystroke. Needs a display; for headless runs use
+# broadwayd + GDK_BACKEND=broadway, or xvfb-run.
+#
+#   binds_bench.py [N ...] [--json]
+
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Point HOME at a generated config before binds/hyprconf read it
+HOME = tempfile.mkdtemp(prefix="binds-bench-")
+os.environ['HOME'] = HOME
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import gi
+gi.require_version('Gtk', '3.0')
+from gi.repository import Gtk, Pango
+
+WORDS = ['Launch', 'Window', 'Workspace', 'Scratchpad', 'Hyprland', 'Toggle']
+
+def write_fixture(count):
+    wal = Path(HOME, ".cache", "wal")
+    wal.mkdir(parents=True, exist_ok=True)
+    (wal / "colors").write_text("".join(f"#{i:02x}{i:02x}{i:02x}\n" for i in range(0, 256, 16)))
+
+    hypr = Path(HOME, ".config", "hypr")
+    hypr.mkdir(parents=True, exist_ok=True)
+    with open(hypr / "hyprland.conf", "w") as f:
+        f.write("$mainMod = SUPER\n")
+        for i in range(count):
+            f.write(f"bind = $mainMod SHIFT, key{i}, exec, command{i}  # {WORDS[i % len(WORDS)]} thing {i}\n")
+    cache = Path(HOME, ".cache", "hyprconf.json")
+    if cache.exists():
+        cache.unlink()
+
+def wait_for_first_draw(win):
+    drawn = []
+    handler = win.connect("draw", lambda w, cr: drawn.append(time.perf_counter()))
+    start = time.perf_counter()
+    win.show_all()
+    while not drawn and time.perf_counter() - start < 30:
+        Gtk.main_iteration_do(False)
+    win.disconnect(handler)
+    return (drawn[0] - start) * 1000 if drawn else float('nan')
+
+def legacy_grid(categorized):
+    """The previous layout: two Labels per bind plus override_font on each"""
+    win = Gtk.Window(title="legacy")
+    win.set_default_size(300, 300)
+    scrolled = Gtk.ScrolledWindow()
+    win.add(scrolled)
+    main_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=0)
+    scrolled.add(main_box)
+    for category, binds in categorized.items():
+        if not binds:
+            continue
+        main_box.pack_start(Gtk.Label(label=category.upper()), False, False, 0)
+        grid = Gtk.Grid()
+        main_box.pack_start(grid, False, False, 0)
+        grid.attach(Gtk.Label(label="KEYBIND"), 0, 0, 1, 1)
+        grid.attach(Gtk.Label(label="DESCRIPTION"), 1, 0, 1, 1)
+        for i, (keybind, description) in enumerate(binds, start=1):
+            lbl_desc = Gtk.Label(label=description)
+            lbl_desc.set_line_wrap(True)
+            grid.attach(Gtk.Label(label=keybind), 0, i, 1, 1)
+            grid.attach(lbl_desc, 1, i, 1, 1)
+
+    font_desc = Pango.FontDescription("Jetbrains Mono Nerd Font 12")
+    def apply_font(widget):
+        if isinstance(widget, Gtk.Label):
+            widget.override_font(font_desc)
+            widget.set_ellipsize(Pango.EllipsizeMode.END)
+        elif hasattr(widget, 'get_children'):
+            for child in widget.get_children():
+                apply_font(child)
+    apply_font(main_box)
+    return win
+
+def bench(count):
+    write_fixture(count)
+    import binds
+
+    start = time.perf_counter()
+    win = binds.PixelPerfectShortcuts()
+    build = (time.perf_counter() - start) * 1000
+    first_frame = wait_for_first_draw(win)
+
+    start = time.perf_counter()
+    win.search.set_text("workspace 1")
+    win.on_search_changed(win.search)
+    while Gtk.events_pending():
+        Gtk.main_iteration_do(False)
+    filtering = (time.perf_counter() - start) * 1000
+    categorized = win.get_categorized_binds()
+    win.destroy()
+
+    start = time.perf_counter()
+    legacy = legacy_grid(categorized)
+    legacy_build = (time.perf_counter() - start) * 1000
+    legacy_first_frame = wait_for_first_draw(legacy)
+    legacy.destroy()
+
+    return {
+        'binds': count,
+        'treeview': {'build_ms': build, 'first_frame_ms': first_frame, 'filter_ms': filtering},
+        'label_grid': {'build_ms': legacy_build, 'first_frame_ms': legacy_first_frame},
+    }
+
+def main():
+    counts = [int(a) for a in sys.argv[1:] if a.isdigit()] or [100, 1000, 5000]
+    results = [bench(n) for n in counts]
+
+    if '--json' in sys.argv:
+        print(json.dumps(results, indent=1))
+        return
+
+    print(f"{'binds':>6}{'tree build':>12}{'tree frame':>12}{'filter':>9}{'grid build':>12}{'grid frame':>12}   (ms)")
+    for r in results:
+        tree, grid = r['treeview'], r['label_grid']
+        print(f"{r['binds']:>6}{tree['build_ms']:>12.1f}{tree['first_frame_ms']:>12.1f}{tree['filter_ms']:>9.1f}"
+              f"{grid['build_ms']:>12.1f}{grid['first_frame_ms']:>12.1f}")
+
+if __name__ == "__main__":
+    main()
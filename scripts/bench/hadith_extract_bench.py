@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+
+# Benchmark: BeautifulSoup parse_hadith vs the streaming extract_hadith
+# Runs both on saved pages (bench/fixtures/*.html by default, or the paths
+# given on the command line) and reports best time and peak traced memory.
+
+import json
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from hadith_parse import parse_hadith, extract_hadith
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+CHUNK_SIZE = 16384  # Same chunk size test.py streams with
+REPEAT = 5
+NUMBER = 20
+
+def chunked(content):
+    for i in range(0, len(content), CHUNK_SIZE):
+        yield content[i:i + CHUNK_SIZE]
+
+def peak_memory(func):
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+def bench(path):
+    content = Path(path).read_bytes()
+    runs = {
+        'beautifulsoup': lambda: parse_hadith(content),
+        'streaming': lambda: extract_hadith(chunked(content)),
+    }
+    if runs['beautifulsoup']() != runs['streaming']():
+        raise SystemExit(f"{path}: extractors disagree")
+
+    result = {'fixture': Path(path).name, 'bytes': len(content)}
+    for name, func in runs.items():
+        best = min(timeit.repeat(func, repeat=REPEAT, number=NUMBER)) / NUMBER
+        result[name] = {'ms': best * 1000, 'peak_kib': peak_memory(func) / 1024}
+    return result
+
+def main():
+    args = [a for a in sys.argv[1:] if a != '--json']
+    paths = args or sorted(FIXTURES.glob("*.html"))
+    results = [bench(p) for p in paths]
+
+    if '--json' in sys.argv:
+        print(json.dumps(results, indent=1))
+        return
+
+    print(f"{'fixture':<24}{'bytes':>8}{'bs4 ms':>10}{'stream ms':>11}{'bs4 KiB':>10}{'stream KiB':>12}")
+    for r in results:
+        bs4, stream = r['beautifulsoup'], r['streaming']
+        print(f"{r['fixture']:<24}{r['bytes']:>8}{bs4['ms']:>10.2f}{stream['ms']:>11.2f}"
+              f"{bs4['peak_kib']:>10.0f}{stream['peak_kib']:>12.0f}")
+
+if __name__ == "__main__":
+    main()
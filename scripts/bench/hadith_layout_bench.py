@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+
+# Benchmark: SunnahApp's TextView vs the old wrapped Label in a Viewport
+# Takes the long fixture hadith (bench/fixtures/bukhari_long.html) repeated
+# up to N characters and, for each widget, times
+#   show      setting the text until the next frame is drawn
+#   resize    each of RESIZE_STEPS window widths until its frame (mean / worst)
+#   scroll    each of SCROLL_STEPS scroll positions until its frame (mean / worst)
+# Needs a display; for headless runs use broadwayd + GDK_BACKEND=broadway, or
+# xvfb-run. The new widget is a real SunnahApp, pointed at a dead sunnah.com
+# and an empty store so it doesn't fetch anything.
+#
+#   hadith_layout_bench.py [N ...] [--json]
+
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HOME = tempfile.mkdtemp(prefix="hadith-layout-bench-")
+os.environ['HOME'] = HOME
+os.environ['SUNNAH_URL'] = "http://127.0.0.1:9"
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import gi
+gi.require_version('Gtk', '3.0')
+from gi.repository import Gtk
+
+import test
+from hadith_parse import extract_hadith
+
+FIXTURE = Path(__file__).resolve().parent / "fixtures" / "bukhari_long.html"
+RESIZE_STEPS = 20
+SCROLL_STEPS = 20
+FRAME_TIMEOUT = 5
+
+def hadith_of_length(length):
+    text, reference = extract_hadith([FIXTURE.read_bytes()])
+    paragraphs = text.splitlines(keepends=True)
+    out = []
+    while sum(map(len, out)) < length:
+        out.append(paragraphs[len(out) % len(paragraphs)])
+    return "".join(out), reference
+
+def frame_ms(win, action):
+    """Run ACTION and wait for the window's next draw"""
+    drawn = []
+    handler = win.connect("draw", lambda w, cr: drawn.append(time.perf_counter()))
+    start = time.perf_counter()
+    action()
+    while not drawn and time.perf_counter() - start < FRAME_TIMEOUT:
+        Gtk.main_iteration_do(False)
+    win.disconnect(handler)
+    return (drawn[0] - start) * 1000 if drawn else float('nan')
+
+def settle():
+    while Gtk.events_pending():
+        Gtk.main_iteration_do(False)
+
+def legacy_window():
+    """The previous layout: one wrapped Label with per-label CSS inside a Viewport"""
+    win = Gtk.Window(title="legacy")
+    win.set_default_size(800, 600)
+    scrolled = Gtk.ScrolledWindow()
+    win.add(scrolled)
+    label = Gtk.Label(label="Fetching Hadith...")
+    label.set_line_wrap(True)
+    label.set_justify(Gtk.Justification.LEFT)
+    label.set_halign(Gtk.Align.START)
+    label.get_style_context().add_class("hadith-text")
+    viewport = Gtk.Viewport()
+    viewport.add(label)
+    scrolled.add(viewport)
+    provider = Gtk.CssProvider()
+    provider.load_from_data(b".hadith-text { font-size: 16px; font-family: serif; line-height: 1.6; }")
+    Gtk.StyleContext.add_provider_for_screen(win.get_screen(), provider,
+                                             Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
+
+    def show(hadith):
+        text, reference = hadith
+        label.set_label(text + "\n\n" + reference)
+    return win, scrolled, show
+
+def textview_window():
+    win = test.SunnahApp(application=None)
+    win.current_cancel.set()  # Drop the startup fetch so its error can't replace our text
+    scrolled = win.hadith_view.get_parent()
+    return win, scrolled, lambda hadith: win.show_hadith(0, hadith)
+
+def measure(factory, hadith):
+    win, scrolled, show = factory()
+    win.show_all()
+    frame_ms(win, lambda: None)
+    settle()
+
+    shown = frame_ms(win, lambda: show(hadith))
+    settle()
+
+    resizes = []
+    for step in range(RESIZE_STEPS):
+        width = 500 + (step * 37) % 500
+        resizes.append(frame_ms(win, lambda: win.resize(width, 600)))
+    settle()
+
+    scrolls = []
+    adjustment = scrolled.get_vadjustment()
+    for step in range(1, SCROLL_STEPS + 1):
+        value = (adjustment.get_upper() - adjustment.get_page_size()) * step / SCROLL_STEPS
+        scrolls.append(frame_ms(win, lambda: adjustment.set_value(value)))
+    win.destroy()
+    settle()
+    return {
+        'show_ms': shown,
+        'resize_mean_ms': sum(resizes) / len(resizes),
+        'resize_worst_ms': max(resizes),
+        'scroll_mean_ms': sum(scrolls) / len(scrolls),
+        'scroll_worst_ms': max(scrolls),
+    }
+
+def bench(length):
+    hadith = hadith_of_length(length)
+    return {
+        'chars': len(hadith[0]) + len(hadith[1]),
+        'textview': measure(textview_window, hadith),
+        'label': measure(legacy_window, hadith),
+    }
+
+def main():
+    lengths = [int(a) for a in sys.argv[1:] if a.isdigit()] or [2000, 10000, 40000]
+    results = [bench(n) for n in lengths]
+
+    if '--json' in sys.argv:
+        print(json.dumps(results, indent=1))
+        return
+
+    print(f"{'chars':>7}  {'widget':<9}{'show':>8}{'resize':>9}{'worst':>8}{'scroll':>9}{'worst':>8}   (ms)")
+    for r in results:
+        for widget in ('textview', 'label'):
+            m = r[widget]
+            print(f"{r['chars']:>7}  {widget:<9}{m['show_ms']:>8.1f}{m['resize_mean_ms']:>9.1f}"
+                  f"{m['resize_worst_ms']:>8.1f}{m['scroll_mean_ms']:>9.1f}{m['scroll_worst_ms']:>8.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+
+# Benchmark: launcher.py index vs parsing every desktop entry
+# Generates an XDG tree with N applications spread over a data home, two data
+# dirs and a vendor subdirectory (with shadowed, hidden and localized entries),
+# then times
+#   parse all     reading every .desktop file, what `rofi -show drun` does per open
+#   cold index    launcher.py with no index on disk
+#   warm index    index present, nothing changed (a normal open)
+#   one changed   one directory's mtime bumped, so only it is reparsed
+#   rows          ranking plus the rofi script-mode output for a warm open
+#
+#   launcher_bench.py [N ...] [--json]
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HOME = tempfile.mkdtemp(prefix="launcher-bench-")
+os.environ['HOME'] = HOME
+os.environ['XDG_DATA_HOME'] = os.path.join(HOME, "home")
+os.environ['XDG_DATA_DIRS'] = f"{HOME}/local:{HOME}/usr"
+os.environ['XDG_STATE_HOME'] = os.path.join(HOME, "state")
+os.environ['LANG'] = "de_DE.UTF-8"
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import launcher
+
+REPEAT = 5
+
+def best_ms(func, repeat=REPEAT):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times)
+
+def write_fixture(count):
+    for name in ("home", "local", "usr"):
+        shutil.rmtree(Path(HOME, name), ignore_errors=True)
+    dirs = [Path(HOME, "usr", "applications"), Path(HOME, "usr", "applications", "vendor"),
+            Path(HOME, "local", "applications"), Path(HOME, "home", "applications")]
+    for directory in dirs:
+        directory.mkdir(parents=True, exist_ok=True)
+    for i in range(count):
+        directory = dirs[i % 3]
+        (directory / f"app{i}.desktop").write_text(
+            "[Desktop Entry]\n"
+            "Type=Application\n"
+            f"Name=App {i}\n"
+            f"Name[de]=Anwendung {i}\n"
+            f"GenericName=Generic thing {i}\n"
+            f"Keywords=alpha;beta;{i};\n"
+            f"Icon=app{i}\n"
+            f"Exec=app{i} --flag %U\n"
+            f"{'NoDisplay=true' if i % 17 == 0 else 'Categories=Utility;'}\n"
+            "\n[Desktop Action new]\nName=New window\nExec=app --new\n")
+        if i % 10 == 0:
+            # Shadow it from the data home
+            (dirs[3] / f"app{i}.desktop").write_text("[Desktop Entry]\nHidden=true\n")
+    return dirs
+
+def parse_all():
+    locales = launcher.locale_keys()
+    return [launcher.parse_entry(path, locales)
+            for directory in launcher.application_dirs()
+            for path in Path(directory).rglob("*.desktop")]
+
+def bench(count):
+    dirs = write_fixture(count)
+    parse = best_ms(parse_all)
+    cold = best_ms(lambda: (launcher.INDEX_FILE.unlink(missing_ok=True), launcher.build_index()))
+    apps = launcher.build_index()
+    warm = best_ms(launcher.build_index)
+
+    def touch_one():
+        os.utime(dirs[1], ns=(time.time_ns(), time.time_ns()))
+        launcher.build_index()
+    changed = best_ms(touch_one)
+
+    history = {app: {'score': 3.0, 'last': time.time()} for app in list(apps)[:20]}
+    rows = best_ms(lambda: "".join(launcher.rofi_rows(launcher.ranked(launcher.build_index(), history))))
+    return {
+        'apps': count,
+        'visible': len(launcher.ranked(apps, {})),
+        'parse_all_ms': parse,
+        'cold_index_ms': cold,
+        'warm_index_ms': warm,
+        'one_changed_ms': changed,
+        'rows_ms': rows,
+    }
+
+def main():
+    counts = [int(a) for a in sys.argv[1:] if not a.startswith('--')] or [100, 500, 2000]
+    results = [bench(count) for count in counts]
+    shutil.rmtree(HOME, ignore_errors=True)
+
+    if '--json' in sys.argv:
+        print(json.dumps(results, indent=1))
+        return
+
+    print(f"{'apps':>6}{'visible':>9}{'parse all':>11}{'cold':>9}{'warm':>9}{'1 dir':>9}{'rows':>9}   (ms)")
+    for r in results:
+        print(f"{r['apps']:>6}{r['visible']:>9}{r['parse_all_ms']:>11.1f}{r['cold_index_ms']:>9.1f}"
+              f"{r['warm_index_ms']:>9.1f}{r['one_changed_ms']:>9.1f}{r['rows_ms']:>9.1f}")
+
+if __name__ == "__main__":
+    main()
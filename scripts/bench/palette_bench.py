@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+# Benchmark: wallpaper palette paths
+# For each image (hypr/bg/*.jpg by default, or the paths given) times
+#   wal          `wal -i IMAGE --cols16 -n -q` in a scratch HOME (skipped if not installed)
+#   extract      palette.py's NumPy median cut, no cache
+#   cache hit    palette.py with the palette already cached (what a normal boot does)
+#
+#   palette_bench.py [IMAGE ...] [--json]
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Keep the palette cache out of the real ~/.cache
+HOME = tempfile.mkdtemp(prefix="palette-bench-")
+os.environ['HOME'] = HOME
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import palette
+
+IMAGES = Path(__file__).resolve().parents[2] / "hypr" / "bg"
+REPEAT = 5
+
+def best_ms(func, repeat=REPEAT):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times)
+
+def clear_cache():
+    shutil.rmtree(palette.CACHE_DIR, ignore_errors=True)
+
+def time_wal(image):
+    if not shutil.which("wal"):
+        return None
+    command = ["wal", "-i", str(image), "--cols16", "-n", "-q", "-e", "-s", "-t"]
+    # Clear wal's own scheme cache each run so it really quantizes
+    return best_ms(lambda: (shutil.rmtree(Path(HOME, ".cache", "wal"), ignore_errors=True),
+                            subprocess.run(command, check=True)), repeat=3)
+
+def bench(image):
+    cold = best_ms(lambda: (clear_cache(), palette.cached_palette(image)))
+    palette.cached_palette(image)
+    warm = best_ms(lambda: palette.cached_palette(image))
+    return {
+        'image': image.name,
+        'bytes': image.stat().st_size,
+        'wal_ms': time_wal(image),
+        'extract_ms': cold,
+        'cache_hit_ms': warm,
+    }
+
+def main():
+    paths = [Path(a) for a in sys.argv[1:] if not a.startswith('--')]
+    images = paths or sorted(IMAGES.glob("*.jpg"))
+    results = [bench(image.resolve()) for image in images]
+    shutil.rmtree(HOME, ignore_errors=True)
+
+    if '--json' in sys.argv:
+        print(json.dumps(results, indent=1))
+        return
+
+    print(f"{'image':<26}{'KiB':>8}{'wal':>10}{'extract':>10}{'cached':>10}   (ms)")
+    for r in results:
+        wal = "n/a" if r['wal_ms'] is None else f"{r['wal_ms']:.1f}"
+        print(f"{r['image']:<26}{r['bytes'] / 1024:>8.0f}{wal:>10}{r['extract_ms']:>10.1f}{r['cache_hit_ms']:>10.2f}")
+
+if __name__ == "__main__":
+    main()
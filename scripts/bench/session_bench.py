@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+# Benchmark: sessionctl.py against a python-dbusmock logind
+# Starts a private system bus with dbusmock's logind template, installs hook
+# scripts in a scratch HOME (N that sleep HOOK_SLEEP, plus one that hangs past
+# its timeout) and times each action end to end: hooks, then the action.
+# The mock's call log confirms which logind method each action reached.
+# With no Hyprland socket, logout goes to login1 TerminateSession and lock
+# runs LOCK_COMMAND directly, which is swapped for `true` here.
+#
+#   session_bench.py [N ...] [--json]
+#
+# Needs python-dbusmock (and dbus-python, which it uses) plus PyGObject.
+
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HOME = tempfile.mkdtemp(prefix="session-bench-")
+os.environ['HOME'] = HOME
+os.environ['HYPRLAND_SOCKET_DIR'] = os.path.join(HOME, "no-hyprland")
+os.environ['XDG_SESSION_ID'] = "c1"
+
+import dbus
+import dbusmock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+HOOK_SLEEP = 0.2
+HANG_TIMEOUT = 0.5
+EXPECTED = {'lock': None, 'logout': "TerminateSession",
+            'poweroff': "PowerOff", 'reboot': "Reboot"}
+
+def write_hooks(count):
+    root = Path(HOME, ".config", "hypr", "session-hooks")
+    for event in ("pre-lock", "pre-logout", "pre-shutdown"):
+        directory = root / f"{event}.d"
+        directory.mkdir(parents=True, exist_ok=True)
+        for old in directory.iterdir():
+            old.unlink()
+        for i in range(count):
+            hook = directory / f"{i:02d}-sleep"
+            hook.write_text(f"#!/bin/sh\nsleep {HOOK_SLEEP}\n")
+            hook.chmod(0o755)
+        hang = directory / "99-hang"
+        hang.write_text(f"#!/bin/sh\n# timeout: {HANG_TIMEOUT}\nsleep 60\n")
+        hang.chmod(0o755)
+
+def start_logind():
+    """Private system bus (DBUS_SYSTEM_BUS_ADDRESS) with the logind template on it"""
+    dbusmock.DBusTestCase.start_system_bus()
+    server, manager = dbusmock.DBusTestCase.spawn_server_template('logind', {}, system_bus=True)
+    mock = dbus.Interface(manager, dbusmock.MOCK_IFACE)
+    # Not every template version has it; AddMethod replaces it if it does
+    mock.AddMethod("org.freedesktop.login1.Manager", "TerminateSession", "s", "", "")
+    return server, mock
+
+def bench(actions, mock, count):
+    write_hooks(count)
+    results = []
+    for action in EXPECTED:
+        mock.ClearCalls()
+        start = time.perf_counter()
+        hooks = actions.perform(action)
+        total = (time.perf_counter() - start) * 1000
+        calls = [str(call[1]) for call in mock.GetCalls()]
+        results.append({
+            'hooks': len(hooks),
+            'action': action,
+            'total_ms': total,
+            'slowest_hook_ms': max(h.ms for h in hooks),
+            'timed_out': sum(1 for h in hooks if h.status == "timed out"),
+            'login1_call': EXPECTED[action] if EXPECTED[action] in calls else None,
+            'login1_ok': (EXPECTED[action] in calls) if EXPECTED[action] else not calls,
+        })
+    return results
+
+def main():
+    counts = [int(a) for a in sys.argv[1:] if a.isdigit()] or [1, 8, 32]
+    server, mock = start_logind()
+    try:
+        import sessionctl
+        sessionctl.LOCK_COMMAND = "true"  # Don't lock the machine running the bench
+        actions = sessionctl.SessionActions()
+        results = [r for count in counts for r in bench(actions, mock, count)]
+    finally:
+        server.terminate()
+        server.wait()
+        dbusmock.DBusTestCase.tearDownClass()
+
+    if '--json' in sys.argv:
+        print(json.dumps(results, indent=1))
+        return
+
+    print(f"{'hooks':>6}  {'action':<9}{'total':>9}{'slowest':>9}{'killed':>8}  login1 call   (ms)")
+    for r in results:
+        print(f"{r['hooks']:>6}  {r['action']:<9}{r['total_ms']:>9.1f}{r['slowest_hook_ms']:>9.1f}"
+              f"{r['timed_out']:>8}  {r['login1_call'] or '-'}{'' if r['login1_ok'] else ' (unexpected)'}")
+
+if __name__ == "__main__":
+    main()
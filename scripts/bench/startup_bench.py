@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+
+# Benchmark: startup latency and memory of binds.py, power.py, salaat.py and test.py
+# Everything runs in a scratch HOME with generated wal colours and a Hyprland
+# config, against a local HTTP server standing in for aladhan and sunnah.com.
+#
+#   import      `-X importtime` total and heaviest imports per script
+#   salaat      exec -> first JSON line: local maths, API with an empty cache,
+#               API with a warm cache; peak RSS (VmHWM) at that point
+#   gtk         exec -> window realized and first frame drawn, plus peak RSS,
+#               for PowerMenu, PixelPerfectShortcuts and SunnahApp (until the
+#               first hadith is on screen). Needs a display: broadwayd is
+#               started when installed, otherwise $WAYLAND_DISPLAY/$DISPLAY
+#               is used, otherwise these are reported as skipped.
+#
+#   startup_bench.py [--runs N] [--json] [--out FILE]
+#
+# Results are JSON-serialisable (with the git commit) so runs can be diffed.
+
+import json
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+SCRIPTS = Path(__file__).resolve().parent.parent
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+sys.path.insert(0, str(SCRIPTS))
+from praytimes import PrayTimes
+import salaat
+
+RUNS = 5
+TIMEOUT = 30
+BROADWAY_DISPLAY = ":27"
+
+# Runs inside the child: build one window, wait for its first frame, report
+CHILD_GTK = r"""
+import json, os, sys, time
+sys.path.insert(0, {scripts!r})
+
+def since_exec():
+    with open("/proc/self/stat") as f:
+        start = int(f.read().rsplit(')', 1)[1].split()[19])
+    return time.clock_gettime(time.CLOCK_BOOTTIME) - start / os.sysconf('SC_CLK_TCK')
+
+import gi
+gi.require_version('Gtk', '3.0')
+from gi.repository import Gtk
+import {module} as target
+imported = since_exec()
+
+win = {factory}
+marks = {{}}
+win.connect("realize", lambda w: marks.setdefault('realized', since_exec()))
+win.connect("draw", lambda w, cr: marks.setdefault('first_frame', since_exec()))
+win.show_all()
+ready = {ready}
+deadline = time.monotonic() + {timeout}
+while ('first_frame' not in marks or not ready()) and time.monotonic() < deadline:
+    Gtk.main_iteration_do(False)
+marks['ready'] = since_exec()
+print(json.dumps({{'imported_ms': imported * 1000,
+                  'realized_ms': marks.get('realized', float('nan')) * 1000,
+                  'first_frame_ms': marks.get('first_frame', float('nan')) * 1000,
+                  'ready_ms': marks['ready'] * 1000}}), flush=True)
+time.sleep(60)  # Parent reads VmHWM, then kills us
+"""
+
+GTK_TARGETS = {
+    'power': ('power', "target.PowerMenu()", "lambda: True"),
+    'binds': ('binds', "target.PixelPerfectShortcuts()", "lambda: True"),
+    'sunnah': ('test', "target.SunnahApp(application=None)",
+               "lambda: win.status_label.get_text().startswith('Fetched')"),
+}
+
+IMPORT_TARGETS = ['power', 'binds', 'salaat', 'test']
+
+class StubHandler(BaseHTTPRequestHandler):
+    """aladhan's calendarByCity and sunnah.com hadith pages"""
+
+    def do_GET(self):
+        match = re.match(r'/v1/calendarByCity/(\d+)/(\d+)', self.path)
+        if match:
+            body = json.dumps(calendar(int(match[1]), int(match[2]))).encode()
+            self.reply(body, "application/json")
+        elif re.match(r'/bukhari:\d+', self.path):
+            self.reply((FIXTURES / "bukhari_short.html").read_bytes(), "text/html")
+        else:
+            self.send_error(404)
+
+    def reply(self, body, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def calendar(year, month):
+    """A month in aladhan's calendar format, computed locally"""
+    calc = PrayTimes(salaat.LATITUDE, salaat.LONGITUDE, salaat.TIMEZONE, salaat.METHOD, salaat.SCHOOL)
+    day = date(year, month, 1)
+    data = []
+    while day.month == month:
+        timings = {name: f"{t} (SAST)" for name, t in calc.timings(day).items()}
+        data.append({'timings': timings, 'date': {'gregorian': {'date': day.strftime('%d-%m-%Y')}}})
+        day += timedelta(days=1)
+    return {'code': 200, 'status': "OK", 'data': data}
+
+def make_home():
+    home = Path(tempfile.mkdtemp(prefix="startup-bench-"))
+    wal = home / ".cache" / "wal"
+    wal.mkdir(parents=True)
+    colors = [f"#{i * 16:02x}{i * 12:02x}{i * 8:02x}" for i in range(16)]
+    (wal / "colors").write_text("\n".join(colors) + "\n")
+    (wal / "colors.json").write_text(json.dumps({
+        'special': {'background': colors[0], 'foreground': colors[15], 'cursor': colors[15]},
+        'colors': {f'color{i}': c for i, c in enumerate(colors)},
+    }))
+    hypr = home / ".config" / "hypr"
+    hypr.mkdir(parents=True)
+    with open(hypr / "hyprland.conf", "w") as f:
+        f.write("$mainMod = SUPER\nsource = ~/.config/hypr/binds.conf\n")
+    shutil.copy(SCRIPTS.parent / "hypr" / "binds.conf", hypr / "binds.conf")
+    return home
+
+def peak_rss_kib(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1])
+    return None
+
+def first_line(args, env):
+    """Start a process, wait for its first stdout line; returns (ms, line, peak RSS KiB)"""
+    start = time.perf_counter()
+    proc = subprocess.Popen(args, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    try:
+        timer = threading.Timer(TIMEOUT, proc.kill)
+        timer.start()
+        line = proc.stdout.readline()
+        elapsed = (time.perf_counter() - start) * 1000
+        timer.cancel()
+        rss = peak_rss_kib(proc.pid) if line else None
+    finally:
+        proc.kill()
+        stderr = proc.communicate()[1]
+    if not line:
+        raise RuntimeError(stderr.strip().splitlines()[-1] if stderr.strip() else "no output")
+    return elapsed, line, rss
+
+def summarize(samples):
+    samples = [s for s in samples if s is not None]
+    if not samples:
+        return None
+    return {'median': round(statistics.median(samples), 2), 'min': round(min(samples), 2),
+            'max': round(max(samples), 2)}
+
+def bench_imports(env, runs):
+    results = {}
+    for module in IMPORT_TARGETS:
+        totals, top = [], None
+        for _ in range(runs):
+            proc = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", f"import sys; sys.path.insert(0, {str(SCRIPTS)!r}); import {module}"],
+                env=env, capture_output=True, text=True)
+            if proc.returncode != 0:
+                results[module] = {'error': proc.stderr.strip().splitlines()[-1]}
+                break
+            rows = []
+            for line in proc.stderr.splitlines():
+                parts = line.split('|')
+                if len(parts) == 3 and parts[0].startswith("import time:") and parts[0].split(':')[1].strip().isdigit():
+                    name = parts[2]
+                    rows.append((int(parts[0].split(':')[1]), int(parts[1]), name.strip(), len(name) - len(name.lstrip())))
+            totals.append(sum(r[0] for r in rows) / 1000)
+            top = sorted((r for r in rows if r[3] == 1), key=lambda r: -r[1])[:5]
+        else:
+            results[module] = {'total_ms': summarize(totals),
+                               'heaviest': {name: round(cum / 1000, 2) for _, cum, name, _ in top}}
+    return results
+
+def bench_salaat(env, port, runs):
+    api_env = dict(env, SALAAT_API_URL=f"http://127.0.0.1:{port}/v1")
+    api_daemon = [sys.executable, "-c",
+                  f"import sys; sys.path.insert(0, {str(SCRIPTS)!r}); import salaat; "
+                  "salaat.USE_API = True; sys.argv = ['salaat.py', '--daemon']; salaat.main()"]
+    local_daemon = [sys.executable, str(SCRIPTS / "salaat.py"), "--daemon"]
+    cache = Path(env['HOME']) / ".cache" / "prayer_times.json"
+
+    def clear():
+        cache.unlink(missing_ok=True)
+
+    modes = {
+        'local': (local_daemon, env, lambda: None),
+        'api_cold': (api_daemon, api_env, clear),
+        'api_warm': (api_daemon, api_env, lambda: None),  # Runs after api_cold filled the cache
+    }
+    results = {}
+    for mode, (args, mode_env, prepare) in modes.items():
+        times, rss = [], []
+        try:
+            for _ in range(runs):
+                prepare()
+                elapsed, line, peak = first_line(args, mode_env)
+                json.loads(line)
+                times.append(elapsed)
+                rss.append(peak)
+        except (RuntimeError, ValueError) as e:
+            results[mode] = {'error': str(e)}
+            continue
+        results[mode] = {'first_json_ms': summarize(times), 'peak_rss_kib': summarize(rss)}
+    return results
+
+def display_env(env):
+    """Environment for a GTK child, and the broadwayd process if we started one"""
+    if shutil.which("broadwayd"):
+        proc = subprocess.Popen(["broadwayd", BROADWAY_DISPLAY],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        time.sleep(0.5)
+        return dict(env, GDK_BACKEND="broadway", BROADWAY_DISPLAY=BROADWAY_DISPLAY), proc
+    if env.get('WAYLAND_DISPLAY') or env.get('DISPLAY'):
+        return env, None
+    return None, None
+
+def bench_gtk(env, port, runs):
+    gtk_env, broadway = display_env(dict(env, SUNNAH_URL=f"http://127.0.0.1:{port}"))
+    if gtk_env is None:
+        return {name: {'skipped': "no display (install broadwayd or set DISPLAY)"} for name in GTK_TARGETS}
+    results = {}
+    try:
+        for name, (module, factory, ready) in GTK_TARGETS.items():
+            code = CHILD_GTK.format(scripts=str(SCRIPTS), module=module, factory=factory,
+                                    ready=ready, timeout=TIMEOUT)
+            marks, rss = {}, []
+            try:
+                for _ in range(runs):
+                    # SunnahApp always starts from an empty store, so it goes to the stub
+                    Path(gtk_env['SUNNAH_DB']).unlink(missing_ok=True)
+                    _elapsed, line, peak = first_line([sys.executable, "-c", code], gtk_env)
+                    for key, value in json.loads(line).items():
+                        marks.setdefault(key, []).append(value)
+                    rss.append(peak)
+            except (RuntimeError, ValueError) as e:
+                results[name] = {'error': str(e)}
+                continue
+            results[name] = {key: summarize(values) for key, values in marks.items()}
+            results[name]['peak_rss_kib'] = summarize(rss)
+    finally:
+        if broadway:
+            broadway.kill()
+    return results
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=SCRIPTS,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+def print_table(report):
+    print(f"commit {report['commit']}, python {report['python']}, {report['runs']} runs (medians)\n")
+    print("import time")
+    for module, r in report['import'].items():
+        if 'error' in r:
+            print(f"  {module:<8} error: {r['error']}")
+            continue
+        heaviest = ", ".join(f"{n} {ms:.0f}" for n, ms in r['heaviest'].items())
+        print(f"  {module:<8} {r['total_ms']['median']:>8.1f} ms   ({heaviest})")
+    print("\nsalaat first JSON line")
+    for mode, r in report['salaat'].items():
+        if 'error' in r:
+            print(f"  {mode:<9} error: {r['error']}")
+            continue
+        print(f"  {mode:<9} {r['first_json_ms']['median']:>8.1f} ms   {r['peak_rss_kib']['median'] / 1024:>6.1f} MiB")
+    print("\nGTK windows (since exec)")
+    for name, r in report['gtk'].items():
+        if 'skipped' in r or 'error' in r:
+            print(f"  {name:<8} {r.get('skipped') or 'error: ' + r['error']}")
+            continue
+        print(f"  {name:<8} import {r['imported_ms']['median']:.0f} ms, realized {r['realized_ms']['median']:.0f} ms, "
+              f"first frame {r['first_frame_ms']['median']:.0f} ms, ready {r['ready_ms']['median']:.0f} ms, "
+              f"{r['peak_rss_kib']['median'] / 1024:.1f} MiB")
+
+def main():
+    args = sys.argv[1:]
+    runs = int(args[args.index('--runs') + 1]) if '--runs' in args else RUNS
+    home = make_home()
+    env = dict(os.environ, HOME=str(home), XDG_CACHE_HOME=str(home / ".cache"),
+               SUNNAH_DB=str(home / "hadith.db"), NEON_HTTP_CACHE=str(home / ".cache" / "neon-http"))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    try:
+        report = {
+            'commit': git_commit(),
+            'python': sys.version.split()[0],
+            'runs': runs,
+            'import': bench_imports(env, runs),
+            'salaat': bench_salaat(env, port, runs),
+            'gtk': bench_gtk(env, port, runs),
+        }
+    finally:
+        server.shutdown()
+        shutil.rmtree(home, ignore_errors=True)
+
+    if '--out' in args:
+        with open(args[args.index('--out') + 1], 'w') as f:
+            json.dump(report, f, indent=1)
+    if '--json' in args:
+        print(json.dumps(report, indent=1))
+    else:
+        print_table(report)
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,55 @@
 #!/usr/bin/env python3
-import gi
-gi.require_version('Gtk', '3.0')
-from gi.repository import Gtk, Gdk, Pango
-import os
-
-def get_pywal_colors():
-    """Load Pywal color scheme"""
-    colors = {}
-    with open(f"{os.environ['HOME']}/.cache/wal/colors") as f:
-        for i, line in enumerate(f):
-            colors[f'color{i}'] = line.strip()
-    return colors
+import sys
+
+import tracing
+with tracing.span("import gi"):
+    import gi
+    gi.require_version('Gtk', '3.0')
+    from gi.repository import Gtk, GLib, Pango
+
+import theme
+from hyprconf import HyprConfig
+from inotify import Inotify
+
+# Bump CSS_VERSION when editing the template so cached renders are replaced
+CSS_VERSION = 1
+CSS_TEMPLATE = """
+#hyprbinds, #hyprbinds * {{
+    font-family: 'Fira Code', monospace;
+}}
+#hyprbinds {{
+    background-color: {color0};
+}}
+#hyprbinds treeview {{
+    background-color: {color0};
+    color: {color7};
+}}
+#hyprbinds treeview:selected {{
+    background-color: {color8};
+}}
+#hyprbinds treeview header button {{
+    background: {color0};
+    border: none;
+    color: {color3};
+    font-weight: bold;
+}}
+#hyprbinds entry {{
+    background-color: {color0};
+    color: {color7};
+    margin: 0 20px 5px 20px;
+}}
+"""
 
 class PixelPerfectShortcuts(Gtk.Window):
+    @tracing.traced("binds: __init__")
     def __init__(self):
         super().__init__(title="HyprBinds")
-        colors = get_pywal_colors()
+        self.set_name("hyprbinds")  # CSS is scoped to this name
+        colors = theme.load_palette()
+        self.colors = colors
+        self.config = HyprConfig()
+        self.inotify = None
+        self.load_config()
         
         # Window configuration
         self.set_default_size(300, 300)  # Slightly wider for perfect alignment
@@ -23,61 +57,89 @@ class PixelPerfectShortcuts(Gtk.Window):
         self.set_border_width(10)
         
         # Apply Pywal styling
-        self.apply_styles(colors)
+        self.apply_styles()
         
         # Main container with perfect columns
         self.create_layout(colors)
 
-    def apply_styles(self, colors):
+        # Re-parse changed config files while the window is shown
+        self.connect("map", self.on_map)
+        self.connect("unmap", self.on_unmap)
+        tracing.first_draw(self, "binds")
+
+    @tracing.traced("binds: apply_styles")
+    def apply_styles(self):
         """Apply CSS styling from Pywal colors"""
-        css_provider = Gtk.CssProvider()
-        css = f"""
-        * {{
-            font-family: 'Fira Code', monospace;
-        }}
-        window {{
-            background-color: {colors['color0']};
-        }}
-        .category {{
-            color: {colors['color2']};
-            font-weight: bold;
-            font-size: 1.2em;
-            margin-top: 15px;
-            margin-bottom: 5px;
-            margin-left: 20px;
-        }}
-        .header {{
-            color: {colors['color3']};
-            font-weight: bold;
-            margin-bottom: 5px;
-        }}
-        .keybind {{
-            color: {colors['color4']};
-            font-weight: bold;
-            min-width: 250px;  /* Fixed width for keybinds */
-        }}
-        .description {{
-            color: {colors['color7']};
-            min-width: 400px;  /* Fixed width for descriptions */
-        }}
-        """
-        css_provider.load_from_data(css.encode())
-        Gtk.StyleContext.add_provider_for_screen(
-            Gdk.Screen.get_default(),
-            css_provider,
-            Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
-        )
+        theme.apply_css("hyprbinds", CSS_TEMPLATE, CSS_VERSION)
 
+    @tracing.traced("binds: create_layout")
     def create_layout(self, colors):
-        """Create perfectly aligned layout"""
+        """
+        Single TreeView over one model: categories are parent rows, binds are
+        children. Rows are only laid out when scrolled into view, so opening
+        and filtering stay fast with thousands of binds.
+        """
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=0)
+        self.add(box)
+
+        # Type-to-filter search
+        self.search = Gtk.SearchEntry()
+        self.search.set_placeholder_text("Filter binds...")
+        self.search.connect("search-changed", self.on_search_changed)
+        self.connect("key-press-event", lambda w, event: self.search.handle_event(event))
+        box.pack_start(self.search, False, False, 0)
+
+        self.filter_text = ""
+        self.search_texts = {}  # Category -> lowercased text of each bind
+        self.visible_categories = set()
+
+        self.tree = Gtk.TreeView()
+        self.tree.set_enable_search(False)  # The search entry filters instead
+        self.tree.set_show_expanders(False)
+        self.tree.set_level_indentation(0)
+        self.tree.set_margin_start(20)
+        self.tree.set_margin_end(20)
+
+        font = "Jetbrains Mono Nerd Font 12"
+        key_renderer = Gtk.CellRendererText(font=font, foreground=colors['color4'],
+                                            weight=Pango.Weight.BOLD, ellipsize=Pango.EllipsizeMode.END)
+        key_column = Gtk.TreeViewColumn("KEYBIND", key_renderer, text=0)
+        key_column.set_sizing(Gtk.TreeViewColumnSizing.FIXED)
+        key_column.set_fixed_width(250)  # Fixed width for keybinds
+        key_column.set_cell_data_func(key_renderer, self.render_keybind)
+        self.tree.append_column(key_column)
+
+        desc_renderer = Gtk.CellRendererText(font=font, foreground=colors['color7'],
+                                             ellipsize=Pango.EllipsizeMode.END)
+        self.desc_renderer = desc_renderer  # Recoloured in on_map
+        desc_column = Gtk.TreeViewColumn("DESCRIPTION", desc_renderer, text=1)
+        desc_column.set_sizing(Gtk.TreeViewColumnSizing.FIXED)
+        desc_column.set_fixed_width(400)  # Fixed width for descriptions
+        desc_column.set_expand(True)
+        self.tree.append_column(desc_column)
+        # Every row has the same height, so GTK never measures off-screen rows
+        self.tree.set_fixed_height_mode(True)
+
         scrolled = Gtk.ScrolledWindow()
         scrolled.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
-        self.add(scrolled)
+        scrolled.set_vexpand(True)
+        scrolled.add(self.tree)
+        box.pack_start(scrolled, True, True, 0)
+
+        self.populate_store()
 
-        main_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=0)
-        scrolled.add(main_box)
+    def render_keybind(self, column, renderer, model, tree_iter, data=None):
+        """Category rows use the category colour and a larger bold font"""
+        if model.get_value(tree_iter, 2):
+            renderer.set_property("foreground", self.colors['color2'])
+            renderer.set_property("scale", 1.2)
+        else:
+            renderer.set_property("foreground", self.colors['color4'])
+            renderer.set_property("scale", 1.0)
 
-        # Get categorized binds
+    @tracing.traced("binds: populate_store")
+    def populate_store(self):
+        """Refill the model from the parsed config, grouped by category"""
         categorized_binds = self.get_categorized_binds()
 
         # Category display order
@@ -90,66 +152,89 @@ class PixelPerfectShortcuts(Gtk.Window):
             'other'
         ]
 
+        # Columns: keybind, description, is category row, lowercased search text.
+        # A fresh store is filled before any view or filter is attached to it.
+        store = Gtk.TreeStore(str, str, bool, str)
+        self.search_texts = {}
         for category in category_order:
-            if category in categorized_binds and categorized_binds[category]:
-                # Category header
-                lbl_category = Gtk.Label(label=category.upper())
-                lbl_category.set_xalign(0)
-                lbl_category.get_style_context().add_class("category")
-                main_box.pack_start(lbl_category, False, False, 0)
-
-                # Create a grid for perfect alignment
-                grid = Gtk.Grid()
-                grid.set_column_spacing(30)
-                grid.set_row_spacing(3)  # Tighter row spacing
-                grid.set_margin_start(20)
-                grid.set_margin_end(20)
-                grid.set_margin_bottom(10)
-                main_box.pack_start(grid, False, False, 0)
-
-                # Column headers
-                key_header = Gtk.Label(label="KEYBIND")
-                key_header.set_xalign(0)
-                key_header.get_style_context().add_class("header")
-                
-                desc_header = Gtk.Label(label="DESCRIPTION")
-                desc_header.set_xalign(0)
-                desc_header.get_style_context().add_class("header")
-                
-                grid.attach(key_header, 0, 0, 1, 1)
-                grid.attach(desc_header, 1, 0, 1, 1)
-
-                # Add all binds for this category
-                for i, (keybind, description) in enumerate(categorized_binds[category], start=1):
-                    # Keybind label with fixed width
-                    lbl_key = Gtk.Label(label=keybind)
-                    lbl_key.set_xalign(0)
-                    lbl_key.get_style_context().add_class("keybind")
-                    lbl_key.set_halign(Gtk.Align.START)
-                    
-                    # Description label with fixed width
-                    lbl_desc = Gtk.Label(label=description)
-                    lbl_desc.set_xalign(0)
-                    lbl_desc.get_style_context().add_class("description")
-                    lbl_desc.set_halign(Gtk.Align.START)
-                    lbl_desc.set_line_wrap(True)
-                    
-                    grid.attach(lbl_key, 0, i, 1, 1)
-                    grid.attach(lbl_desc, 1, i, 1, 1)
-
-        # Apply monospace font to everything
-        font_desc = Pango.FontDescription("Jetbrains Mono Nerd Font 12")
-        def apply_font(widget):
-            if isinstance(widget, Gtk.Label):
-                widget.override_font(font_desc)
-                widget.set_ellipsize(Pango.EllipsizeMode.END)
-            elif hasattr(widget, 'get_children'):
-                for child in widget.get_children():
-                    apply_font(child)
-        apply_font(main_box)
+            if categorized_binds.get(category):
+                name = category.upper()
+                parent = store.append(None, [name, "", True, ""])
+                texts = self.search_texts[name] = []
+                for keybind, description in categorized_binds[category]:
+                    search_text = f"{keybind} {description} {category}".lower()
+                    texts.append(search_text)
+                    store.append(parent, [keybind, description, False, search_text])
 
+        self.store = store
+        self.filter = store.filter_new()
+        self.filter.set_visible_func(self.row_visible)
+        self.update_filter()
+        self.tree.set_model(self.filter)
+        self.tree.expand_all()
+
+    def update_filter(self):
+        """Work out which categories still have matching binds"""
+        self.visible_categories = {
+            name for name, texts in self.search_texts.items()
+            if any(self.filter_text in text for text in texts)
+        }
+
+    def row_visible(self, model, tree_iter, data=None):
+        if model.get_value(tree_iter, 2):
+            return model.get_value(tree_iter, 0) in self.visible_categories
+        return self.filter_text in model.get_value(tree_iter, 3)
+
+    def on_search_changed(self, entry):
+        self.filter_text = entry.get_text().strip().lower()
+        self.update_filter()
+        self.filter.refilter()
+        self.tree.expand_all()
+
+    @tracing.traced("binds: load_config")
+    def load_config(self, save=True):
+        """Parse (or incrementally refresh) the Hyprland config; True if binds changed"""
+        try:
+            return self.config.load(save=save)
+        except Exception as e:
+            print(f"Error loading binds: {e}", file=sys.stderr)
+            return False
+
+    def on_map(self, widget):
+        """Pick up edits and palette changes made while hidden, then watch the config directories"""
+        self.colors = theme.load_palette()
+        self.desc_renderer.set_property("foreground", self.colors['color7'])
+        self.apply_styles()
+        if self.load_config():
+            self.populate_store()
+        self.inotify = Inotify()
+        for directory in self.config.watched_dirs():
+            self.inotify.add_watch(directory)
+        self.inotify_source = GLib.io_add_watch(
+            self.inotify.fileno(), GLib.PRIORITY_DEFAULT, GLib.IOCondition.IN, self.on_config_event)
+
+    def on_unmap(self, widget):
+        if self.inotify:
+            GLib.source_remove(self.inotify_source)
+            self.inotify.close()
+            self.inotify = None
+
+    def on_config_event(self, fd, condition):
+        """inotify callback: re-parse only the files that changed"""
+        self.inotify.read()
+        if self.load_config(save=False):
+            self.populate_store()
+            # A new `source =` may point into another directory
+            watched = set(self.inotify.paths.values())
+            for directory in self.config.watched_dirs():
+                if directory not in watched:
+                    self.inotify.add_watch(directory)
+        GLib.idle_add(self.config.save_cache)
+        return True
+
+    @tracing.traced("binds: get_categorized_binds")
     def get_categorized_binds(self):
-        """Parse and categorize binds.conf with perfect alignment in mind"""
+        """Categorize the parsed binds for display"""
         categories = {
             'workspaces': [],
             'window management': [],
@@ -159,46 +244,28 @@ class PixelPerfectShortcuts(Gtk.Window):
             'other': []
         }
 
-        try:
-            with open(f"{os.environ['HOME']}/.config/hypr/binds.conf") as f:
-                for line in f:
-                    if line.startswith(('bind', 'binde', 'bindm')):
-                        # Skip empty/commented binds
-                        if not line.strip() or line.strip().startswith('#'):
-                            continue
-                            
-                        parts = line.split('#', 1)
-                        if len(parts) < 2:
-                            continue
-                            
-                        cmd_part = parts[0].split('=', 1)[1].strip()
-                        description = parts[1].strip()
-                        
-                        # Extract key combination (first 2 parts)
-                        key_parts = [x.strip() for x in cmd_part.split(',')[:2]]
-                        keybind = ', '.join(key_parts)
-                        
-                        # Standardize description capitalization
-                        description = description[0].upper() + description[1:]
-                        
-                        # Categorize based on description
-                        desc_lower = description.lower()
-                        if 'window' in desc_lower:
-                            categories['window management'].append((keybind, description))
-                        elif 'launch' in desc_lower:
-                            categories['apps'].append((keybind, description))
-                        elif 'workspace' in desc_lower:
-                            categories['workspaces'].append((keybind, description))
-                        elif 'scratchpad' in desc_lower:
-                            categories['scratchpads'].append((keybind, description))
-                        elif 'hyprland' in desc_lower:
-                            categories['system'].append((keybind, description))
-                        else:
-                            categories['other'].append((keybind, description))
-                            
-        except Exception as e:
-            print(f"Error loading binds: {e}")
-        
+        for bind in self.config.binds:
+            keybind = f"{bind.mods}, {bind.key}"
+
+            # Standardize description capitalization; fall back to the command
+            description = bind.description or f"{bind.dispatcher} {bind.args}".strip()
+            description = description[:1].upper() + description[1:]
+
+            # Categorize based on description
+            desc_lower = description.lower()
+            if 'window' in desc_lower:
+                categories['window management'].append((keybind, description))
+            elif 'launch' in desc_lower:
+                categories['apps'].append((keybind, description))
+            elif 'workspace' in desc_lower:
+                categories['workspaces'].append((keybind, description))
+            elif 'scratchpad' in desc_lower:
+                categories['scratchpads'].append((keybind, description))
+            elif 'hyprland' in desc_lower:
+                categories['system'].append((keybind, description))
+            else:
+                categories['other'].append((keybind, description))
+
         return categories
 
 if __name__ == "__main__":
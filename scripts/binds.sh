@@ -1,3 +0,0 @@
-#!/bin/bash
-
-hyprctl dispatch togglespecialworkspace binds
@@ -1,2 +0,0 @@
-#!/bin/bash
-hyprctl dispatch togglespecialworkspace dcpad
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+
+# sunnah.com page parsing shared by the Sunnah app and the hadith store importer.
+# parse_hadith builds a full BeautifulSoup tree; HadithExtractor streams the
+# page and stops once it has the two blocks we show.
+
+import codecs
+from html.parser import HTMLParser
+
+# Elements that never have a closing tag
+VOID_ELEMENTS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr',
+}
+
+def parse_hadith(content):
+    """
+    Extract the English text and reference from a sunnah.com hadith page.
+    Returns a (text, reference) tuple, or None if the page has no hadith.
+    """
+    from bs4 import BeautifulSoup  # Only the full-tree parser needs bs4
+
+    soup = BeautifulSoup(content, 'html.parser')
+
+    # Find the main English Hadith text
+    hadith_english = soup.find('div', class_='english_hadith_full')
+    if not hadith_english:
+        return None
+
+    # Keep only paragraphs inside the 'hadith_text' block
+    text = ""
+    for p in hadith_english.find_all('p'):
+        if p.parent and 'hadith_text' in p.parent.get('class', []):
+            text += p.get_text() + "\n"
+
+    # Find the reference information (e.g., Book of Revelation, Hadith 1)
+    reference = ""
+    reference_info = soup.find('div', class_='hadith_reference')
+    if reference_info:
+        reference = reference_info.get_text(separator=' ', strip=True)
+    return text, reference
+
+class HadithExtractor(HTMLParser):
+    """
+    Incremental extractor for the same fields as parse_hadith.
+    Feed it the page as it downloads; once the English text and the
+    reference block have both been closed, done is set and the rest of the
+    page can be skipped. on_paragraph, if given, is called with each
+    paragraph of the text as soon as it closes.
+    """
+
+    def __init__(self, on_paragraph=None):
+        super().__init__()
+        self.on_paragraph = on_paragraph
+        self.stack = []           # (tag, classes) of open elements
+        self.english_depth = None # Stack depth of the english_hadith_full div
+        self.english_done = False
+        self.paragraph_depth = None
+        self.paragraph = []
+        self.text = ""
+        self.reference_depth = None
+        self.reference_done = False
+        self.reference = []
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_ELEMENTS:
+            return
+        classes = (dict(attrs).get('class') or '').split()
+        parent_classes = self.stack[-1][1] if self.stack else []
+        self.stack.append((tag, classes))
+        depth = len(self.stack)
+
+        if tag == 'div':
+            if 'english_hadith_full' in classes and not self.english_done and self.english_depth is None:
+                self.english_depth = depth
+            elif 'hadith_reference' in classes and not self.reference_done and self.reference_depth is None:
+                self.reference_depth = depth
+        elif (tag == 'p' and self.english_depth is not None and self.paragraph_depth is None
+                and 'hadith_text' in parent_classes):
+            self.paragraph_depth = depth
+            self.paragraph = []
+
+    def handle_endtag(self, tag):
+        # Pop back to the matching open tag; stray end tags are ignored
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i][0] == tag:
+                break
+        else:
+            return
+        while len(self.stack) > i:
+            self.close_depth(len(self.stack))
+            self.stack.pop()
+
+    def close_depth(self, depth):
+        if depth == self.paragraph_depth:
+            self.end_paragraph()
+        if depth == self.english_depth:
+            self.english_depth = None
+            self.english_done = True
+        if depth == self.reference_depth:
+            self.reference_depth = None
+            self.reference_done = True
+        if self.english_done and self.reference_done:
+            self.done = True
+
+    def end_paragraph(self):
+        paragraph = "".join(self.paragraph) + "\n"
+        self.text += paragraph
+        self.paragraph_depth = None
+        if self.on_paragraph:
+            self.on_paragraph(paragraph)
+
+    def handle_data(self, data):
+        if self.paragraph_depth is not None:
+            self.paragraph.append(data)
+        if self.reference_depth is not None:
+            data = data.strip()
+            if data:
+                self.reference.append(data)
+
+    def result(self):
+        """Return (text, reference) like parse_hadith, or None if no hadith was seen"""
+        if not self.english_done and self.english_depth is None:
+            return None
+        if self.paragraph_depth is not None:
+            # Page ended inside a paragraph; keep what we have
+            self.end_paragraph()
+        return self.text, " ".join(self.reference)
+
+def extract_hadith(chunks, on_paragraph=None):
+    """
+    Stream byte chunks through a HadithExtractor, stopping as soon as it has
+    everything. Returns (text, reference) or None, like parse_hadith.
+    on_paragraph gets each paragraph of the text as it is parsed.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    extractor = HadithExtractor(on_paragraph)
+    for chunk in chunks:
+        extractor.feed(decoder.decode(chunk))
+        if extractor.done:
+            break
+    else:
+        extractor.feed(decoder.decode(b'', final=True))
+        extractor.close()
+    return extractor.result()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+
+# Local hadith corpus store
+# SQLite database with a primary-key lookup by (collection, number) and an
+# FTS5 full-text index, so the Sunnah app works offline once it is filled.
+
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+DB_FILE = Path(os.environ.get(
+    "SUNNAH_DB", Path.home() / ".local" / "share" / "sunnah" / "hadith.db"))
+DEFAULT_COLLECTION = "bukhari"
+
+USAGE = """usage:
+  hadith_store.py import DUMP.json|PAGES_DIR [...]   Bulk import
+  hadith_store.py get NUMBER [--collection bukhari]  Show one hadith
+  hadith_store.py search QUERY [--limit 10]          Full-text search
+  hadith_store.py stats                              Count per collection"""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hadith (
+    id INTEGER PRIMARY KEY,
+    collection TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    reference TEXT NOT NULL DEFAULT '',
+    UNIQUE (collection, number)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS hadith_fts USING fts5(
+    text, reference, content='hadith', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS hadith_ai AFTER INSERT ON hadith BEGIN
+    INSERT INTO hadith_fts(rowid, text, reference) VALUES (new.id, new.text, new.reference);
+END;
+CREATE TRIGGER IF NOT EXISTS hadith_ad AFTER DELETE ON hadith BEGIN
+    INSERT INTO hadith_fts(hadith_fts, rowid, text, reference) VALUES ('delete', old.id, old.text, old.reference);
+END;
+CREATE TRIGGER IF NOT EXISTS hadith_au AFTER UPDATE ON hadith BEGIN
+    INSERT INTO hadith_fts(hadith_fts, rowid, text, reference) VALUES ('delete', old.id, old.text, old.reference);
+    INSERT INTO hadith_fts(rowid, text, reference) VALUES (new.id, new.text, new.reference);
+END;
+"""
+
+def fts_query(query):
+    """
+    Turn free text into an FTS5 query that matches every word. Each word is
+    quoted as a string literal, so '-', 'AND', '*' or a stray '"' in user
+    input is searched for instead of being parsed as query syntax.
+    """
+    return " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+class HadithStore:
+    """Thread-safe wrapper around the hadith database"""
+
+    def __init__(self, path=DB_FILE):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(str(path), check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+    def get(self, collection, number):
+        """Return (text, reference) for a hadith, or None if it isn't stored"""
+        with self.lock:
+            return self.db.execute(
+                "SELECT text, reference FROM hadith WHERE collection = ? AND number = ?",
+                (collection, number)).fetchone()
+
+    def put(self, collection, number, text, reference=""):
+        """Insert or replace a single hadith"""
+        self.put_many([(collection, number, text, reference)])
+
+    def put_many(self, rows):
+        """Insert or replace (collection, number, text, reference) rows in one transaction"""
+        with self.lock, self.db:
+            self.db.executemany(
+                "INSERT INTO hadith (collection, number, text, reference) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (collection, number) DO UPDATE SET "
+                "text = excluded.text, reference = excluded.reference",
+                rows)
+
+    def search(self, query, limit=10):
+        """Full-text search for all words of QUERY, best matches first: [(collection, number, snippet)]"""
+        query = fts_query(query)
+        if not query:
+            return []
+        with self.lock:
+            return self.db.execute(
+                "SELECT h.collection, h.number, snippet(hadith_fts, 0, '[', ']', '...', 12) "
+                "FROM hadith_fts JOIN hadith h ON h.id = hadith_fts.rowid "
+                "WHERE hadith_fts MATCH ? ORDER BY rank LIMIT ?",
+                (query, limit)).fetchall()
+
+    def stats(self):
+        """Number of stored hadiths per collection"""
+        with self.lock:
+            return self.db.execute(
+                "SELECT collection, COUNT(*) FROM hadith GROUP BY collection").fetchall()
+
+def rows_from_json(path, collection):
+    """
+    Read a JSON dump: a list of objects with 'number' (or 'hadithNumber'),
+    'text' and optional 'reference' and 'collection' keys.
+    """
+    with open(path) as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get('hadiths', data.get('data', []))
+    for item in data:
+        number = item.get('number', item.get('hadithNumber'))
+        yield (item.get('collection', collection), int(number),
+               item['text'], item.get('reference', ''))
+
+def rows_from_pages(directory, collection):
+    """
+    Read a local mirror of sunnah.com pages. File names must contain the
+    hadith number, e.g. 'bukhari:123.html' or '123.html'.
+    """
+    from hadith_parse import extract_hadith
+
+    for page in sorted(Path(directory).rglob('*.htm*')):
+        match = re.search(r'(?:([a-z]+)[:_-])?(\d+)\.html?$', page.name)
+        if not match:
+            continue
+        parsed = extract_hadith([page.read_bytes()])
+        if parsed is None:
+            print(f"Skipping {page}: no hadith found", file=sys.stderr)
+            continue
+        yield (match.group(1) or collection, int(match.group(2))) + parsed
+
+def import_paths(store, paths, collection=DEFAULT_COLLECTION):
+    """Bulk import JSON dumps and page directories, returning the row count"""
+    total = 0
+    for path in paths:
+        if os.path.isdir(path):
+            rows = list(rows_from_pages(path, collection))
+        else:
+            rows = list(rows_from_json(path, collection))
+        store.put_many(rows)
+        total += len(rows)
+        print(f"Imported {len(rows)} hadiths from {path}")
+    return total
+
+def main():
+    args = sys.argv[1:]
+    collection = DEFAULT_COLLECTION
+    limit = 10
+    if '--collection' in args:
+        i = args.index('--collection')
+        collection = args[i + 1]
+        del args[i:i + 2]
+    if '--limit' in args:
+        i = args.index('--limit')
+        limit = int(args[i + 1])
+        del args[i:i + 2]
+
+    if not args or args[0] not in ('import', 'get', 'search', 'stats'):
+        print(USAGE, file=sys.stderr)
+        sys.exit(2)
+
+    store = HadithStore()
+    command, rest = args[0], args[1:]
+    if command == 'import':
+        import_paths(store, rest, collection)
+    elif command == 'get':
+        entry = store.get(collection, int(rest[0]))
+        if not entry:
+            print(f"{collection}:{rest[0]} is not in the store", file=sys.stderr)
+            sys.exit(1)
+        text, reference = entry
+        print(text)
+        print(reference)
+    elif command == 'search':
+        for coll, number, snippet in store.search(' '.join(rest), limit):
+            print(f"{coll}:{number}  {snippet}")
+    elif command == 'stats':
+        for coll, count in store.stats():
+            print(f"{coll}: {count}")
+    store.close()
+
+if __name__ == "__main__":
+    main()
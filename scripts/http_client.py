@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+
+# Shared HTTP layer for salaat.py and test.py
+# One pooled requests.Session with bounded retries, plus a size-capped on-disk
+# response cache. Cached responses are revalidated with ETag/Last-Modified, so
+# a repeat fetch costs a 304 (or nothing while the entry is younger than max_age).
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+CACHE_DIR = Path(os.environ.get("NEON_HTTP_CACHE", Path.home() / ".cache" / "neon-http"))
+CACHE_MAX_BYTES = 32 * 1024 * 1024
+TIMEOUT = 10
+RETRIES = 3
+BACKOFF = 0.5  # Seconds, doubled on each retry
+CHUNK_SIZE = 16384
+USER_AGENT = "neon-anime-scripts/1.0"
+
+_session = None
+_session_lock = threading.Lock()
+
+def session():
+    """Return the shared keep-alive session, creating it on first use"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(
+                total=RETRIES,
+                backoff_factor=BACKOFF,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset({'GET', 'HEAD'}),
+            )
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry)
+            _session = requests.Session()
+            _session.headers['User-Agent'] = USER_AGENT
+            _session.mount('http://', adapter)
+            _session.mount('https://', adapter)
+        return _session
+
+class ResponseCache:
+    """
+    Response bodies on disk, one <key>.body and <key>.json (metadata) per URL.
+    The metadata file's mtime is bumped on every hit and the least recently
+    used entries are evicted once the total size passes max_bytes.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return self.directory / f"{key}.json", self.directory / f"{key}.body"
+
+    def lookup(self, url):
+        """Return the metadata for a cached URL, or None"""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        if meta.get('url') != url or not body_path.exists():
+            return None
+        return meta
+
+    def read_chunks(self, url, chunk_size=CHUNK_SIZE):
+        """Yield a cached body and mark the entry as recently used"""
+        meta_path, body_path = self._paths(url)
+        try:
+            os.utime(meta_path)
+        except FileNotFoundError:
+            pass
+        with open(body_path, 'rb') as f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+
+    def revalidated(self, url, meta, headers):
+        """Record a 304: refresh the stored time and any updated validators"""
+        meta['stored'] = time.time()
+        meta['etag'] = headers.get('ETag', meta.get('etag'))
+        meta['last_modified'] = headers.get('Last-Modified', meta.get('last_modified'))
+        self._write_meta(url, meta)
+
+    def writer(self):
+        """Temporary file to stream a new body into before commit()"""
+        return tempfile.NamedTemporaryFile(dir=self.directory, suffix='.tmp', delete=False)
+
+    def commit(self, url, headers, tmp):
+        """Move a fully written body into place and evict old entries"""
+        meta_path, body_path = self._paths(url)
+        tmp.close()
+        os.replace(tmp.name, body_path)
+        self._write_meta(url, {
+            'url': url,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'stored': time.time(),
+            'size': body_path.stat().st_size,
+        })
+        self.evict()
+
+    def discard(self, tmp):
+        tmp.close()
+        try:
+            os.unlink(tmp.name)
+        except FileNotFoundError:
+            pass
+
+    def _write_meta(self, url, meta):
+        meta_path = self._paths(url)[0]
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_name, meta_path)
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits max_bytes"""
+        entries = []
+        total = 0
+        for meta_path in self.directory.glob('*.json'):
+            body_path = meta_path.with_suffix('.body')
+            try:
+                size = body_path.stat().st_size
+                used = meta_path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            entries.append((used, meta_path, body_path, size))
+            total += size
+
+        for _, meta_path, body_path, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            for path in (meta_path, body_path):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+            total -= size
+
+_cache = None
+
+def default_cache():
+    global _cache
+    if _cache is None:
+        _cache = ResponseCache()
+    return _cache
+
+def iter_content(url, params=None, max_age=0, timeout=TIMEOUT, chunk_size=CHUNK_SIZE, cache=None):
+    """
+    Yield the body of a GET request in chunks, going through the disk cache.
+
+    Entries younger than max_age seconds are served without any request;
+    older ones are revalidated with If-None-Match/If-Modified-Since. Only a
+    body read to the end is cached: if the caller stops iterating early the
+    connection is closed and the partial download dropped.
+    """
+    cache = cache or default_cache()
+    url = requests.Request('GET', url, params=params).prepare().url
+    meta = cache.lookup(url)
+
+    if meta and time.time() - meta['stored'] < max_age:
+        yield from cache.read_chunks(url, chunk_size)
+        return
+
+    headers = {}
+    if meta and meta.get('etag'):
+        headers['If-None-Match'] = meta['etag']
+    if meta and meta.get('last_modified'):
+        headers['If-Modified-Since'] = meta['last_modified']
+
+    with session().get(url, headers=headers, timeout=timeout, stream=True) as response:
+        if response.status_code == 304 and meta:
+            cache.revalidated(url, meta, response.headers)
+            yield from cache.read_chunks(url, chunk_size)
+            return
+        response.raise_for_status()
+
+        cacheable = 'no-store' not in response.headers.get('Cache-Control', '')
+        if not cacheable:
+            yield from response.iter_content(chunk_size)
+            return
+
+        tmp = cache.writer()
+        chunks = response.iter_content(chunk_size)
+        try:
+            for chunk in chunks:
+                tmp.write(chunk)
+                yield chunk
+        except GeneratorExit:
+            # Caller has what it needs (or was cancelled); don't read on
+            cache.discard(tmp)
+            return
+        except BaseException:
+            cache.discard(tmp)
+            raise
+        cache.commit(url, response.headers, tmp)
+
+def get(url, params=None, max_age=0, timeout=TIMEOUT):
+    """GET a URL through the cache and return the whole body as bytes"""
+    return b"".join(iter_content(url, params=params, max_age=max_age, timeout=timeout))
+
+def get_json(url, params=None, max_age=0, timeout=TIMEOUT):
+    """GET a URL through the cache and decode it as JSON"""
+    return json.loads(get(url, params=params, max_age=max_age, timeout=timeout))
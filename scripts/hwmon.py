@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+
+# hwmon temperature module for Waybar (replaces the cpu.sh / gpu.sh pipelines)
+# Finds the temp*_input whose label matches (Tctl for the CPU, junction for the
+# GPU) once, keeps it open and pread()s it every interval. Streams Waybar JSON
+# lines: the temperature, a tooltip with min/max/avg over the recent window and
+# a CSS class by threshold. A line is only written when it changes.
+#
+#   hwmon.py cpu|gpu            Stream Waybar JSON (persistent; no "interval" in waybar)
+#   hwmon.py cpu|gpu --once     Print a single line and exit
+#   hwmon.py --list             Show every labelled temperature input
+#
+# HWMON_ROOT (or --root PATH) points it at another tree, e.g. a fake one for
+# testing laid out like /sys/class/hwmon:
+#   ROOT/hwmon0/name          "k10temp"
+#   ROOT/hwmon0/temp1_label   "Tctl"
+#   ROOT/hwmon0/temp1_input   "45250"   (millidegrees)
+
+import json
+import os
+import sys
+import time
+from collections import deque
+
+HWMON_ROOT = os.environ.get("HWMON_ROOT", "/sys/class/hwmon")
+INTERVAL = 5
+WINDOW = 60  # Samples kept for the tooltip stats (5 minutes at the default interval)
+RESCAN_DELAY = 30  # Retry interval while the sensor is missing
+
+# Module -> (preferred chip name, temperature label, warning °C, critical °C)
+SENSORS = {
+    'cpu': ('k10temp', 'Tctl', 75, 90),
+    'gpu': ('amdgpu', 'junction', 85, 100),
+}
+
+ERROR_OUTPUT = {'text': "N/A", 'tooltip': "Sensor not found", 'class': 'error'}
+
+def read_text(path):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def labelled_inputs(root=HWMON_ROOT):
+    """Yield (chip name, label, input path) for every labelled temperature input"""
+    try:
+        chips = sorted(os.listdir(root))
+    except OSError:
+        return
+    for chip in chips:
+        chip_dir = os.path.join(root, chip)
+        name = read_text(os.path.join(chip_dir, "name")) or chip
+        try:
+            files = sorted(os.listdir(chip_dir))
+        except OSError:
+            continue
+        for file in files:
+            if file.startswith("temp") and file.endswith("_label"):
+                label = read_text(os.path.join(chip_dir, file))
+                path = os.path.join(chip_dir, file[:-len("_label")] + "_input")
+                if label and os.path.exists(path):
+                    yield name, label, path
+
+def find_input(label, chip=None, root=HWMON_ROOT):
+    """Path of the input with this label, preferring the given chip"""
+    matches = [(name, path) for name, found, path in labelled_inputs(root)
+               if found.lower() == label.lower()]
+    for name, path in matches:
+        if name == chip:
+            return path
+    return matches[0][1] if matches else None
+
+class Sensor:
+    """One open temperature input; read() returns °C"""
+
+    def __init__(self, path):
+        self.path = path
+        self.fd = os.open(path, os.O_RDONLY | os.O_CLOEXEC)
+
+    def read(self):
+        # sysfs attributes regenerate on every read from offset 0
+        return int(os.pread(self.fd, 32, 0)) / 1000
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+def format_output(temp, samples, warning, critical):
+    """Format one reading for Waybar"""
+    if temp >= critical:
+        css_class = 'critical'
+    elif temp >= warning:
+        css_class = 'warning'
+    else:
+        css_class = 'normal'
+    seconds = len(samples) * INTERVAL
+    span = f"{seconds // 60} min" if seconds >= 60 else f"{seconds} s"
+    return {
+        'text': f"{temp:.1f}°C",
+        'tooltip': (f"Min: {min(samples):.0f}°C\nMax: {max(samples):.0f}°C\n"
+                    f"Avg: {sum(samples) / len(samples):.1f}°C\nLast {span}"),
+        'class': css_class,
+        'percentage': min(100, round(temp / critical * 100)),
+    }
+
+class TemperatureReader:
+    """Samples one module's sensor; sample() returns the Waybar payload"""
+
+    def __init__(self, module, root=HWMON_ROOT):
+        self.chip, self.label, self.warning, self.critical = SENSORS[module]
+        self.root = root
+        self.samples = deque(maxlen=WINDOW)
+        self.sensor = None
+
+    def sample(self):
+        if self.sensor is None:
+            path = find_input(self.label, self.chip, self.root)
+            try:
+                self.sensor = Sensor(path) if path else None
+            except OSError:
+                self.sensor = None
+        if self.sensor is None:
+            return ERROR_OUTPUT
+        try:
+            temp = self.sensor.read()
+        except (OSError, ValueError):
+            # Driver reloaded or the hwmon index moved: look it up again
+            self.sensor.close()
+            self.sensor = None
+            return ERROR_OUTPUT
+        self.samples.append(temp)
+        return format_output(temp, self.samples, self.warning, self.critical)
+
+    def delay(self):
+        """Seconds until the next sample"""
+        return INTERVAL if self.sensor else RESCAN_DELAY
+
+def run(module, root=HWMON_ROOT, once=False):
+    """Stream Waybar JSON lines for a module, only writing when the output changes"""
+    reader = TemperatureReader(module, root)
+    last = None
+    while True:
+        line = json.dumps(reader.sample())
+        if line != last:
+            print(line, flush=True)
+            last = line
+        if once:
+            return
+        time.sleep(reader.delay())
+
+def main():
+    args = sys.argv[1:]
+    root = HWMON_ROOT
+    if '--root' in args:
+        root = args[args.index('--root') + 1]
+    if '--list' in args:
+        for name, label, path in labelled_inputs(root):
+            print(f"{name:<12}{label:<12}{path}")
+        return
+
+    modules = [a for a in args if a in SENSORS]
+    if not modules:
+        print(f"usage: hwmon.py {'|'.join(SENSORS)} [--once] [--root PATH] | --list", file=sys.stderr)
+        sys.exit(2)
+    try:
+        run(modules[0], root, once='--once' in args)
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass
+
+if __name__ == "__main__":
+    main()
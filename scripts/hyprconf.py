@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+
+# Hyprland config parser
+# Follows `source =` includes (with ~ and globs), expands $variables and
+# collects every bind variant (bind, binde, bindl, bindel, bindr, bindm, bindd...)
+# into a structured index. Each file's tokenized lines are cached on disk
+# keyed by mtime and content hash, so a refresh only re-reads changed files.
+
+import glob
+import hashlib
+import json
+import os
+import re
+import sys
+from collections import namedtuple
+
+ROOT_CONFIG = os.path.expanduser("~/.config/hypr/hyprland.conf")
+CACHE_FILE = os.path.expanduser("~/.cache/hyprconf.json")
+CACHE_VERSION = 1
+MAX_SOURCE_DEPTH = 16
+
+BIND_RE = re.compile(r'^bind([lrenmtidsopcgu]*)$')
+VARIABLE_RE = re.compile(r'\$(\w+)')
+
+Bind = namedtuple('Bind', 'mods key dispatcher args description flags file line')
+
+def split_comment(line):
+    """Split a config line into (content, comment). '##' is a literal '#'."""
+    content = []
+    i = 0
+    while i < len(line):
+        c = line[i]
+        if c == '#':
+            if line[i + 1:i + 2] == '#':
+                content.append('#')
+                i += 2
+                continue
+            return ''.join(content), line[i + 1:].strip()
+        content.append(c)
+        i += 1
+    return ''.join(content), ''
+
+def tokenize(text):
+    """
+    Turn a config file into [lineno, key, value, comment] entries.
+    Keys inside `section { ... }` blocks are prefixed, e.g. 'general:gaps_in'.
+    """
+    entries = []
+    sections = []
+    for lineno, raw in enumerate(text.splitlines(), start=1):
+        content, comment = split_comment(raw)
+        content = content.strip()
+        if not content:
+            continue
+        if content.endswith('{'):
+            sections.append(content[:-1].strip())
+            continue
+        if content == '}':
+            if sections:
+                sections.pop()
+            continue
+        if '=' not in content:
+            continue
+        key, value = content.split('=', 1)
+        key = ':'.join(sections + [key.strip()])
+        entries.append([lineno, key, value.strip(), comment])
+    return entries
+
+def parse_bind(key, value, comment, path, lineno):
+    """Build a Bind from a bind* keyword line, or None if it is malformed"""
+    flags = BIND_RE.match(key).group(1)
+    fields = 5 if 'd' in flags else 4
+    parts = [p.strip() for p in value.split(',', fields - 1)]
+    if len(parts) < fields - 1:
+        return None
+    parts += [''] * (fields - len(parts))
+    if 'd' in flags:
+        mods, bind_key, description, dispatcher, args = parts
+        description = description or comment
+    else:
+        mods, bind_key, dispatcher, args = parts
+        description = comment
+    return Bind(mods, bind_key, dispatcher, args, description, flags, path, lineno)
+
+class HyprConfig:
+    """Parsed view of a Hyprland config tree with per-file incremental refresh"""
+
+    def __init__(self, root=ROOT_CONFIG, cache_file=CACHE_FILE):
+        self.root = os.path.abspath(os.path.expanduser(root))
+        self.cache_file = cache_file
+        self.files = self._load_cache()
+        self.dirty = False
+        self.variables = {}
+        self.binds = []
+        self.sources = []
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_file) as f:
+                cache = json.load(f)
+            if cache.get('version') == CACHE_VERSION:
+                return cache['files']
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def save_cache(self):
+        """Write the per-file token cache if anything changed"""
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+        tmp = self.cache_file + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({'version': CACHE_VERSION, 'files': self.files}, f)
+        os.replace(tmp, self.cache_file)
+        self.dirty = False
+
+    def _entries(self, path):
+        """Tokenized lines of a file, re-read only if its mtime/size changed"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            if self.files.pop(path, None) is not None:
+                self.dirty = True
+            return []
+        cached = self.files.get(path)
+        if cached and cached['mtime'] == st.st_mtime_ns and cached['size'] == st.st_size:
+            return cached['entries']
+
+        with open(path, 'rb') as f:
+            data = f.read()
+        digest = hashlib.sha1(data).hexdigest()
+        if not cached or cached['hash'] != digest:
+            cached = {'hash': digest, 'entries': tokenize(data.decode(errors='replace'))}
+        cached.update(mtime=st.st_mtime_ns, size=st.st_size)
+        self.files[path] = cached
+        self.dirty = True
+        return cached['entries']
+
+    def expand(self, value):
+        if '$' not in value:
+            return value
+        return VARIABLE_RE.sub(lambda m: self.variables.get(m.group(1), m.group(0)), value)
+
+    def _resolve(self, path, depth):
+        if depth > MAX_SOURCE_DEPTH:
+            print(f"hyprconf: source depth exceeded at {path}", file=sys.stderr)
+            return
+        self.sources.append(path)
+        entries = self._entries(path)
+        cached = self.files.get(path)
+
+        # Files without includes resolve the same way for the same incoming
+        # variables, so their binds are cached alongside the tokens.
+        memo = cached and cached.get('resolved')
+        if memo and memo['vars'] == self.variables:
+            self.variables.update(memo['defines'])
+            self.binds.extend(Bind(*b) for b in memo['binds'])
+            return
+
+        incoming = dict(self.variables)
+        defines = {}
+        file_binds = []
+        leaf = True
+        base = os.path.dirname(path)
+        for lineno, key, value, comment in entries:
+            if key.startswith('$'):
+                defines[key[1:]] = self.variables[key[1:]] = self.expand(value)
+                continue
+            value = self.expand(value)
+            if key == 'source':
+                leaf = False
+                self.binds.extend(file_binds)
+                file_binds = []
+                pattern = os.path.join(base, os.path.expanduser(value))
+                for include in sorted(glob.glob(pattern)) or [pattern]:
+                    self._resolve(os.path.abspath(include), depth + 1)
+            elif BIND_RE.match(key):
+                bind = parse_bind(key, value, comment, path, lineno)
+                if bind:
+                    file_binds.append(bind)
+        self.binds.extend(file_binds)
+
+        if leaf and cached:
+            cached['resolved'] = {'vars': incoming, 'defines': defines,
+                                  'binds': [list(b) for b in file_binds]}
+            self.dirty = True
+
+    def load(self, save=True):
+        """
+        (Re)build the index from the root config. Only files whose mtime
+        changed are read again. Returns True if the bind list changed.
+        Pass save=False to defer writing the cache (see save_cache).
+        """
+        old_binds = self.binds
+        self.variables = {}
+        self.binds = []
+        self.sources = []
+        self._resolve(self.root, 0)
+        if save:
+            self.save_cache()
+        return self.binds != old_binds
+
+    def watched_dirs(self):
+        """Directories holding the config files, for an inotify watch"""
+        return sorted({os.path.dirname(p) for p in self.sources})
+
+    def by_key(self):
+        """Index binds by (mods, key)"""
+        return {(b.mods, b.key): b for b in self.binds}
+
+def main():
+    config = HyprConfig(sys.argv[1] if len(sys.argv) > 1 else ROOT_CONFIG)
+    config.load()
+    for bind in config.binds:
+        print(f"{bind.mods}, {bind.key}\t{bind.dispatcher} {bind.args}\t{bind.description}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+
+# Hyprland IPC client (no hyprctl subprocess)
+# Requests go to .socket.sock: one command per connection, reply read to EOF.
+# Events come from .socket2.sock as "EVENT>>DATA" lines; events() exposes
+# them as an asyncio stream so tools can react instead of polling.
+#
+#   hypripc.py dispatch togglespecialworkspace binds
+#   hypripc.py batch "dispatch workspace 1; dispatch exec kitty"
+#   hypripc.py query clients      JSON reply, pretty-printed
+#   hypripc.py events             Print events as they arrive
+#
+# The socket directory follows HYPRLAND_INSTANCE_SIGNATURE under
+# $XDG_RUNTIME_DIR/hypr (or /tmp/hypr on older Hyprland); HYPRLAND_SOCKET_DIR
+# overrides it, e.g. to talk to a fake server.
+
+import json
+import os
+import socket
+import sys
+
+TIMEOUT = 5
+BUFFER_SIZE = 8192
+
+class HyprlandError(Exception):
+    """Hyprland is not reachable or rejected a request"""
+
+def socket_dir():
+    if os.environ.get("HYPRLAND_SOCKET_DIR"):
+        return os.environ["HYPRLAND_SOCKET_DIR"]
+    signature = os.environ.get("HYPRLAND_INSTANCE_SIGNATURE")
+    if not signature:
+        raise HyprlandError("HYPRLAND_INSTANCE_SIGNATURE is not set")
+    runtime = os.environ.get("XDG_RUNTIME_DIR", f"/run/user/{os.getuid()}")
+    for base in (os.path.join(runtime, "hypr"), "/tmp/hypr"):
+        path = os.path.join(base, signature)
+        if os.path.exists(os.path.join(path, ".socket.sock")):
+            return path
+    raise HyprlandError(f"no Hyprland socket for instance {signature}")
+
+def request(command, json_reply=False):
+    """Send one request and return the raw reply text"""
+    if json_reply:
+        command = f"j/{command}"
+    path = os.path.join(socket_dir(), ".socket.sock")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM | socket.SOCK_CLOEXEC) as sock:
+        sock.settimeout(TIMEOUT)
+        try:
+            sock.connect(path)
+            sock.sendall(command.encode())
+            chunks = []
+            while chunk := sock.recv(BUFFER_SIZE):
+                chunks.append(chunk)
+        except OSError as e:
+            raise HyprlandError(f"{path}: {e}") from e
+    return b"".join(chunks).decode(errors='replace')
+
+def dispatch(*args):
+    """Run a dispatcher, e.g. dispatch("togglespecialworkspace", "binds")"""
+    reply = request("dispatch " + " ".join(str(a) for a in args))
+    if reply.strip() != "ok":
+        raise HyprlandError(reply.strip())
+
+def batch(commands):
+    """Send several commands over one connection (same as hyprctl --batch)"""
+    return request("[[BATCH]]" + ";".join(commands))
+
+def query(name):
+    """A JSON query such as "clients", "activewindow" or "monitors", parsed"""
+    reply = request(name, json_reply=True)
+    try:
+        return json.loads(reply)
+    except ValueError:
+        raise HyprlandError(reply.strip()) from None
+
+async def events():
+    """Async iterator of (event, data) from the event socket, e.g. ("workspace", "2")"""
+    import asyncio  # Only event consumers pay for the asyncio import
+    reader, writer = await asyncio.open_unix_connection(os.path.join(socket_dir(), ".socket2.sock"))
+    try:
+        while line := await reader.readline():
+            name, _, data = line.decode(errors='replace').rstrip("\n").partition(">>")
+            yield name, data
+    finally:
+        writer.close()
+
+async def print_events():
+    async for name, data in events():
+        print(f"{name}>>{data}", flush=True)
+
+def main():
+    args = sys.argv[1:]
+    if not args:
+        print("usage: hypripc.py dispatch ARGS... | batch 'CMD; CMD' | query NAME | events | RAW COMMAND",
+              file=sys.stderr)
+        sys.exit(2)
+    try:
+        if args[0] == "dispatch":
+            dispatch(*args[1:])
+        elif args[0] == "batch":
+            print(batch([c.strip() for c in " ".join(args[1:]).split(";")]))
+        elif args[0] == "query":
+            print(json.dumps(query(args[1]), indent=2))
+        elif args[0] == "events":
+            import asyncio
+            asyncio.run(print_events())
+        else:
+            print(request(" ".join(args)))
+    except HyprlandError as e:
+        print(f"hypripc: {e}", file=sys.stderr)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+
+# Window-rule linter and compiler for hypr/rules.conf
+# Hyprland checks every windowrulev2 against every window it maps, so repeated
+# per-class blocks of float/center/bordersize/opacity cost a full pass each.
+# This reads rules.conf (and workspaces.conf), reports
+#   dead         duplicates, unknown fields, matchers that differ from another
+#                only in case (so they likely never match)
+#   shadowed     a rule overridden by a later one on the same matcher
+#   conflicting  a window that gets different values for one rule, a special
+#                workspace whose [exec rules] disagree with its window's rules,
+#                and workspaces declared twice with different settings
+# and can write a smaller file with the same effect on every window: redundant
+# rules dropped, fullscreen:0 + fullscreen:1 pairs merged, and identical rules
+# for different anchored classes/titles folded into one ^(a|b|c)$ alternation.
+# Unanchored patterns (class:filepad) are never folded: they also match names
+# that merely contain them, which an anchored alternation would not.
+#
+#   hyprrules.py [RULES [WORKSPACES]]           Report (default ~/.config/hypr/*.conf)
+#   hyprrules.py [RULES [WORKSPACES]] --write FILE
+#                                              Also write the compiled rules ("-" = stdout)
+#
+# The compiled file is checked against the original by replaying both on a
+# window for every class and title the rules name, in and out of fullscreen;
+# a mismatch is reported and nothing is written. The replay treats patterns as
+# full matches, so it can't tell ^(x)$ from a bare x; hence the rule above.
+
+import os
+import re
+import sys
+from collections import namedtuple
+
+from hyprconf import tokenize
+
+RULES_CONFIG = os.path.expanduser("~/.config/hypr/rules.conf")
+WORKSPACES_CONFIG = os.path.expanduser("~/.config/hypr/workspaces.conf")
+
+FIELDS = {'class', 'title', 'initialClass', 'initialTitle', 'tag', 'xwayland', 'floating',
+          'fullscreen', 'pinned', 'focus', 'group', 'fullscreenstate', 'workspace',
+          'onworkspace', 'content', 'xdgTag'}
+NAME_FIELDS = ('class', 'title', 'initialClass', 'initialTitle')
+# Rules where the last matching one wins; float and tile fight over one slot
+LAST_WINS = {'float', 'tile', 'size', 'move', 'center', 'bordersize', 'opacity', 'animation',
+             'noblur', 'noborder', 'noshadow', 'rounding', 'pin', 'fullscreen', 'maximize',
+             'workspace', 'monitor', 'minsize', 'maxsize', 'bordercolor', 'nofocus',
+             'dimaround', 'idleinhibit', 'stayfocused', 'noanim', 'noinitialfocus'}
+SLOT_ALIASES = {'tile': 'float'}
+
+Rule = namedtuple('Rule', 'effect props file line text')
+Workspace = namedtuple('Workspace', 'name options file line')
+
+PROP_RE = re.compile(r'^\s*([A-Za-z]\w*):(.*)$')
+WORKSPACE_OPTION_RE = re.compile(r'^\s*[\w-]+:')
+REGEX_CHARS = re.compile(r'[*+?\[\]{}|\\()^$]')
+EXEC_RULES_RE = re.compile(r'^\[([^\]]*)\]\s*(.*)$')
+CLASS_FLAG_RE = re.compile(r'--(?:class|name)[= ](\S+)')
+
+def core(pattern):
+    """The regex with a redundant ^( )$ or ^ $ wrapper removed"""
+    pattern = pattern.strip()
+    match = re.fullmatch(r'\^\(([^()|]*)\)\$', pattern) or re.fullmatch(r'\^([^()|]*)\$', pattern)
+    return match.group(1) if match else pattern
+
+def anchored(pattern):
+    """True if the pattern is wrapped in ^ $, so folding it into ^(a|b)$ keeps its meaning"""
+    pattern = pattern.strip()
+    return pattern.startswith('^') and pattern.endswith('$')
+
+def is_literal(pattern):
+    return not REGEX_CHARS.search(pattern)
+
+def slot(rule):
+    name = rule.effect.split(None, 1)[0] if rule.effect else ''
+    return SLOT_ALIASES.get(name, name)
+
+def matcher(rule):
+    return frozenset((field, core(value)) for field, value in rule.props)
+
+def parse_rule(value, path, lineno, text):
+    """windowrulev2 = EFFECT, field:pattern, ... (commas inside a pattern are kept)"""
+    effect, _, rest = value.partition(',')
+    props = []
+    for piece in rest.split(','):
+        match = PROP_RE.match(piece)
+        if match or not props:
+            field, pattern = match.groups() if match else ('', piece)
+            props.append((field, pattern.strip()))
+        else:
+            field, pattern = props[-1]
+            props[-1] = (field, f"{pattern},{piece.strip()}")
+    return Rule(effect.strip(), tuple(props), path, lineno, text)
+
+def parse_workspace(value, path, lineno):
+    name, _, rest = value.partition(',')
+    options = []
+    for piece in rest.split(','):
+        if not piece.strip():
+            continue
+        if WORKSPACE_OPTION_RE.match(piece) or not options:
+            key, _, option = piece.partition(':')
+            options.append((key.strip(), option.strip()))
+        else:
+            options[-1] = (options[-1][0], f"{options[-1][1]},{piece.strip()}")
+    return Workspace(name.strip(), options, path, lineno)
+
+def load(path):
+    """([Rule], [Workspace]) from one file; a missing file is empty"""
+    try:
+        with open(path) as f:
+            text = f.read()
+    except OSError:
+        return [], []
+    lines = text.splitlines()
+    rules, workspaces = [], []
+    for lineno, key, value, _ in tokenize(text):
+        if key == 'windowrulev2':
+            rules.append(parse_rule(value, path, lineno, lines[lineno - 1].strip()))
+        elif key == 'workspace':
+            workspaces.append(parse_workspace(value, path, lineno))
+    return rules, workspaces
+
+def unknown_fields(rule):
+    return [field for field, _ in rule.props if field not in FIELDS]
+
+def matches(rule, window):
+    """True if RULE applies to WINDOW; fields the window doesn't know are assumed to match"""
+    if unknown_fields(rule):
+        return False  # Kept verbatim in the output, so never part of a comparison
+    for field, pattern in rule.props:
+        if field not in window:
+            continue
+        try:
+            if not re.fullmatch(core(pattern), window[field]):
+                return False
+        except re.error:
+            return False
+    return True
+
+def windows_for(rules):
+    """
+    One window per literal class or title the rules name. A class and a title
+    with the same text are assumed to be one app (e.g. HyprBinds).
+    """
+    names = {}
+    for rule in rules:
+        for field, pattern in rule.props:
+            if field in NAME_FIELDS and is_literal(core(pattern)) and core(pattern):
+                kind = 'title' if 'itle' in field else 'class'
+                names.setdefault(core(pattern), set()).add(kind)
+    windows = {}
+    for name, kinds in sorted(names.items()):
+        title = name if 'title' in kinds else "\x00"
+        klass = name if 'class' in kinds else "\x00"
+        windows[name] = {'class': klass, 'initialClass': klass, 'title': title, 'initialTitle': title}
+    return windows
+
+def effective(rules, window):
+    """{slot: effect} after applying RULES in order; non-last-wins rules accumulate"""
+    result = {}
+    for rule in rules:
+        if matches(rule, window):
+            if slot(rule) in LAST_WINS:
+                result[slot(rule)] = rule.effect
+            else:
+                result.setdefault(slot(rule), []).append(rule.effect)
+    return result
+
+def may_overlap(a, b):
+    """False only if no window can match both rules"""
+    fields_a = dict((field, core(value)) for field, value in a.props)
+    for field, value in b.props:
+        other = fields_a.get(field)
+        if other is None:
+            continue
+        value = core(value)
+        if field == 'fullscreen' and value != other:
+            return False
+        if is_literal(value) and is_literal(other) and value != other:
+            return False
+        if is_literal(value) and not is_literal(other):
+            try:
+                if not re.fullmatch(other, value):
+                    return False
+            except re.error:
+                pass
+    return True
+
+def can_move(rules, start, end, moving):
+    """True if RULES[start] can move to just after RULES[end] without changing any window"""
+    rule = rules[start]
+    if slot(rule) not in LAST_WINS:
+        return False
+    for other in rules[start + 1:end + 1]:
+        if other in moving:
+            continue
+        if slot(other) == slot(rule) and other.effect != rule.effect and may_overlap(rule, other):
+            return False
+    return True
+
+def lint(rules, workspaces):
+    """Human-readable findings, grouped by kind"""
+    findings = {'dead': [], 'shadowed': [], 'conflicting': []}
+
+    def where(rule):
+        return f"{os.path.basename(rule.file)}:{rule.line}"
+
+    for rule in rules:
+        for field in unknown_fields(rule):
+            fixed = next((f for f in FIELDS if f.lower() == field.lower()), None)
+            hint = f" (fields are case-sensitive: {fixed})" if fixed else ""
+            findings['dead'].append(f"{where(rule)}: unknown field '{field}'{hint}: {rule.text}")
+
+    literals = {}
+    for rule in rules:
+        for field, pattern in rule.props:
+            if field in NAME_FIELDS and is_literal(core(pattern)):
+                literals.setdefault((field, core(pattern).lower()), {}).setdefault(core(pattern), rule)
+    for variants in literals.values():
+        if len(variants) > 1:
+            counts = {name: sum(1 for r in rules for f, p in r.props if core(p) == name) for name in variants}
+            usual = max(counts, key=counts.get)
+            for name, rule in variants.items():
+                if name != usual:
+                    findings['dead'].append(f"{where(rule)}: '{name}' differs from '{usual}' only in case, "
+                                            f"so it likely never matches: {rule.text}")
+
+    seen = {}
+    for rule in rules:
+        key = (matcher(rule), slot(rule))
+        previous = seen.get(key)
+        if previous and previous.effect == rule.effect:
+            findings['dead'].append(f"{where(rule)}: duplicate of {where(previous)}: {rule.text}")
+        elif previous and slot(rule) in LAST_WINS:
+            findings['shadowed'].append(f"{where(previous)}: overridden by {where(rule)} "
+                                        f"({previous.effect!r} -> {rule.effect!r})")
+        seen[key] = rule
+
+    for name, window in windows_for(rules).items():
+        for fullscreen in ('0', '1'):
+            applied = {}
+            for rule in rules:
+                if slot(rule) in LAST_WINS and matches(rule, dict(window, fullscreen=fullscreen)):
+                    applied.setdefault(slot(rule), []).append(rule)
+            for rule_slot, hits in applied.items():
+                effects = {r.effect for r in hits}
+                if len(effects) > 1 and len({matcher(r) for r in hits}) > 1:
+                    lines = ", ".join(f"{where(r)} {r.effect!r}" for r in hits)
+                    finding = f"{name}: {rule_slot} set differently by {lines}; last wins"
+                    if finding not in findings['conflicting']:
+                        findings['conflicting'].append(finding)
+
+    windows = windows_for(rules)
+    for name, options in merged_options(workspaces).items():
+        match = EXEC_RULES_RE.match(options.get('on-created-empty', ''))
+        if not match:
+            continue
+        # The window it spawns: a --class/--name flag, or the workspace name inside a class/title
+        flags = set(CLASS_FLAG_RE.findall(match.group(2)))
+        short = name.split(':', 1)[-1].lower()
+        for window_name, window in windows.items():
+            if window_name not in flags and short not in window_name.lower():
+                continue
+            applied = effective(rules, dict(window, fullscreen='0'))
+            for exec_rule in filter(None, (r.strip() for r in match.group(1).split(';'))):
+                rule_slot = SLOT_ALIASES.get(exec_rule.split()[0], exec_rule.split()[0])
+                current = applied.get(rule_slot)
+                if rule_slot in LAST_WINS and current and current != exec_rule:
+                    findings['conflicting'].append(
+                        f"workspace {name} opens {window_name} with '{exec_rule}' "
+                        f"but its window rules set '{current}'")
+
+    by_name = {}
+    for workspace in workspaces:
+        by_name.setdefault(workspace.name, []).append(workspace)
+    for name, decls in by_name.items():
+        for earlier, later in zip(decls, decls[1:]):
+            changed = [key for key, value in later.options if dict(earlier.options).get(key, value) != value]
+            places = f"{os.path.basename(earlier.file)}:{earlier.line} and {os.path.basename(later.file)}:{later.line}"
+            if changed:
+                findings['conflicting'].append(f"workspace {name} declared at {places}; "
+                                               f"the later one overrides {', '.join(changed)}")
+            else:
+                findings['dead'].append(f"workspace {name} declared twice ({places})")
+    return findings
+
+def drop_redundant(rules):
+    """Remove duplicates and rules a later rule on the same matcher overrides"""
+    keep = []
+    last = {}
+    for index, rule in enumerate(rules):
+        if slot(rule) in LAST_WINS or unknown_fields(rule):
+            last[(matcher(rule), slot(rule), None if slot(rule) in LAST_WINS else rule.effect)] = index
+    for index, rule in enumerate(rules):
+        key = (matcher(rule), slot(rule), None if slot(rule) in LAST_WINS else rule.effect)
+        if key in last and last[key] != index and not unknown_fields(rule):
+            continue
+        keep.append(rule)
+    return keep
+
+def render(effect, props):
+    return f"windowrulev2 = {effect}, " + ", ".join(f"{field}:{value}" for field, value in props)
+
+def merge_pass(rules, group_key, build):
+    """
+    Find one group of rules sharing GROUP_KEY, move its members to the last
+    one's position where that is provably safe and replace them with BUILD(members).
+    Returns the new list, or None if nothing merged.
+    """
+    groups = {}
+    for index, rule in enumerate(rules):
+        key = group_key(rule)
+        if key is not None:
+            groups.setdefault(key, []).append(index)
+    for indexes in groups.values():
+        if len(indexes) < 2:
+            continue
+        end = indexes[-1]
+        moving = {rules[i] for i in indexes}
+        members = [i for i in indexes[:-1] if can_move(rules, i, end, moving)] + [end]
+        if len(members) < 2:
+            continue
+        merged = build([rules[i] for i in members])
+        if merged is None:
+            continue
+        out = [rule for i, rule in enumerate(rules) if i not in members[:-1]]
+        out[out.index(rules[end])] = merged
+        return out
+    return None
+
+def fullscreen_key(rule):
+    props = dict(rule.props)
+    if unknown_fields(rule) or slot(rule) not in LAST_WINS or props.get('fullscreen') not in ('0', '1'):
+        return None
+    return rule.effect, frozenset((f, core(v), anchored(v)) for f, v in rule.props if f != 'fullscreen')
+
+def merge_fullscreen(members):
+    if {dict(r.props)['fullscreen'] for r in members} != {'0', '1'}:
+        return None
+    last = members[-1]
+    props = tuple((f, v) for f, v in last.props if f != 'fullscreen')
+    return Rule(last.effect, props, last.file, last.line, render(last.effect, props))
+
+def alternation_key(rule):
+    """Rules that differ only in one class/title pattern can share a line"""
+    if unknown_fields(rule) or slot(rule) not in LAST_WINS:
+        return None
+    names = [(f, v) for f, v in rule.props if f in NAME_FIELDS]
+    if len(names) != 1 or not anchored(names[0][1]):
+        return None
+    if '|' in core(names[0][1]) and not core(names[0][1]).startswith('('):
+        return None
+    others = frozenset((f, core(v)) for f, v in rule.props if f not in NAME_FIELDS)
+    return rule.effect, names[0][0], others
+
+def merge_alternation(members):
+    field = next(f for f, _ in members[0].props if f in NAME_FIELDS)
+    alternatives = []
+    for rule in members:
+        for f, value in rule.props:
+            if f == field:
+                inner = core(value)
+                inner = inner[1:-1] if inner.startswith('(') and inner.endswith(')') else inner
+                for alternative in inner.split('|'):
+                    if alternative not in alternatives:
+                        alternatives.append(alternative)
+    last = members[-1]
+    props = tuple((f, f"^({'|'.join(alternatives)})$" if f == field else v) for f, v in last.props)
+    return Rule(last.effect, props, last.file, last.line, render(last.effect, props))
+
+def compile_rules(rules):
+    rules = drop_redundant(rules)
+    for key, build in ((fullscreen_key, merge_fullscreen), (alternation_key, merge_alternation)):
+        while (merged := merge_pass(rules, key, build)) is not None:
+            rules = drop_redundant(merged)
+    return rules
+
+def merged_options(workspaces):
+    """{workspace name: {option: value}}, later declarations overriding earlier ones"""
+    merged = {}
+    for workspace in workspaces:
+        options = merged.setdefault(workspace.name, {})
+        for key, value in workspace.options:
+            options[key] = value
+    return merged
+
+def merge_workspaces(workspaces):
+    """One workspace line per workspace"""
+    return [f"workspace = {name}, " + ", ".join(f"{k}:{v}" for k, v in options.items())
+            for name, options in merged_options(workspaces).items()]
+
+def differences(before, after):
+    """Windows whose effective rules differ between the two lists"""
+    problems = []
+    for name, window in windows_for(before).items():
+        for fullscreen in ('0', '1'):
+            state = dict(window, fullscreen=fullscreen)
+            a, b = effective(before, state), effective(after, state)
+            if a != b:
+                problems.append(f"{name} (fullscreen:{fullscreen}): {a} != {b}")
+    return problems
+
+def main():
+    args = sys.argv[1:]
+    output = None
+    if '--write' in args:
+        i = args.index('--write')
+        if i + 1 >= len(args):
+            print("usage: hyprrules.py [RULES [WORKSPACES]] [--write FILE]", file=sys.stderr)
+            sys.exit(2)
+        output = args.pop(i + 1)
+        args.pop(i)
+    rules_path = args[0] if args else RULES_CONFIG
+    workspaces_path = args[1] if len(args) > 1 else WORKSPACES_CONFIG
+
+    rules, workspaces = load(rules_path)
+    _, extra_workspaces = load(workspaces_path)
+    compiled = compile_rules(rules)
+
+    report = sys.stderr if output == '-' else sys.stdout
+    for kind, findings in lint(rules, workspaces + extra_workspaces).items():
+        print(f"{kind} ({len(findings)})", file=report)
+        for finding in findings:
+            print(f"  {finding}", file=report)
+
+    print(f"\nwindowrulev2 lines: {len(rules)} -> {len(compiled)} "
+          f"(each is evaluated on every window map)", file=report)
+    print(f"{'window':<34}{'evaluated':>12}{'matched':>12}", file=report)
+    for name, window in windows_for(rules).items():
+        before = sum(1 for r in rules if matches(r, dict(window, fullscreen='0')))
+        after = sum(1 for r in compiled if matches(r, dict(window, fullscreen='0')))
+        print(f"{name[:33]:<34}{f'{len(rules)} -> {len(compiled)}':>12}{f'{before} -> {after}':>12}", file=report)
+
+    problems = differences(rules, compiled)
+    if problems:
+        print("\ncompiled rules are NOT equivalent:", file=report)
+        for problem in problems:
+            print(f"  {problem}", file=report)
+        sys.exit(1)
+
+    if output:
+        text = (f"# Generated by hyprrules.py from {os.path.basename(rules_path)}\n\n"
+                + "\n".join(merge_workspaces(workspaces)) + "\n\n"
+                + "\n".join(rule.text for rule in compiled) + "\n")
+        if output == '-':
+            sys.stdout.write(text)
+        else:
+            tmp = f"{output}.tmp"
+            with open(tmp, "w") as f:
+                f.write(text)
+            os.replace(tmp, output)
+            print(f"\nwrote {output}", file=report)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+
+# GTK icon-theme.cache generator (gtk-update-icon-cache, in Python)
+# Reads the theme's index.theme, lists every directory it names and writes
+# the binary cache GTK mmaps at startup instead of scanning the theme itself.
+# The per-directory listing is kept in ~/.cache/neon-iconcache keyed by the
+# directory mtime, so a rebuild only re-reads directories that changed, and an
+# unchanged theme leaves the cache untouched.
+#
+#   iconcache.py THEME_DIR [...]        Build or refresh THEME_DIR/icon-theme.cache
+#   iconcache.py THEME_DIR --force      Rebuild from scratch
+#   iconcache.py THEME_DIR --check      Validate the cache and compare it with the theme
+#   iconcache.py A.cache --compare B.cache
+#                                      Compare two caches (e.g. against gtk-update-icon-cache)
+#
+# Cache format (all integers big-endian, offsets from the start of the file):
+#   header     u16 major=1, u16 minor=0, u32 hash offset, u32 directory list offset
+#   dir list   u32 n, u32 name offset * n
+#   hash       u32 n_buckets, u32 icon offset * n_buckets (0xffffffff = empty)
+#   icon       u32 next icon in chain, u32 name offset, u32 image list offset
+#   images     u32 n, then per image: u16 directory index, u16 flags, u32 image data offset (0)
+
+import configparser
+import hashlib
+import json
+import os
+import struct
+import sys
+from pathlib import Path
+
+CACHE_NAME = "icon-theme.cache"
+STATE_DIR = Path.home() / ".cache" / "neon-iconcache"
+MAJOR, MINOR = 1, 0
+EMPTY = 0xffffffff
+
+HAS_SUFFIX_XPM = 1
+HAS_SUFFIX_SVG = 2
+HAS_SUFFIX_PNG = 4
+HAS_ICON_FILE = 8
+SUFFIXES = {'.png': HAS_SUFFIX_PNG, '.svg': HAS_SUFFIX_SVG, '.xpm': HAS_SUFFIX_XPM, '.icon': HAS_ICON_FILE}
+
+def icon_name_hash(name):
+    """GTK's icon_name_hash: h = h * 31 + c over signed chars, 32-bit"""
+    data = name.encode()
+    if not data:
+        return 0
+    h = data[0] - 256 if data[0] > 127 else data[0]
+    for byte in data[1:]:
+        h = (h * 31 + (byte - 256 if byte > 127 else byte)) & 0xffffffff
+    return h & 0xffffffff
+
+def next_prime(n):
+    n = max(n, 2)
+    while any(n % d == 0 for d in range(2, int(n ** 0.5) + 1)):
+        n += 1
+    return n
+
+def theme_directories(root):
+    """Subdirectories listed in index.theme (Directories + ScaledDirectories)"""
+    index = configparser.ConfigParser(interpolation=None, strict=False)
+    index.optionxform = str
+    index.read(root / "index.theme")
+    section = index['Icon Theme'] if index.has_section('Icon Theme') else {}
+    dirs = []
+    for key in ('Directories', 'ScaledDirectories'):
+        for name in section.get(key, '').split(','):
+            name = name.strip()
+            if name and name not in dirs:
+                dirs.append(name)
+    return dirs
+
+def scan_directory(path):
+    """{icon name: flags} for one directory; broken symlinks are skipped"""
+    icons = {}
+    try:
+        entries = list(os.scandir(path))
+    except OSError:
+        return icons
+    for entry in entries:
+        stem, suffix = os.path.splitext(entry.name)
+        flag = SUFFIXES.get(suffix)
+        if not flag:
+            continue
+        try:
+            if not entry.is_file():  # Follows symlinks
+                continue
+        except OSError:
+            continue
+        icons[stem] = icons.get(stem, 0) | flag
+    return icons
+
+def state_file(root):
+    return STATE_DIR / (hashlib.sha1(str(root).encode()).hexdigest()[:16] + ".json")
+
+def load_state(root):
+    try:
+        with open(state_file(root)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_state(root, state):
+    try:
+        STATE_DIR.mkdir(parents=True, exist_ok=True)
+        path = state_file(root)
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # The cache is still valid; the next run just rescans
+
+def scan_theme(root, state, force=False):
+    """
+    Return ({directory: {icon: flags}}, changed directory names), reusing
+    the stored listing for directories whose mtime is unchanged.
+    """
+    listing = {}
+    changed = []
+    for name in theme_directories(root):
+        try:
+            mtime = os.stat(root / name).st_mtime_ns
+        except OSError:
+            continue
+        cached = state.get(name)
+        if not force and cached and cached['mtime'] == mtime:
+            listing[name] = cached['icons']
+            continue
+        listing[name] = scan_directory(root / name)
+        state[name] = {'mtime': mtime, 'icons': listing[name]}
+        changed.append(name)
+    for name in list(state):
+        if name not in listing:
+            del state[name]
+            changed.append(name)
+    return listing, changed
+
+class _Writer:
+    def __init__(self):
+        self.data = bytearray()
+
+    def offset(self):
+        return len(self.data)
+
+    def u16(self, *values):
+        self.data += struct.pack(f">{len(values)}H", *values)
+
+    def u32(self, *values):
+        self.data += struct.pack(f">{len(values)}I", *values)
+
+    def patch_u32(self, offset, value):
+        struct.pack_into(">I", self.data, offset, value)
+
+    def string(self, text):
+        offset = self.offset()
+        self.data += text.encode() + b"\0"
+        self.data += b"\0" * (-len(self.data) % 4)
+        return offset
+
+def build_cache(listing):
+    """Serialize {directory: {icon: flags}} into the GTK cache format"""
+    directories = list(listing)
+    images = {}  # icon -> [(directory index, flags)]
+    for index, directory in enumerate(directories):
+        for icon, flags in listing[directory].items():
+            images.setdefault(icon, []).append((index, flags))
+
+    n_buckets = next_prime(len(images) // 3 or 1)
+    buckets = [[] for _ in range(n_buckets)]
+    for icon in sorted(images):
+        buckets[icon_name_hash(icon) % n_buckets].append(icon)
+
+    out = _Writer()
+    out.u16(MAJOR, MINOR)
+    out.u32(0, 0)  # Hash and directory list offsets, patched below
+
+    hash_offset = out.offset()
+    out.u32(n_buckets)
+    bucket_table = out.offset()
+    out.u32(*([EMPTY] * n_buckets))
+
+    for number, chain in enumerate(buckets):
+        previous = None
+        for icon in chain:
+            icon_offset = out.offset()
+            out.u32(EMPTY, 0, 0)
+            if previous is None:
+                out.patch_u32(bucket_table + 4 * number, icon_offset)
+            else:
+                out.patch_u32(previous, icon_offset)
+            out.patch_u32(icon_offset + 4, out.string(icon))
+            image_list = out.offset()
+            out.u32(len(images[icon]))
+            for directory_index, flags in images[icon]:
+                out.u16(directory_index, flags)
+                out.u32(0)
+            out.patch_u32(icon_offset + 8, image_list)
+            previous = icon_offset
+
+    directory_offset = out.offset()
+    out.u32(len(directories))
+    name_table = out.offset()
+    out.u32(*([0] * len(directories)))
+    for i, directory in enumerate(directories):
+        out.patch_u32(name_table + 4 * i, out.string(directory))
+
+    out.patch_u32(4, hash_offset)
+    out.patch_u32(8, directory_offset)
+    return bytes(out.data)
+
+def read_cache(data):
+    """
+    Parse and validate a cache, returning {directory: {icon: flags}}.
+    Raises ValueError on anything GTK's validator would reject.
+    """
+    size = len(data)
+
+    def u16(offset):
+        if offset + 2 > size:
+            raise ValueError(f"u16 at {offset} past end of file")
+        return struct.unpack_from(">H", data, offset)[0]
+
+    def u32(offset):
+        if offset + 4 > size or offset % 4:
+            raise ValueError(f"bad u32 offset {offset}")
+        return struct.unpack_from(">I", data, offset)[0]
+
+    def string(offset):
+        end = data.find(b"\0", offset)
+        if offset >= size or end < 0:
+            raise ValueError(f"unterminated string at {offset}")
+        return data[offset:end].decode()
+
+    if size < 12 or (u16(0), u16(2)) != (MAJOR, MINOR):
+        raise ValueError("not an icon cache version 1.0")
+    hash_offset, directory_offset = u32(4), u32(8)
+
+    n_directories = u32(directory_offset)
+    directories = [string(u32(directory_offset + 4 + 4 * i)) for i in range(n_directories)]
+    listing = {directory: {} for directory in directories}
+
+    n_buckets = u32(hash_offset)
+    seen = set()
+    for bucket in range(n_buckets):
+        icon_offset = u32(hash_offset + 4 + 4 * bucket)
+        while icon_offset != EMPTY:
+            if icon_offset in seen:
+                raise ValueError(f"loop in hash chain at {icon_offset}")
+            seen.add(icon_offset)
+            name = string(u32(icon_offset + 4))
+            if icon_name_hash(name) % n_buckets != bucket:
+                raise ValueError(f"icon {name!r} is in bucket {bucket}, hashes elsewhere")
+            image_list = u32(icon_offset + 8)
+            for i in range(u32(image_list)):
+                image = image_list + 4 + 8 * i
+                directory_index, flags = u16(image), u16(image + 2)
+                if directory_index >= n_directories:
+                    raise ValueError(f"icon {name!r} points at directory {directory_index}")
+                if not flags or flags & ~0x0f:
+                    raise ValueError(f"icon {name!r} has bad flags {flags:#x}")
+                if u32(image + 4):
+                    raise ValueError(f"icon {name!r} has image data, which this tool never writes")
+                listing[directories[directory_index]][name] = flags
+            icon_offset = u32(icon_offset)
+    return listing
+
+def update(root, force=False):
+    """Refresh ROOT/icon-theme.cache; returns the directories rescanned, or None if untouched"""
+    root = Path(root).resolve()
+    cache = root / CACHE_NAME
+    state = {} if force else load_state(root)
+    listing, changed = scan_theme(root, state, force)
+
+    if not changed and cache.exists() and cache.stat().st_mtime_ns >= root.stat().st_mtime_ns:
+        return None
+
+    data = build_cache(listing)
+    try:
+        current = cache.read_bytes()
+    except OSError:
+        current = None
+    if data != current:
+        tmp = root / f".{CACHE_NAME}.{os.getpid()}.tmp"
+        tmp.write_bytes(data)
+        os.replace(tmp, cache)
+    # GTK ignores a cache older than the theme directory, and writing the
+    # cache just bumped the directory's mtime; line the two up.
+    cache_mtime = cache.stat().st_mtime_ns
+    os.utime(root, ns=(root.stat().st_atime_ns, cache_mtime))
+    save_state(root, state)
+    return changed
+
+def check(root):
+    """Validate ROOT/icon-theme.cache and compare it with a fresh scan; returns problems"""
+    root = Path(root).resolve()
+    try:
+        cached = read_cache((root / CACHE_NAME).read_bytes())
+    except (OSError, ValueError) as e:
+        return [str(e)]
+    problems = compare(cached, scan_theme(root, {}, force=True)[0])
+    if (root / CACHE_NAME).stat().st_mtime_ns < root.stat().st_mtime_ns:
+        problems.append("cache is older than the theme directory; GTK will ignore it")
+    return problems
+
+def compare(a, b):
+    problems = []
+    for directory in sorted(set(a) | set(b)):
+        icons_a, icons_b = a.get(directory, {}), b.get(directory, {})
+        for icon in sorted(set(icons_a) | set(icons_b)):
+            if icons_a.get(icon) != icons_b.get(icon):
+                problems.append(f"{directory}/{icon}: {icons_a.get(icon)} != {icons_b.get(icon)}")
+    return problems
+
+def main():
+    args = sys.argv[1:]
+    paths = [a for a in args if not a.startswith('--')]
+    if not paths:
+        print("usage: iconcache.py THEME_DIR... [--force|--check] | A.cache --compare B.cache", file=sys.stderr)
+        sys.exit(2)
+
+    if '--compare' in args:
+        a, b = (read_cache(Path(p).read_bytes()) for p in paths[:2])
+        problems = compare(a, b)
+        print("\n".join(problems) or "identical")
+        sys.exit(1 if problems else 0)
+
+    status = 0
+    for path in paths:
+        if '--check' in args:
+            problems = check(path)
+            for problem in problems[:20]:
+                print(f"{path}: {problem}")
+            if problems:
+                print(f"{path}: {len(problems)} problem(s)")
+                status = 1
+            else:
+                print(f"{path}: ok")
+            continue
+        changed = update(path, force='--force' in args)
+        if changed is None:
+            print(f"{path}: up to date")
+        else:
+            print(f"{path}: wrote {CACHE_NAME} ({len(changed)} directories rescanned)")
+    sys.exit(status)
+
+if __name__ == "__main__":
+    main()
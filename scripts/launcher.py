@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+
+# App launcher provider for rofi script mode
+# Replaces `rofi -show drun`, which re-parses every .desktop file on each open.
+# Parsed entries are kept in ~/.cache/neon-launcher/index.json, one record per
+# applications directory keyed by its mtime, so opening the drawer only stats
+# the directories and re-reads the ones that changed (an install or removal
+# renames files in place, which bumps the directory mtime).
+#
+# Rows are ranked by frecency: every launch adds 1 to the app's score, and
+# scores halve every HALF_LIFE days, so often *and* recently used apps come
+# first. Apps never launched follow alphabetically.
+#
+#   rofi -modi "apps:launcher.py" -show apps   What launcher.sh runs
+#   launcher.py --list                         Ranked "id<TAB>name<TAB>score" lines
+#   launcher.py --rebuild                      Drop the index and reparse everything
+#
+# Directories follow XDG_DATA_HOME and XDG_DATA_DIRS, so pointing those (and
+# HOME, for the cache and history) at a fixture tree exercises everything.
+
+import json
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import hypripc
+
+CACHE_DIR = Path.home() / ".cache" / "neon-launcher"
+INDEX_FILE = CACHE_DIR / "index.json"
+INDEX_VERSION = 1
+STATE_DIR = Path(os.environ.get("XDG_STATE_HOME") or Path.home() / ".local" / "state") / "neon-launcher"
+HISTORY_FILE = STATE_DIR / "frecency.json"
+HALF_LIFE = 14 * 86400
+MIN_SCORE = 0.01
+TERMINAL = os.environ.get("TERMINAL", "kitty")
+
+# Exec field codes that expand to nothing when launching without files
+DROPPED_FIELD_CODES = set("fFuUdDnNvm")
+
+def application_dirs():
+    """applications/ directories in XDG precedence order, highest first"""
+    data_home = os.environ.get("XDG_DATA_HOME") or str(Path.home() / ".local" / "share")
+    data_dirs = os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share"
+    dirs = []
+    for base in [data_home] + data_dirs.split(":"):
+        if base:
+            path = os.path.join(base, "applications")
+            if path not in dirs:
+                dirs.append(path)
+    return dirs
+
+def locale_keys():
+    """Localized key suffixes to try, most specific first (per the desktop entry spec)"""
+    value = os.environ.get("LC_ALL") or os.environ.get("LC_MESSAGES") or os.environ.get("LANG") or ""
+    value, _, modifier = value.partition("@")
+    lang, _, country = value.split(".", 1)[0].partition("_")
+    if lang in ("", "C", "POSIX"):
+        return []
+    keys = []
+    if country and modifier:
+        keys.append(f"{lang}_{country}@{modifier}")
+    if country:
+        keys.append(f"{lang}_{country}")
+    if modifier:
+        keys.append(f"{lang}@{modifier}")
+    keys.append(lang)
+    return keys
+
+def unescape(value):
+    """Desktop entry string escapes: \\s \\n \\t \\r \\\\"""
+    if "\\" not in value:
+        return value
+    out = []
+    i = 0
+    while i < len(value):
+        c = value[i]
+        if c == "\\" and i + 1 < len(value):
+            out.append({'s': ' ', 'n': '\n', 't': '\t', 'r': '\r', '\\': '\\'}.get(value[i + 1], "\\" + value[i + 1]))
+            i += 2
+            continue
+        out.append(c)
+        i += 1
+    return "".join(out)
+
+def read_group(path):
+    """Key/value pairs of the [Desktop Entry] group, or None if there isn't one"""
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+    fields = None
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("["):
+            if fields is not None:
+                break
+            if line == "[Desktop Entry]":
+                fields = {}
+            continue
+        if fields is not None and "=" in line:
+            key, value = line.split("=", 1)
+            fields.setdefault(key.strip(), value.strip())
+    return fields
+
+def localized(fields, key, locales):
+    for suffix in locales:
+        if f"{key}[{suffix}]" in fields:
+            return unescape(fields[f"{key}[{suffix}]"])
+    return unescape(fields.get(key, ""))
+
+def split_list(value):
+    return [item for item in unescape(value).split(";") if item]
+
+def parse_entry(path, locales):
+    """
+    The fields the launcher needs from one .desktop file, or None if it is
+    not an application. Hidden entries are kept (flagged) because they still
+    shadow an entry with the same id further down the search path.
+    """
+    fields = read_group(path)
+    if fields is None or fields.get("Type", "Application") != "Application":
+        return None
+    hidden = fields.get("Hidden") == "true" or fields.get("NoDisplay") == "true" or not fields.get("Exec")
+    try_exec = fields.get("TryExec")
+    if try_exec and not (shutil.which(try_exec) if "/" not in try_exec else os.access(try_exec, os.X_OK)):
+        hidden = True
+    return {
+        'name': localized(fields, "Name", locales),
+        'generic': localized(fields, "GenericName", locales),
+        'keywords': split_list(localized(fields, "Keywords", locales)),
+        'icon': unescape(fields.get("Icon", "")),
+        'exec': fields.get("Exec", ""),
+        'path': unescape(fields.get("Path", "")),
+        'terminal': fields.get("Terminal") == "true",
+        'only_show_in': split_list(fields.get("OnlyShowIn", "")),
+        'not_show_in': split_list(fields.get("NotShowIn", "")),
+        'hidden': hidden,
+        'file': str(path),
+    }
+
+def scan_directory(directory, prefix, locales):
+    """({desktop id: entry}, [subdirectories]) for one directory, not recursive"""
+    entries = {}
+    subdirs = []
+    try:
+        listing = sorted(os.scandir(directory), key=lambda e: e.name)
+    except OSError:
+        return entries, subdirs
+    for entry in listing:
+        try:
+            if entry.is_dir():
+                subdirs.append(entry.name)
+                continue
+        except OSError:
+            continue
+        if entry.name.endswith(".desktop"):
+            parsed = parse_entry(entry.path, locales)
+            if parsed:
+                entries[prefix + entry.name] = parsed
+    return entries, subdirs
+
+def load_index():
+    try:
+        with open(INDEX_FILE) as f:
+            index = json.load(f)
+        if index.get('version') == INDEX_VERSION:
+            return index
+    except (OSError, ValueError):
+        pass
+    return {'version': INDEX_VERSION}
+
+def save_index(index):
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = INDEX_FILE.with_name(f".index.{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(index, f, separators=(",", ":"))
+        os.replace(tmp, INDEX_FILE)
+    except OSError:
+        pass  # Next run just reparses
+
+def build_index(force=False):
+    """
+    Return {desktop id: entry} for every visible-or-shadowing entry, reusing
+    the stored record of each directory whose mtime hasn't changed.
+    """
+    locales = locale_keys()
+    index = {} if force else load_index()
+    if index.get('locales') != locales:
+        index = {}
+    old_dirs = index.get('dirs', {})
+    dirs = {}
+    changed = False
+
+    def visit(directory, prefix):
+        nonlocal changed
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return
+        record = old_dirs.get(directory)
+        if not record or record['mtime'] != mtime:
+            entries, subdirs = scan_directory(directory, prefix, locales)
+            record = {'mtime': mtime, 'entries': entries, 'subdirs': subdirs}
+            changed = True
+        dirs[directory] = record
+        # Subdirectories contribute "sub-name.desktop" ids
+        for name in record['subdirs']:
+            visit(os.path.join(directory, name), f"{prefix}{name}-")
+
+    for directory in application_dirs():
+        visit(directory, "")
+    if changed or set(dirs) != set(old_dirs):
+        save_index({'version': INDEX_VERSION, 'locales': locales, 'dirs': dirs})
+
+    apps = {}
+    for record in dirs.values():  # Insertion order is precedence order
+        for desktop_id, entry in record['entries'].items():
+            apps.setdefault(desktop_id, entry)
+    return apps
+
+def visible(entry, desktops):
+    if entry['hidden']:
+        return False
+    if entry['only_show_in'] and not desktops.intersection(entry['only_show_in']):
+        return False
+    return not desktops.intersection(entry['not_show_in'])
+
+def load_history():
+    try:
+        with open(HISTORY_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def score(record, now):
+    return record['score'] * 0.5 ** ((now - record['last']) / HALF_LIFE)
+
+def record_launch(desktop_id, now=None):
+    now = time.time() if now is None else now
+    history = load_history()
+    record = history.get(desktop_id)
+    history[desktop_id] = {'score': (score(record, now) if record else 0) + 1, 'last': now}
+    history = {k: v for k, v in history.items() if score(v, now) >= MIN_SCORE}
+    try:
+        STATE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = HISTORY_FILE.with_name(f".frecency.{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(history, f)
+        os.replace(tmp, HISTORY_FILE)
+    except OSError:
+        pass
+
+def ranked(apps, history, now=None):
+    """[(desktop id, entry, score)] best first; unscored apps alphabetically"""
+    now = time.time() if now is None else now
+    desktops = set(filter(None, os.environ.get("XDG_CURRENT_DESKTOP", "").split(":")))
+    rows = []
+    for desktop_id, entry in apps.items():
+        if visible(entry, desktops):
+            record = history.get(desktop_id)
+            rows.append((desktop_id, entry, score(record, now) if record else 0.0))
+    rows.sort(key=lambda row: (-row[2], row[1]['name'].casefold(), row[0]))
+    return rows
+
+def expand_exec(entry):
+    """argv for an entry's Exec line with field codes expanded for a no-file launch"""
+    try:
+        args = shlex.split(unescape(entry['exec']))
+    except ValueError:
+        return None
+    argv = []
+    for arg in args:
+        if arg == "%i":
+            if entry['icon']:
+                argv += ["--icon", entry['icon']]
+            continue
+        if len(arg) == 2 and arg[0] == "%" and arg[1] in DROPPED_FIELD_CODES:
+            continue
+        out = []
+        i = 0
+        while i < len(arg):
+            if arg[i] == "%" and i + 1 < len(arg):
+                code = arg[i + 1]
+                out.append({'%': '%', 'c': entry['name'], 'k': entry['file']}.get(code, ""))
+                i += 2
+                continue
+            out.append(arg[i])
+            i += 1
+        argv.append("".join(out))
+    if entry['terminal']:
+        argv = [TERMINAL, "-e"] + argv
+    return argv or None
+
+def launch(entry):
+    """Start the app outside rofi's process tree, through Hyprland when possible"""
+    argv = expand_exec(entry)
+    if not argv:
+        return
+    command = shlex.join(argv)
+    if entry['path']:
+        command = f"cd {shlex.quote(entry['path'])} && {command}"
+    try:
+        hypripc.dispatch("exec", command)
+        return
+    except hypripc.HyprlandError:
+        pass
+    subprocess.Popen(argv, cwd=entry['path'] or None, start_new_session=True,
+                     stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+def rofi_rows(rows):
+    """Rofi script-mode rows: display name, then icon/info/meta as \\0 and \\x1f separated options"""
+    for desktop_id, entry, _ in rows:
+        meta = " ".join(filter(None, [entry['generic']] + entry['keywords'] + [desktop_id[:-len(".desktop")]]))
+        yield f"{entry['name']}\0icon\x1f{entry['icon']}\x1finfo\x1f{desktop_id}\x1fmeta\x1f{meta}\n"
+
+def rofi_mode():
+    # ROFI_RETV: 0 = initial call, 1 = an entry was picked
+    if os.environ.get("ROFI_RETV") == "1" and os.environ.get("ROFI_INFO"):
+        desktop_id = os.environ["ROFI_INFO"]
+        entry = build_index().get(desktop_id)
+        if entry:
+            record_launch(desktop_id)
+            launch(entry)
+        return  # No output: rofi closes
+
+    out = sys.stdout
+    out.write("\0no-custom\x1ftrue\n")
+    history = load_history()
+    rows = ranked(build_index(), history)
+    # Frecent apps are what is on screen first; hand them over before the rest
+    top = sum(1 for row in rows if row[2] > 0)
+    for i, line in enumerate(rofi_rows(rows)):
+        out.write(line)
+        if i + 1 == top:
+            out.flush()
+    out.flush()
+
+def main():
+    args = sys.argv[1:]
+    if '--rebuild' in args:
+        apps = build_index(force=True)
+        print(f"indexed {len(apps)} entries from {len(application_dirs())} directories")
+        return
+    if '--list' in args:
+        for desktop_id, entry, value in ranked(build_index(), load_history()):
+            print(f"{desktop_id}\t{entry['name']}\t{value:.3f}")
+        return
+    rofi_mode()
+
+if __name__ == "__main__":
+    try:
+        main()
+    except BrokenPipeError:
+        pass
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+
+# Wallpaper palette extraction with a content-hash cache
+# Replaces `wal -i bg.jpg --cols16` on boot: the palette for an image is
+# stored under ~/.cache/neon-theme/palettes/<sha1>.json, so an unchanged
+# wallpaper skips extraction entirely. On a miss a NumPy median cut over a
+# downsampled copy picks 16 colours and arranges them the way wal's dark
+# --cols16 scheme does. The results are written in wal's own formats:
+# ~/.cache/wal/colors and colors.json, the kitty/hyprland/waybar files
+# themesync.py propagates, and the files read from ~/.cache/wal directly
+# (colors-rofi-dark.rasi for rofi, colors-wal.vim for pywal.nvim).
+#
+#   palette.py [IMAGE]          Extract (or load) and write ~/.cache/wal
+#   palette.py [IMAGE] --print  Show the palette without writing anything
+
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+WALLPAPER = Path.home() / ".config" / "hypr" / "bg" / "bg.jpg"
+WAL_DIR = Path.home() / ".cache" / "wal"
+CACHE_DIR = Path.home() / ".cache" / "neon-theme" / "palettes"
+CACHE_VERSION = 1
+SAMPLE_SIZE = 128  # Longest side of the image the colours are picked from
+COLOR_COUNT = 16
+
+# wal's colors-rofi-dark.rasi template, imported by rofi/config.rasi and the launcher
+ROFI_TEMPLATE = '''\
+* {{
+    active-background: {color2};
+    active-foreground: @foreground;
+    normal-background: @background;
+    normal-foreground: @foreground;
+    urgent-background: {color1};
+    urgent-foreground: @foreground;
+
+    alternate-active-background: @background;
+    alternate-active-foreground: @foreground;
+    alternate-normal-background: @background;
+    alternate-normal-foreground: @foreground;
+    alternate-urgent-background: @background;
+    alternate-urgent-foreground: @foreground;
+
+    selected-active-background: {color1};
+    selected-active-foreground: @foreground;
+    selected-normal-background: {color2};
+    selected-normal-foreground: @foreground;
+    selected-urgent-background: {color3};
+    selected-urgent-foreground: @foreground;
+
+    background-color: @background;
+    background: {background};
+    foreground: {foreground};
+    border-color: @background;
+    spacing: 2;
+}}
+
+#window {{
+    background-color: @background;
+    border: 0;
+    padding: 2.5ch;
+}}
+
+#mainbox {{
+    border: 0;
+    padding: 0;
+}}
+
+#message {{
+    border: 2px 0px 0px;
+    border-color: @border-color;
+    padding: 1px;
+}}
+
+#textbox {{
+    text-color: @foreground;
+}}
+
+#inputbar {{
+    children:   [ prompt,textbox-prompt-colon,entry,case-indicator ];
+}}
+
+#textbox-prompt-colon {{
+    expand: false;
+    str: ":";
+    margin: 0px 0.3em 0em 0em;
+    text-color: @normal-foreground;
+}}
+
+#listview {{
+    fixed-height: 0;
+    border: 2px 0px 0px;
+    border-color: @border-color;
+    spacing: 2px;
+    scrollbar: true;
+    padding: 2px 0px 0px;
+}}
+
+#element {{
+    border: 0;
+    padding: 1px;
+}}
+
+#element-text, element-icon {{
+    background-color: inherit;
+    text-color:       inherit;
+}}
+
+#element.normal.normal {{
+    background-color: @normal-background;
+    text-color: @normal-foreground;
+}}
+
+#element.normal.urgent {{
+    background-color: @urgent-background;
+    text-color: @urgent-foreground;
+}}
+
+#element.normal.active {{
+    background-color: @active-background;
+    text-color: @active-foreground;
+}}
+
+#element.selected.normal {{
+    background-color: @selected-normal-background;
+    text-color: @selected-normal-foreground;
+}}
+
+#element.selected.urgent {{
+    background-color: @selected-urgent-background;
+    text-color: @selected-urgent-foreground;
+}}
+
+#element.selected.active {{
+    background-color: @selected-active-background;
+    text-color: @selected-active-foreground;
+}}
+
+#element.alternate.normal {{
+    background-color: @alternate-normal-background;
+    text-color: @alternate-normal-foreground;
+}}
+
+#element.alternate.urgent {{
+    background-color: @alternate-urgent-background;
+    text-color: @alternate-urgent-foreground;
+}}
+
+#element.alternate.active {{
+    background-color: @alternate-active-background;
+    text-color: @alternate-active-foreground;
+}}
+
+#scrollbar {{
+    width: 4px;
+    border: 0;
+    handle-width: 8px;
+    padding: 0;
+}}
+
+#sidebar {{
+    border: 2px 0px 0px;
+    border-color: @border-color;
+}}
+
+#button {{
+    text-color: @normal-foreground;
+}}
+
+#button.selected {{
+    background-color: @selected-normal-background;
+    text-color: @selected-normal-foreground;
+}}
+
+#inputbar {{
+    spacing: 0;
+    text-color: @normal-foreground;
+    padding: 1px;
+}}
+
+#case-indicator {{
+    spacing: 0;
+    text-color: @normal-foreground;
+}}
+
+#entry {{
+    spacing: 0;
+    text-color: @normal-foreground;
+}}
+
+#prompt {{
+    spacing: 0;
+    text-color: @normal-foreground;
+}}
+'''
+
+def image_hash(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def to_hex(rgb):
+    return "#{:02x}{:02x}{:02x}".format(*(int(round(c)) for c in rgb))
+
+def from_hex(color):
+    return [int(color[i:i + 2], 16) for i in (1, 3, 5)]
+
+def darken(rgb, amount):
+    return [c * (1 - amount) for c in rgb]
+
+def blend(rgb, other):
+    return [(a + b) / 2 for a, b in zip(rgb, other)]
+
+def load_pixels(path):
+    """RGB pixels of a small copy of the image as an (N, 3) float array"""
+    import numpy as np
+    from PIL import Image
+
+    with Image.open(path) as img:
+        # Let the JPEG decoder scale down by up to 8x instead of decoding full size
+        img.draft('RGB', (SAMPLE_SIZE * 2, SAMPLE_SIZE * 2))
+        img = img.convert('RGB')
+        img.thumbnail((SAMPLE_SIZE, SAMPLE_SIZE))
+        return np.asarray(img, dtype=np.float32).reshape(-1, 3)
+
+def median_cut(pixels, count=COLOR_COUNT):
+    """Split the box with the widest channel range at its median until there are `count`"""
+    import numpy as np
+
+    boxes = [pixels]
+    while len(boxes) < count:
+        spans = [np.ptp(box, axis=0).max() if len(box) > 1 else -1 for box in boxes]
+        index = int(np.argmax(spans))
+        if spans[index] <= 0:
+            break
+        box = boxes.pop(index)
+        channel = int(np.argmax(np.ptp(box, axis=0)))
+        box = box[np.argsort(box[:, channel], kind='stable')]
+        half = len(box) // 2
+        boxes += [box[:half], box[half:]]
+    colors = [box.mean(axis=0) for box in boxes]
+    while len(colors) < count:  # Flat images: repeat what we have
+        colors.append(colors[len(colors) % len(boxes)])
+    return colors
+
+def arrange(colors):
+    """
+    Order 16 extracted colours into a terminal palette, following wal's dark
+    scheme: darkest as background, the brighter half as colors 1-7, colors
+    9-14 as brighter shades and 7/8/15 as greys towards #eeeeee.
+    """
+    colors = sorted(colors, key=lambda c: 0.2126 * c[0] + 0.7152 * c[1] + 0.0722 * c[2])
+    raw = colors[:1] + colors[8:16] + colors[8:15]
+    raw = [list(c) for c in raw]
+    raw[0] = darken(raw[0], 0.40)
+    raw[15] = blend(raw[15], from_hex("#eeeeee"))
+    raw[7] = darken(raw[15], 0.25)
+    raw[8] = darken(raw[15], 0.55)
+    for i in range(1, 7):
+        raw[i + 8] = [min(c * 4 / 3, 255) for c in raw[i]]
+    return [to_hex(c) for c in raw]
+
+def palette_json(colors, image):
+    """The colors.json layout wal writes (and power.py/theme.py read)"""
+    return {
+        'wallpaper': str(image),
+        'alpha': "100",
+        'special': {'background': colors[0], 'foreground': colors[15], 'cursor': colors[15]},
+        'colors': {f'color{i}': color for i, color in enumerate(colors)},
+    }
+
+def extract(image):
+    """Extract a wal-style palette dict from an image (needs numpy and Pillow)"""
+    return palette_json(arrange(median_cut(load_pixels(image))), image)
+
+def cached_palette(image, save=True):
+    """
+    Return (palette, cache hit) for an image, extracting only on a cache miss.
+    A fresh extraction is stored in the cache unless save is False.
+    """
+    path = CACHE_DIR / f"{image_hash(image)}.json"
+    try:
+        with open(path) as f:
+            cached = json.load(f)
+        if cached.get('version') == CACHE_VERSION:
+            cached['palette']['wallpaper'] = str(image)
+            return cached['palette'], True
+    except (OSError, ValueError, KeyError):
+        pass
+
+    palette = extract(image)
+    if not save:
+        return palette, False
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'w') as f:
+        json.dump({'version': CACHE_VERSION, 'palette': palette}, f)
+    os.replace(tmp, path)
+    return palette, False
+
+def rgba(color):
+    return "rgba({},{},{},1.0)".format(*from_hex(color))
+
+def render_files(palette):
+    """Every wal output file the rest of the setup reads, as {name: text}"""
+    special, colors = palette['special'], palette['colors']
+    ordered = [colors[f'color{i}'] for i in range(16)]
+
+    kitty = [
+        f"foreground         {special['foreground']}",
+        f"background         {special['background']}",
+        "background_opacity 1.0",
+        f"cursor             {special['cursor']}",
+        "",
+        f"active_tab_foreground     {special['background']}",
+        f"active_tab_background     {special['foreground']}",
+        f"inactive_tab_foreground   {special['foreground']}",
+        f"inactive_tab_background   {special['background']}",
+        "",
+        f"active_border_color   {special['foreground']}",
+        f"inactive_border_color {special['background']}",
+        f"bell_border_color     {colors['color1']}",
+        "",
+    ]
+    for i in range(8):
+        kitty += [f"{f'color{i}':<13}{ordered[i]}", f"{f'color{i + 8}':<13}{ordered[i + 8]}"]
+
+    hyprland = [
+        f"$wallpaper = {palette['wallpaper']}",
+        "",
+        f"$foreground = {rgba(special['foreground'])}",
+        f"$background = {rgba(special['background'])}",
+        "",
+    ] + [f"$color{i} = {rgba(color)}" for i, color in enumerate(ordered)]
+
+    waybar = [f"@define-color {name} {special[name]};" for name in ('foreground', 'background', 'cursor')]
+    waybar += [""] + [f"@define-color color{i} {color};" for i, color in enumerate(ordered)]
+
+    # pywal.nvim (and lualine's pywal theme) source this at startup
+    specials = {'wallpaper': palette['wallpaper'], **special}
+    vim = ["\" Special"] + [f'let {name:<10} = "{value}"' for name, value in specials.items()]
+    vim += ["", "\" Colors"] + [f'let {f"color{i}":<7} = "{color}"' for i, color in enumerate(ordered)]
+
+    return {
+        'colors': "\n".join(ordered) + "\n",
+        'colors.json': json.dumps(palette, indent=4) + "\n",
+        'colors-kitty.conf': "\n".join(kitty) + "\n",
+        'colors-hyprland.conf': "\n".join(hyprland) + "\n",
+        'colors-waybar.css': "\n".join(waybar) + "\n",
+        'colors-rofi-dark.rasi': ROFI_TEMPLATE.format(**special, **colors),
+        'colors-wal.vim': "\n".join(vim) + "\n",
+    }
+
+def write_files(palette, directory=WAL_DIR):
+    """Atomically write the wal files whose content differs; returns the names written"""
+    directory.mkdir(parents=True, exist_ok=True)
+    written = []
+    for name, text in render_files(palette).items():
+        path = directory / name
+        data = text.encode()
+        try:
+            if path.read_bytes() == data:
+                continue
+        except OSError:
+            pass
+        tmp = path.with_name(f".{name}.{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        written.append(name)
+    return written
+
+def generate(image=WALLPAPER):
+    """Cached extraction + write; returns the wal files that changed"""
+    palette, _hit = cached_palette(image)
+    return write_files(palette)
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    image = Path(args[0]).expanduser().resolve() if args else WALLPAPER
+    if '--print' in sys.argv:
+        palette, hit = cached_palette(image, save=False)
+        print(f"{image} ({'cached' if hit else 'extracted'})")
+        for name, color in palette['colors'].items():
+            print(f"{name:>8} {color}")
+        return
+    for name in generate(image):
+        print(f"palette: wrote {WAL_DIR / name}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
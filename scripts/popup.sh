@@ -0,0 +1,7 @@
+#!/bin/bash
+# Toggle a popup (power, binds, sunnah) in the resident host from popups.py.
+# Falls back to starting the host when it isn't running yet.
+
+gdbus call --session --dest com.neonanime.Popups --object-path /com/neonanime/Popups \
+    --method org.gtk.Actions.Activate toggle "[<'$1'>]" "{}" > /dev/null 2>&1 \
+    || exec python3 ~/.config/scripts/popups.py "$1"
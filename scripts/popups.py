@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+
+# Resident popup host
+# Builds the power menu, HyprBinds and the Sunnah app once and keeps them
+# hidden, so showing one is a single D-Bus call instead of a Python + GTK start.
+# The Sunnah app starts fetching from sunnah.com as soon as it exists, so it
+# is only built on its first show.
+#
+#   popups.py --daemon        Start the host with the power menu and binds prebuilt (autostart)
+#   popups.py power|binds|sunnah
+#                             Toggle a popup, starting the host if needed
+#   popup.sh power|binds|sunnah
+#                             Thin client: toggles via gdbus without starting Python
+#
+# With NEON_TRACE set (see tracing.py), the time to first frame of every show
+# is also appended to ~/.cache/popups.log; otherwise nothing is logged, since
+# the host runs for the whole session.
+
+import os
+import sys
+import time
+
+import gi
+gi.require_version('Gtk', '3.0')
+from gi.repository import Gtk, Gio, GLib
+
+import tracing
+from power import PowerMenu
+from binds import PixelPerfectShortcuts
+from test import SunnahApp
+
+APP_ID = "com.neonanime.Popups"
+LOG_FILE = os.path.expanduser("~/.cache/popups.log")
+
+POPUPS = {
+    'power': lambda app: PowerMenu(),
+    'binds': lambda app: PixelPerfectShortcuts(),
+    'sunnah': lambda app: SunnahApp(application=app),
+}
+PREBUILT = ('power', 'binds')  # Built by --daemon; the rest on first show
+
+def log_timing(message):
+    if not tracing.ENABLED:
+        return
+    print(message, file=sys.stderr)
+    try:
+        with open(LOG_FILE, 'a') as f:
+            f.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} {message}\n")
+    except OSError:
+        pass
+
+class PopupHost(Gtk.Application):
+    def __init__(self):
+        super().__init__(application_id=APP_ID,
+                         flags=Gio.ApplicationFlags.HANDLES_COMMAND_LINE)
+        self.windows = {}
+
+    def do_startup(self):
+        Gtk.Application.do_startup(self)
+        # org.gtk.Actions "toggle" is what popup.sh calls over D-Bus
+        action = Gio.SimpleAction.new("toggle", GLib.VariantType.new("s"))
+        action.connect("activate", lambda action, name: self.toggle(name.get_string(), time.monotonic(), "warm"))
+        self.add_action(action)
+
+    def do_command_line(self, command_line):
+        args = command_line.get_arguments()[1:]
+        if command_line.get_is_remote():
+            started, kind = time.monotonic(), "warm"
+        else:
+            started, kind = time.monotonic() - tracing.process_age(), "cold"
+
+        if '--daemon' in args:
+            self.hold()
+            for name in PREBUILT:
+                self.get_window(name)
+        for name in args:
+            if name in POPUPS:
+                self.toggle(name, started, kind)
+            elif name != '--daemon':
+                command_line.printerr(f"Unknown popup: {name} (expected {', '.join(POPUPS)})\n")
+        return 0
+
+    def get_window(self, name):
+        """Build a popup on first use; afterwards closing it only hides it"""
+        if name not in self.windows:
+            win = POPUPS[name](self)
+            win.connect("delete-event", lambda w, e: w.hide_on_delete())
+            self.add_window(win)
+            self.windows[name] = win
+        return self.windows[name]
+
+    def toggle(self, name, started, kind):
+        if name not in POPUPS:
+            return
+        if kind == "warm" and name not in self.windows:
+            kind = "first"  # Host was running but this window wasn't built yet
+        win = self.get_window(name)
+        if win.get_visible():
+            win.hide()
+            return
+
+        def on_first_draw(widget, cr):
+            widget.disconnect(handler)
+            log_timing(f"{name}: {kind} start, first frame after {(time.monotonic() - started) * 1000:.1f} ms")
+            return False
+
+        handler = win.connect("draw", on_first_draw)
+        win.show_all()
+        win.present()
+
+def main():
+    app = PopupHost()
+    sys.exit(app.run(sys.argv))
+
+if __name__ == "__main__":
+    main()
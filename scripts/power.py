@@ -1,19 +1,55 @@
 #!/usr/bin/env python3
 
-import gi
-import subprocess
-import json
-import os
+import threading
 
-gi.require_version('Gtk', '3.0')
-from gi.repository import Gtk, Gdk
+import tracing
+with tracing.span("import gi"):
+    import gi
+    gi.require_version('Gtk', '3.0')
+    from gi.repository import Gtk, GLib
+
+import sessionctl
+import theme
+
+# Bump CSS_VERSION when editing the template so cached renders are replaced
+CSS_VERSION = 1
+CSS_TEMPLATE = """
+#power-menu {{
+    background-color: {background};
+    border-radius: 5px;
+    border: 10px solid {color0};
+}}
+
+#power-menu button {{
+    background-color: {color0};
+    color: {foreground};
+    border-radius: 5px;
+    border: 2px;
+    padding: 10px;
+    font-family: "Font Awesome 6 Free", sans-serif;
+}}
+
+#power-menu button:hover {{
+    background-color: {color3};
+    color: {background};
+}}
+
+#power-menu .danger:hover {{
+    background-color: {color3};
+    color: {background};
+}}
+
+#power-menu .success:hover {{
+    background-color: {color3};
+    color: {background};
+}}
+"""
 
 class PowerMenu(Gtk.Window):
+    @tracing.traced("power: __init__")
     def __init__(self):
         super().__init__(title="Power Menu")
-        
-        # Load pywal colors
-        self.pywal_colors = self.load_pywal_colors()
+        self.set_name("power-menu")  # CSS is scoped to this name
         
         # Window setup
         self.set_default_size(400, 100)
@@ -21,11 +57,22 @@ class PowerMenu(Gtk.Window):
         self.set_decorated(False)
         self.set_position(Gtk.WindowPosition.CENTER)
         self.set_skip_taskbar_hint(False)
+
+        # Hooks + logind calls; the first click wins until the action is done
+        self.session = sessionctl.SessionActions()
+        self.busy = False
         
-        # Apply styles
+        # Apply styles, and again on every show in case the palette changed
         self.apply_styles()
+        self.connect("map", lambda widget: self.apply_styles())
         
         # Create main container
+        self.create_layout()
+        tracing.first_draw(self, "power")
+
+    @tracing.traced("power: create_layout")
+    def create_layout(self):
+        """Button row"""
         self.box = Gtk.Box(spacing=10)
         self.box.set_homogeneous(True)
         self.box.set_margin_top(10)
@@ -40,73 +87,10 @@ class PowerMenu(Gtk.Window):
         self.create_button("", "Shutdown", self.on_shutdown_clicked)
         self.create_button("", "Reboot", self.on_reboot_clicked)
     
-    def load_pywal_colors(self):
-        """Load colors from pywal"""
-        colors_path = os.path.expanduser("~/.cache/wal/colors.json")
-        try:
-            with open(colors_path) as f:
-                colors = json.load(f)
-            return {
-                'background': colors['special']['background'],
-                'foreground': colors['special']['foreground'],
-                'color0': colors['colors']['color0'],
-                'color1': colors['colors']['color1'],
-                'color2': colors['colors']['color2'],
-                'color3': colors['colors']['color3'],
-            }
-        except:
-            # Fallback colors if pywal isn't available
-            return {
-                'background': '#282a36',
-                'foreground': '#f8f8f2',
-                'color0': '#21222c',
-                'color1': '#ff5555',
-                'color2': '#50fa7b',
-                'color3': '#ffb86c',
-            }
-    
+    @tracing.traced("power: apply_styles")
     def apply_styles(self):
         """Apply CSS styling with pywal colors"""
-        css = f"""
-        window {{
-            background-color: {self.pywal_colors['background']};
-            border-radius: 5px;
-            border: 10px solid {self.pywal_colors['color0']};
-        }}
-        
-        button {{
-            background-color: {self.pywal_colors['color0']};
-            color: {self.pywal_colors['foreground']};
-            border-radius: 5px;
-            border: 2px;
-            padding: 10px;
-            font-family: "Font Awesome 6 Free", sans-serif;
-        }}
-        
-        button:hover {{
-            background-color: {self.pywal_colors['color3']};
-            color: {self.pywal_colors['background']};
-        }}
-        
-        .danger:hover {{
-            background-color: {self.pywal_colors['color3']};
-            color: {self.pywal_colors['background']};
-        }}
-        
-        .success:hover {{
-            background-color: {self.pywal_colors['color3']};
-            color: {self.pywal_colors['background']};
-        }}
-        """
-        
-        style_provider = Gtk.CssProvider()
-        style_provider.load_from_data(css.encode())
-        
-        Gtk.StyleContext.add_provider_for_screen(
-            Gdk.Screen.get_default(),
-            style_provider,
-            Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
-        )
+        theme.apply_css("power-menu", CSS_TEMPLATE, CSS_VERSION)
     
     def create_button(self, icon, label, callback):
         """Create a styled button with icon and label"""
@@ -133,21 +117,41 @@ class PowerMenu(Gtk.Window):
         btn.connect("clicked", callback)
         self.box.pack_start(btn, True, True, 0)
     
+    def run_action(self, action):
+        """Hide at once, run the hooks and the action off the main loop, then close"""
+        if self.busy:
+            return
+        self.busy = True
+        self.hide()
+
+        def work():
+            try:
+                self.session.perform(action)
+            except sessionctl.SessionError as e:
+                sessionctl.log(f"{action} failed: {e}")
+            except Exception as e:
+                sessionctl.log(f"{action} failed: {type(e).__name__}: {e}")
+            finally:
+                # Always clear busy, or the resident menu ignores every later click
+                GLib.idle_add(self.on_action_done)
+        threading.Thread(target=work, daemon=True, name=f"power: {action}").start()
+
+    def on_action_done(self):
+        self.busy = False
+        self.close()
+        return False
+
     def on_lock_clicked(self, widget):
-        subprocess.Popen(["hyprlock"])
-        self.destroy()
+        self.run_action("lock")
     
     def on_logout_clicked(self, widget):
-        subprocess.Popen(["hyprctl", "dispatch", "exit"])
-        self.destroy()
+        self.run_action("logout")
     
     def on_shutdown_clicked(self, widget):
-        subprocess.Popen(["systemctl", "poweroff"])
-        self.destroy()
+        self.run_action("poweroff")
     
     def on_reboot_clicked(self, widget):
-        subprocess.Popen(["systemctl", "reboot"])
-        self.destroy()
+        self.run_action("reboot")
 
 def main():
     win = PowerMenu()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+
+# Offline prayer time calculator
+# Solar position maths follows the PrayTimes.org algorithm, which is also what
+# api.aladhan.com uses, so results line up with the API to the minute.
+
+import math
+from datetime import date, datetime, time
+from zoneinfo import ZoneInfo
+
+# Calculation methods (twilight angles in degrees below the horizon)
+METHODS = {
+    3: {'name': 'Muslim World League', 'fajr': 18, 'isha': 17},
+}
+
+# Asr shadow factor per school (0 = Shafi'i, 1 = Hanafi)
+ASR_FACTORS = {0: 1, 1: 2}
+
+RISE_SET_ANGLE = 0.833  # Refraction plus the sun's apparent radius
+IMSAK_MINUTES = 10      # Imsak is 10 minutes before Fajr
+
+# Initial guesses (hours) used to seed the iteration
+DEFAULT_TIMES = {
+    'Fajr': 5, 'Sunrise': 6, 'Dhuhr': 12,
+    'Asr': 13, 'Sunset': 18, 'Maghrib': 18, 'Isha': 18,
+}
+
+def _sin(d): return math.sin(math.radians(d))
+def _cos(d): return math.cos(math.radians(d))
+def _tan(d): return math.tan(math.radians(d))
+def _arcsin(x): return math.degrees(math.asin(x))
+def _arccos(x): return math.degrees(math.acos(x))
+def _arccot(x): return math.degrees(math.atan(1 / x))
+def _arctan2(y, x): return math.degrees(math.atan2(y, x))
+
+def _fix(a, b):
+    a = a - b * math.floor(a / b)
+    return a + b if a < 0 else a
+
+def _fixangle(a): return _fix(a, 360)
+def _fixhour(a): return _fix(a, 24)
+
+def julian_date(year, month, day):
+    """Julian date at midnight UTC for a Gregorian date"""
+    if month <= 2:
+        year -= 1
+        month += 12
+    a = year // 100
+    b = 2 - a + a // 4
+    return math.floor(365.25 * (year + 4716)) + math.floor(30.6001 * (month + 1)) + day + b - 1524.5
+
+def sun_position(jd):
+    """Declination and equation of time of the sun for a Julian date"""
+    d = jd - 2451545.0
+    g = _fixangle(357.529 + 0.98560028 * d)
+    q = _fixangle(280.459 + 0.98564736 * d)
+    l = _fixangle(q + 1.915 * _sin(g) + 0.020 * _sin(2 * g))
+    e = 23.439 - 0.00000036 * d
+
+    ra = _arctan2(_cos(e) * _sin(l), _cos(l)) / 15
+    eqt = q / 15 - _fixhour(ra)
+    decl = _arcsin(_sin(e) * _sin(l))
+    return decl, eqt
+
+class PrayTimes:
+    """Prayer time calculator for a fixed location and method"""
+
+    def __init__(self, latitude, longitude, timezone, method=3, school=0):
+        self.lat = latitude
+        self.lng = longitude
+        self.tz = ZoneInfo(timezone)
+        self.params = METHODS[method]
+        self.asr_factor = ASR_FACTORS[school]
+
+    def _mid_day(self, jdate, t):
+        eqt = sun_position(jdate + t)[1]
+        return _fixhour(12 - eqt)
+
+    def _sun_angle_time(self, jdate, angle, t, ccw=False):
+        decl = sun_position(jdate + t)[0]
+        noon = self._mid_day(jdate, t)
+        cos_t = (-_sin(angle) - _sin(decl) * _sin(self.lat)) / (_cos(decl) * _cos(self.lat))
+        if not -1 <= cos_t <= 1:
+            return float('nan')  # Sun never reaches this angle today
+        hours = _arccos(cos_t) / 15
+        return noon + (-hours if ccw else hours)
+
+    def _asr_time(self, jdate, t):
+        decl = sun_position(jdate + t)[0]
+        angle = -_arccot(self.asr_factor + _tan(abs(self.lat - decl)))
+        return self._sun_angle_time(jdate, angle, t)
+
+    def _compute(self, jdate, times):
+        """One iteration of the prayer time computation (times in hours)"""
+        p = {k: v / 24 for k, v in times.items()}
+        return {
+            'Fajr': self._sun_angle_time(jdate, self.params['fajr'], p['Fajr'], ccw=True),
+            'Sunrise': self._sun_angle_time(jdate, RISE_SET_ANGLE, p['Sunrise'], ccw=True),
+            'Dhuhr': self._mid_day(jdate, p['Dhuhr']),
+            'Asr': self._asr_time(jdate, p['Asr']),
+            'Sunset': self._sun_angle_time(jdate, RISE_SET_ANGLE, p['Sunset']),
+            'Maghrib': self._sun_angle_time(jdate, RISE_SET_ANGLE, p['Maghrib']),
+            'Isha': self._sun_angle_time(jdate, self.params['isha'], p['Isha']),
+        }
+
+    def _adjust_high_lats(self, times):
+        """Angle based correction for days where twilight never ends"""
+        if math.isnan(times['Sunrise']) or math.isnan(times['Sunset']):
+            return times  # Polar day or night: there is no night to take a portion of
+        night = _fixhour(times['Sunrise'] - times['Sunset'])
+        for name, angle, base, direction in (
+            ('Fajr', self.params['fajr'], 'Sunrise', -1),
+            ('Isha', self.params['isha'], 'Sunset', 1),
+        ):
+            portion = angle / 60 * night
+            diff = _fixhour(direction * (times[name] - times[base])) if not math.isnan(times[name]) else None
+            if diff is None or diff > portion:
+                times[name] = times[base] + direction * portion
+        return times
+
+    def utc_offset(self, day):
+        """UTC offset in hours for the configured timezone on a given day"""
+        local_noon = datetime.combine(day, time(12), tzinfo=self.tz)
+        return local_noon.utcoffset().total_seconds() / 3600
+
+    def times_for(self, day=None):
+        """Return raw prayer times in local decimal hours for a date"""
+        day = day or date.today()
+        jdate = julian_date(day.year, day.month, day.day) - self.lng / (15 * 24)
+
+        times = self._compute(jdate, DEFAULT_TIMES)
+        offset = self.utc_offset(day) - self.lng / 15
+        times = {k: v + offset for k, v in times.items()}
+        times = self._adjust_high_lats(times)
+
+        times['Imsak'] = times['Fajr'] - IMSAK_MINUTES / 60
+        if math.isnan(times['Sunrise']) or math.isnan(times['Sunset']):
+            times['Midnight'] = float('nan')
+        else:
+            times['Midnight'] = times['Sunset'] + _fixhour(times['Sunrise'] - times['Sunset']) / 2
+        return times
+
+    def timings(self, day=None):
+        """Return prayer times as 'HH:MM' strings, shaped like the aladhan API"""
+        return {name: format_time(t) for name, t in self.times_for(day).items()}
+
+def format_time(hours):
+    """Format decimal hours as 24h 'HH:MM', rounded to the nearest minute"""
+    if math.isnan(hours):
+        return '-----'
+    hours = _fixhour(hours + 0.5 / 60)
+    h = math.floor(hours)
+    m = math.floor((hours - h) * 60)
+    return f"{h:02d}:{m:02d}"
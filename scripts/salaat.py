@@ -1,51 +1,115 @@
 #!/usr/bin/env python3
 
-import requests
 import json
-from datetime import datetime
+import os
+import re
+from datetime import date, datetime, timedelta
 from pathlib import Path
 import sys
+import time
+
+from praytimes import PrayTimes
 
 # Configuration for Johannesburg
 CITY = "Johannesburg"
 COUNTRY = "South Africa"
+LATITUDE = -26.2041
+LONGITUDE = 28.0473
 METHOD = 3  # 3 = Shafi'i (MWL) calculation method
+SCHOOL = 0  # 0 = Shafi'i Asr (shadow length 1x)
 TIMEZONE = "Africa/Johannesburg"
+USE_API = False  # True = fetch from api.aladhan.com, False = calculate locally
+API_URL = os.environ.get("SALAAT_API_URL", "http://api.aladhan.com/v1")
 CACHE_FILE = Path.home() / ".cache" / "prayer_times.json"
+CACHE_VERSION = 2
+CACHE_TTL = 7 * 24 * 3600  # Refetch the month after a week even if today is cached
+REFERENCE_FILE = Path(__file__).with_name("salaat_reference.json")
+DAEMON_MAX_SLEEP = 600  # Upper bound so suspend/clock changes are noticed
+PRAYERS_ORDER = ['Fajr', 'Sunrise', 'Dhuhr', 'Asr', 'Maghrib', 'Isha']
+TIME_RE = re.compile(r'\d\d:\d\d$')  # The calculator gives '-----' when the sun never gets there
 
-def fetch_prayer_times():
-    """Fetch prayer times from API with error handling"""
-    try:
-        url = f"http://api.aladhan.com/v1/timingsByCity?city={CITY}&country={COUNTRY}&method={METHOD}&school=0"
-        response = requests.get(url, timeout=5)
-        data = response.json()
-        
-        if data.get('code') == 200:
-            # Cache the successful response
-            with open(CACHE_FILE, 'w') as f:
-                json.dump(data, f)
-            return data['data']['timings']
-        return None
-    except Exception as e:
-        print(f"API Error: {e}", file=sys.stderr)
-        return None
+ERROR_OUTPUT = {
+    'text': "⛔ Prayer Times Error",
+    'tooltip': "Failed to fetch prayer times. Check internet connection.",
+    'class': 'error'
+}
+
+def calculate_prayer_times(day=None):
+    """Calculate prayer times locally, no network needed"""
+    calc = PrayTimes(LATITUDE, LONGITUDE, TIMEZONE, method=METHOD, school=SCHOOL)
+    return calc.timings(day)
+
+def fetch_month(year, month):
+    """Fetch a whole month of timings from the API, keyed by ISO date"""
+    import http_client  # Only needed for the network path (pulls in requests)
+
+    url = f"{API_URL}/calendarByCity/{year}/{month}"
+    params = {'city': CITY, 'country': COUNTRY, 'method': METHOD, 'school': SCHOOL}
+    data = http_client.get_json(url, params=params)
+    if data.get('code') != 200:
+        raise ValueError(f"API returned {data.get('code')}: {data.get('status')}")
+
+    days = {}
+    for day in data['data']:
+        key = datetime.strptime(day['date']['gregorian']['date'], '%d-%m-%Y').date().isoformat()
+        # The calendar endpoint appends the timezone, e.g. "04:12 (SAST)"
+        days[key] = {name: t.split()[0] for name, t in day['timings'].items()}
+    return days
 
-def get_cached_times():
-    """Get cached prayer times if available"""
+def cache_key():
+    """Settings the cached timings depend on; a change invalidates the cache"""
+    return {'city': CITY, 'country': COUNTRY, 'method': METHOD, 'school': SCHOOL}
+
+def load_cache():
+    """Load the month cache, or None if it is missing or for other settings"""
     try:
-        if CACHE_FILE.exists():
-            with open(CACHE_FILE) as f:
-                data = json.load(f)
-                return data['data']['timings']
+        with open(CACHE_FILE) as f:
+            cache = json.load(f)
+        if cache.get('version') == CACHE_VERSION and cache.get('key') == cache_key():
+            return cache
+    except FileNotFoundError:
+        pass
     except Exception as e:
         print(f"Cache Error: {e}", file=sys.stderr)
     return None
 
+def fetch_prayer_times(day=None):
+    """Fetch the month containing day from the API and cache it"""
+    day = day or date.today()
+    try:
+        days = fetch_month(day.year, day.month)
+    except Exception as e:
+        print(f"API Error: {e}", file=sys.stderr)
+        return None
+
+    cache = {
+        'version': CACHE_VERSION,
+        'key': cache_key(),
+        'fetched': time.time(),
+        'days': days,
+    }
+    CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = CACHE_FILE.with_suffix('.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(cache, f)
+    tmp.replace(CACHE_FILE)
+    return days.get(day.isoformat())
+
+def get_cached_times(day=None, max_age=None):
+    """Get the cached timings for day, ignoring entries older than max_age seconds"""
+    day = day or date.today()
+    cache = load_cache()
+    if not cache:
+        return None
+    if max_age is not None and time.time() - cache.get('fetched', 0) > max_age:
+        return None
+    return cache['days'].get(day.isoformat())
+
 def format_output(prayer_times):
     """Format the output for Waybar"""
     now = datetime.now().strftime('%H:%M')
-    prayers_order = ['Fajr', 'Sunrise', 'Dhuhr', 'Asr', 'Maghrib', 'Isha']
-    prayers = [(name, prayer_times[name]) for name in prayers_order if name in prayer_times]
+    prayers = [(name, prayer_times[name]) for name in PRAYERS_ORDER
+               if TIME_RE.match(prayer_times.get(name, ''))]
     
     current = next_prayer = None
     for i in range(len(prayers)):
@@ -60,23 +124,105 @@ def format_output(prayer_times):
     
     return {
         'text': f" {current[0]}: {current[1]} | Next: {next_prayer[0]}: {next_prayer[1]}",
-        'tooltip': "\n".join([f"{p}: {t}" for p, t in prayer_times.items() if p in prayers_order]),
+        'tooltip': "\n".join([f"{p}: {t}" for p, t in prayer_times.items() if p in PRAYERS_ORDER]),
         'class': 'prayer-times'
     }
 
-def main():
-    # Try to fetch fresh times, fall back to cache if needed
-    prayer_times = fetch_prayer_times() or get_cached_times()
-    
+def save_reference():
+    """Save this month's API timings as reference data for --check"""
+    today = date.today()
+    reference = fetch_month(today.year, today.month)
+    with open(REFERENCE_FILE, 'w') as f:
+        json.dump(reference, f, indent=1, sort_keys=True)
+    print(f"Saved {len(reference)} days to {REFERENCE_FILE}")
+
+def check_reference():
+    """Compare the local calculator against the saved reference timings"""
+    with open(REFERENCE_FILE) as f:
+        reference = json.load(f)
+
+    def minutes(t):
+        h, m = t.split(':')
+        return int(h) * 60 + int(m)
+
+    failures = 0
+    for key, expected in sorted(reference.items()):
+        actual = calculate_prayer_times(date.fromisoformat(key))
+        for name in PRAYERS_ORDER:
+            diff = abs(minutes(actual[name]) - minutes(expected[name]))
+            if diff > 1:
+                failures += 1
+                print(f"{key} {name}: expected {expected[name]}, got {actual[name]}")
+
+    print(f"Checked {len(reference)} days, {failures} mismatches")
+    return 1 if failures else 0
+
+def get_prayer_times():
+    """Get today's prayer times from the configured source"""
+    if USE_API:
+        # A fresh cache hit never touches the network (or imports requests).
+        # Otherwise refetch the month, then fall back to an expired entry for
+        # today, and finally to local maths.
+        return (get_cached_times(max_age=CACHE_TTL)
+                or fetch_prayer_times()
+                or get_cached_times()
+                or calculate_prayer_times())
+    return calculate_prayer_times()
+
+def build_output():
+    """Return the Waybar payload and the times it was built from"""
+    prayer_times = get_prayer_times()
     if not prayer_times:
-        print(json.dumps({
-            'text': "⛔ Prayer Times Error",
-            'tooltip': "Failed to fetch prayer times. Check internet connection.",
-            'class': 'error'
-        }))
+        return None, None
+    return format_output(prayer_times), prayer_times
+
+def seconds_until_next_boundary(prayer_times, now=None):
+    """Seconds until the next prayer time or midnight, whichever is first"""
+    now = now or datetime.now()
+    midnight = datetime.combine(now.date(), datetime.min.time())
+    boundaries = [midnight + timedelta(days=1)]
+    for name in PRAYERS_ORDER:
+        if not TIME_RE.match(prayer_times.get(name, '')):
+            continue
+        h, m = map(int, prayer_times[name].split(':'))
+        boundary = midnight.replace(hour=h, minute=m)
+        if boundary > now:
+            boundaries.append(boundary)
+    return (min(boundaries) - now).total_seconds()
+
+def refresh_delay(prayer_times):
+    """Seconds to wait before rebuilding the output"""
+    if not prayer_times:
+        return 60  # Retry soon after an error
+    # Small margin so the HH:MM comparison in format_output has ticked over
+    return min(seconds_until_next_boundary(prayer_times), DAEMON_MAX_SLEEP) + 0.5
+
+def run_daemon():
+    """Stream Waybar JSON lines, only writing when the output changes"""
+    last = None
+    while True:
+        output, prayer_times = build_output()
+        line = json.dumps(output or ERROR_OUTPUT)
+        if line != last:
+            print(line, flush=True)
+            last = line
+        time.sleep(refresh_delay(prayer_times))
+
+def main():
+    if '--save-reference' in sys.argv:
+        save_reference()
         return
-    
-    print(json.dumps(format_output(prayer_times)))
+    if '--check' in sys.argv:
+        sys.exit(check_reference())
+    if '--daemon' in sys.argv:
+        try:
+            run_daemon()
+        except (KeyboardInterrupt, BrokenPipeError):
+            pass
+        return
+
+    output, _ = build_output()
+    print(json.dumps(output or ERROR_OUTPUT))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+
+# Session actions over D-Bus, with pre-action hooks
+# lock, logout, poweroff and reboot for the power menu, without spawning
+# systemctl or hyprctl. Before acting, the matching hooks run
+# concurrently, each with its own timeout, and how long each took goes to
+# ~/.cache/session-actions.log, so the delay between the click and the action
+# is visible and bounded by the largest hook timeout.
+#
+#   lock      pre-lock hooks, then hyprlock through Hyprland's exec dispatcher
+#             (started directly if Hyprland can't be reached)
+#   logout    pre-logout hooks, then Hyprland's exit dispatcher
+#             (login1 TerminateSession if Hyprland can't be reached)
+#   poweroff  pre-logout and pre-shutdown hooks, then login1 PowerOff
+#   reboot    pre-logout and pre-shutdown hooks, then login1 Reboot
+#
+# Hooks are executables in ~/.config/hypr/session-hooks/<event>.d/, run with
+# the action as $1. A "# timeout: SECONDS" line near the top overrides
+# HOOK_TIMEOUT; a hook that overruns is killed along with anything it
+# started. Python code can add hooks with SessionActions.register().
+#
+#   sessionctl.py lock|logout|poweroff|reboot [--dry-run]
+#                                   --dry-run runs and logs the hooks only
+#   sessionctl.py --hooks           List hooks and their timeouts
+#
+# The system bus address comes from DBUS_SYSTEM_BUS_ADDRESS when set, so a
+# python-dbusmock logind template on a private bus can stand in for logind
+# (bench/session_bench.py does exactly that).
+
+import os
+import re
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections import namedtuple
+
+import hypripc
+
+HOOK_DIR = os.path.expanduser("~/.config/hypr/session-hooks")
+LOG_FILE = os.path.expanduser("~/.cache/session-actions.log")
+HOOK_TIMEOUT = 5.0
+LOCK_COMMAND = "pidof hyprlock || hyprlock"  # Never start a second instance
+DBUS_TIMEOUT_MS = 30000  # PowerOff/Reboot may wait on a polkit prompt
+
+LOGIN1 = "org.freedesktop.login1"
+LOGIN1_PATH = "/org/freedesktop/login1"
+LOGIN1_MANAGER = "org.freedesktop.login1.Manager"
+
+TIMEOUT_RE = re.compile(rb'^#\s*timeout:\s*([\d.]+)', re.M)
+
+# Action -> hook events run before it
+EVENTS = {
+    'lock': ('pre-lock',),
+    'logout': ('pre-logout',),
+    'poweroff': ('pre-logout', 'pre-shutdown'),
+    'reboot': ('pre-logout', 'pre-shutdown'),
+}
+
+Hook = namedtuple('Hook', 'kind name event run timeout')  # kind: "script" or "python"
+HookResult = namedtuple('HookResult', 'kind name status ms')
+
+class SessionError(Exception):
+    """logind is not reachable or refused the action"""
+
+def log(message):
+    print(message, file=sys.stderr)
+    try:
+        with open(LOG_FILE, 'a') as f:
+            f.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} {message}\n")
+    except OSError:
+        pass
+
+def hook_timeout(path):
+    """The "# timeout: N" header of a hook script, or HOOK_TIMEOUT"""
+    try:
+        with open(path, 'rb') as f:
+            match = TIMEOUT_RE.search(f.read(1024))
+        if match:
+            return float(match.group(1))
+    except (OSError, ValueError):
+        pass
+    return HOOK_TIMEOUT
+
+def script_hooks(event):
+    """Executable hooks in HOOK_DIR/<event>.d, in name order"""
+    directory = os.path.join(HOOK_DIR, f"{event}.d")
+    try:
+        names = sorted(os.listdir(directory))
+    except OSError:
+        return []
+    hooks = []
+    for name in names:
+        path = os.path.join(directory, name)
+        if name.startswith('.') or not os.path.isfile(path) or not os.access(path, os.X_OK):
+            continue
+
+        def run(action, path=path, timeout=hook_timeout(path)):
+            # In its own process group, so an overrun kills whatever it spawned too
+            proc = subprocess.Popen([path, action], stdin=subprocess.DEVNULL,
+                                    stdout=subprocess.DEVNULL, start_new_session=True)
+            try:
+                returncode = proc.wait(timeout)
+            except subprocess.TimeoutExpired:
+                try:
+                    os.killpg(proc.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                proc.wait()
+                raise
+            if returncode:
+                raise RuntimeError(f"exit status {returncode}")
+        hooks.append(Hook("script", f"{event}/{name}", event, run, hook_timeout(path)))
+    return hooks
+
+class SessionActions:
+    """Runs the pre-action hooks, then asks logind (or Hyprland) to act"""
+
+    def __init__(self):
+        self.registered = {}
+        self._bus = None
+
+    def register(self, event, name, func, timeout=HOOK_TIMEOUT):
+        """Add a Python hook; FUNC(action) runs on its own thread"""
+        if event not in {e for events in EVENTS.values() for e in events}:
+            raise ValueError(f"unknown hook event {event!r}")
+        hooks = self.registered.setdefault(event, [])
+        if any(hook.name == f"{event}/{name}" for hook in hooks):
+            raise ValueError(f"hook {event}/{name} is already registered")
+        hooks.append(Hook("python", f"{event}/{name}", event, func, timeout))
+
+    def hooks(self, action):
+        return [hook for event in EVENTS[action]
+                for hook in script_hooks(event) + self.registered.get(event, [])]
+
+    def run_hooks(self, action):
+        """
+        Start every hook for ACTION at once and wait for each up to its own
+        timeout. A Python hook that overruns is abandoned (its thread is a
+        daemon); a script is killed with its process group. Returns [HookResult].
+        """
+        hooks = self.hooks(action)
+        outcomes = {}
+        started = time.monotonic()
+
+        def call(hook):
+            start = time.monotonic()
+            try:
+                hook.run(action)
+                status = "ok"
+            except subprocess.TimeoutExpired:
+                status = "timed out"
+            except Exception as e:
+                status = f"failed: {e}"
+            # A script and a Python hook may share a name
+            outcomes[hook.kind, hook.name] = (status, (time.monotonic() - start) * 1000)
+
+        threads = [threading.Thread(target=call, args=(hook,), daemon=True, name=hook.name) for hook in hooks]
+        for thread in threads:
+            thread.start()
+        results = []
+        for hook, thread in zip(hooks, threads):
+            thread.join(max(0.0, started + hook.timeout - time.monotonic()))
+            status, ms = outcomes.get((hook.kind, hook.name), ("timed out", hook.timeout * 1000))
+            results.append(HookResult(hook.kind, hook.name, status, ms))
+        return results
+
+    def bus(self):
+        # Only the logind calls need GObject; hooks and --dry-run work without it
+        from gi.repository import Gio, GLib
+        if self._bus is None:
+            try:
+                self._bus = Gio.bus_get_sync(Gio.BusType.SYSTEM, None)
+            except GLib.Error as e:
+                raise SessionError(f"system bus: {e.message}") from e
+        return self._bus
+
+    def call_login1(self, method, signature=None, *args):
+        """Call a login1 Manager method and return its unpacked reply"""
+        from gi.repository import Gio, GLib
+        parameters = GLib.Variant(signature, args) if signature else None
+        try:
+            reply = self.bus().call_sync(LOGIN1, LOGIN1_PATH, LOGIN1_MANAGER, method, parameters,
+                                         None, Gio.DBusCallFlags.NONE, DBUS_TIMEOUT_MS, None)
+        except GLib.Error as e:
+            raise SessionError(f"{method}: {e.message}") from e
+        return reply.unpack() if reply else ()
+
+    def act(self, action):
+        # An empty session id means "the caller's session" to logind
+        session = os.environ.get("XDG_SESSION_ID", "")
+        if action == 'lock':
+            try:
+                hypripc.dispatch("exec", LOCK_COMMAND)
+            except hypripc.HyprlandError:
+                subprocess.Popen(["sh", "-c", LOCK_COMMAND], start_new_session=True,
+                                 stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        elif action == 'logout':
+            try:
+                hypripc.dispatch("exit")
+            except hypripc.HyprlandError:
+                self.call_login1("TerminateSession", "(s)", session)
+        elif action == 'poweroff':
+            self.call_login1("PowerOff", "(b)", True)
+        elif action == 'reboot':
+            self.call_login1("Reboot", "(b)", True)
+
+    def perform(self, action, dry_run=False):
+        """Run ACTION's hooks, log their timings, then carry the action out"""
+        if action not in EVENTS:
+            raise ValueError(f"unknown action {action!r}")
+        start = time.monotonic()
+        results = self.run_hooks(action)
+        for result in results:
+            log(f"{action}: {result.kind} hook {result.name} {result.status} in {result.ms:.1f} ms")
+        log(f"{action}: {len(results)} hooks in {(time.monotonic() - start) * 1000:.1f} ms"
+            + (" (dry run)" if dry_run else ""))
+        if not dry_run:
+            self.act(action)
+        return results
+
+def main():
+    args = sys.argv[1:]
+    actions = SessionActions()
+    if '--hooks' in args:
+        for action in EVENTS:
+            for hook in actions.hooks(action):
+                print(f"{action:<9} {hook.kind:<7} {hook.name:<40} {hook.timeout:g} s")
+        return
+    names = [a for a in args if not a.startswith('--')]
+    if len(names) != 1 or names[0] not in EVENTS:
+        print(f"usage: sessionctl.py {'|'.join(EVENTS)} [--dry-run] | --hooks", file=sys.stderr)
+        sys.exit(2)
+    try:
+        actions.perform(names[0], dry_run='--dry-run' in args)
+    except SessionError as e:
+        log(f"{names[0]} failed: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
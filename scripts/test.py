@@ -1,22 +1,87 @@
 #!/usr/bin/env python3
 
 # Sunnah PyGObject App
-# This application fetches a random Hadith from sunnah.com and displays it using PyGObject.
-# It uses the requests and BeautifulSoup libraries for web scraping.
+# This application shows a random Hadith and displays it using PyGObject.
+# Hadiths come from the local store (hadith_store.py) and fall back to
+# scraping sunnah.com on a miss, using the streaming extractor in hadith_parse.py.
+# Network and parsing run on a worker pool so the GTK main loop never blocks.
+# The hadith is shown in a TextView, filled paragraph by paragraph as the
+# extractor produces them; unlike one wrapped Label, it only lays out the lines
+# in view and re-wraps incrementally when the window is resized.
 
-import gi
+import os
 import sys
 import requests
-from bs4 import BeautifulSoup
 import random
-gi.require_version('Gtk', '3.0')
-from gi.repository import Gtk, GLib
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import tracing
+with tracing.span("import gi"):
+    import gi
+    gi.require_version('Gtk', '3.0')
+    from gi.repository import Gtk, GLib, Pango
+
+from hadith_parse import extract_hadith
+from hadith_store import HadithStore
+import http_client
+
+SUNNAH_URL = os.environ.get("SUNNAH_URL", "https://sunnah.com")
+COLLECTION = "bukhari"
+FIRST_HADITH = 1
+LAST_HADITH = 7563   # Last Hadith in Sahih al-Bukhari
+PREFETCH_COUNT = 3   # Random hadiths kept ready for an instant "Fetch New Hadith"
+REQUEST_TIMEOUT = 10
+CHUNK_SIZE = 16384
+
+class FetchCancelled(Exception):
+    """Raised inside a worker when its fetch was cancelled"""
+
+def fetch_hadith(hadith_number, cancelled, store=None, on_paragraph=None):
+    """
+    Look up one hadith as (text, reference), going to sunnah.com only on a
+    store miss. Runs on a worker thread. The download is streamed so a
+    cancelled fetch stops between chunks, and on_paragraph (if given) is
+    called with each paragraph as it is parsed.
+    """
+    if store:
+        with tracing.span("sunnah: store lookup", hadith=hadith_number):
+            entry = store.get(COLLECTION, hadith_number)
+        if entry:
+            return tuple(entry)
+
+    url = f"{SUNNAH_URL}/{COLLECTION}:{hadith_number}"
+
+    def chunks():
+        # Revalidated against the HTTP cache, so a repeat page costs a 304
+        first = True
+        for chunk in http_client.iter_content(url, timeout=REQUEST_TIMEOUT, chunk_size=CHUNK_SIZE):
+            if first:
+                tracing.instant("sunnah: first chunk", hadith=hadith_number)
+                first = False
+            if cancelled.is_set():
+                raise FetchCancelled()
+            yield chunk
+
+    # Parse as the page arrives and stop once the hadith has been seen
+    with tracing.span("sunnah: download + parse", hadith=hadith_number):
+        parsed = extract_hadith(chunks(), on_paragraph)
+
+    if cancelled.is_set():
+        raise FetchCancelled()
+    if parsed is None:
+        return None
+    if store:
+        with tracing.span("sunnah: store put", hadith=hadith_number):
+            store.put(COLLECTION, hadith_number, *parsed)
+    return parsed
 
 class SunnahApp(Gtk.ApplicationWindow):
     """
     Main application window for the Sunnah app.
     Handles UI setup and data fetching/display.
     """
+    @tracing.traced("sunnah: __init__")
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.set_default_size(800, 600)
@@ -36,17 +101,16 @@ class SunnahApp(Gtk.ApplicationWindow):
         scrolled_window.set_hexpand(True)
         vbox.pack_start(scrolled_window, True, True, 0)
 
-        # Labels for the Hadith
-        self.hadith_label = Gtk.Label(label="Fetching Hadith...")
-        self.hadith_label.set_line_wrap(True)
-        self.hadith_label.set_justify(Gtk.Justification.LEFT)
-        self.hadith_label.set_halign(Gtk.Align.START)
-        self.hadith_label.get_style_context().add_class("hadith-text")
-
-        # Add the label to a viewport and then to the scrolled window
-        viewport = Gtk.Viewport()
-        viewport.add(self.hadith_label)
-        scrolled_window.add(viewport)
+        # Read-only text view for the Hadith; it scrolls natively, no Viewport
+        self.hadith_view = Gtk.TextView()
+        self.hadith_view.set_editable(False)
+        self.hadith_view.set_cursor_visible(False)
+        self.hadith_view.set_wrap_mode(Gtk.WrapMode.WORD_CHAR)
+        self.hadith_view.get_style_context().add_class("hadith-view")
+        self.buffer = self.hadith_view.get_buffer()
+        self.create_tags()
+        self.set_message("Fetching Hadith...")
+        scrolled_window.add(self.hadith_view)
 
         # Button to fetch a new Hadith
         self.fetch_button = Gtk.Button(label="Fetch New Hadith")
@@ -59,17 +123,45 @@ class SunnahApp(Gtk.ApplicationWindow):
         vbox.pack_start(self.status_label, False, False, 0)
 
         # Apply custom CSS
+        self.apply_styles()
+
+        # Worker pool: one slot for the visible fetch plus the prefetches
+        self.executor = ThreadPoolExecutor(max_workers=PREFETCH_COUNT + 1)
+        self.prefetched = deque()
+        self.prefetching = 0
+        self.current_cancel = None
+        self.streamed = 0 # Paragraphs of the visible fetch already in the buffer
+        self.shutdown_event = threading.Event()
+        self.store = HadithStore()
+        self.connect("destroy", self.on_destroy)
+
+        # Initial fetch
+        self.fetch_hadith()
+        tracing.first_draw(self, "sunnah")
+
+    @tracing.traced("sunnah: create_tags")
+    def create_tags(self):
+        """
+        Buffer tags for the hadith text and reference. They carry what the
+        .hadith-text and .hadith-info label CSS used to: 16px serif with 1.6
+        line height, and 14px italic grey.
+        """
+        text_font = Pango.FontDescription("serif")
+        text_font.set_absolute_size(16 * Pango.SCALE)
+        self.buffer.create_tag("hadith-text", font_desc=text_font,
+                               pixels_inside_wrap=10, pixels_below_lines=10)
+        info_font = Pango.FontDescription()
+        info_font.set_style(Pango.Style.ITALIC)
+        info_font.set_absolute_size(14 * Pango.SCALE)
+        self.buffer.create_tag("hadith-info", font_desc=info_font, foreground="#555")
+
+    @tracing.traced("sunnah: apply_styles")
+    def apply_styles(self):
+        """Let the window background show through the text view, as it did behind the label"""
         style_provider = Gtk.CssProvider()
         css = b"""
-        .hadith-text {
-            font-size: 16px;
-            font-family: serif;
-            line-height: 1.6;
-        }
-        .hadith-info {
-            font-style: italic;
-            font-size: 14px;
-            color: #555;
+        .hadith-view, .hadith-view text {
+            background-color: transparent;
         }
         """
         style_provider.load_from_data(css)
@@ -79,78 +171,127 @@ class SunnahApp(Gtk.ApplicationWindow):
             Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
         )
 
-        # Initial fetch
-        self.fetch_hadith()
+    def set_message(self, message):
+        """Replace the buffer contents with a status or error message"""
+        self.buffer.set_text("")
+        self.append(message, "hadith-text")
+
+    def append(self, text, tag):
+        """Insert TEXT at the end of the buffer; only the new lines get laid out"""
+        self.buffer.insert_with_tags_by_name(self.buffer.get_end_iter(), text, tag)
 
     def on_fetch_clicked(self, widget):
         """Callback for the 'Fetch New Hadith' button."""
         self.fetch_hadith()
 
+    def on_destroy(self, widget):
+        """Cancel all outstanding work when the window closes."""
+        self.shutdown_event.set()
+        if self.current_cancel:
+            self.current_cancel.set()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+        # A running worker may still be in store.get/put; close once they have all returned
+        def close_store():
+            self.executor.shutdown(wait=True)
+            self.store.close()
+        threading.Thread(target=close_store, daemon=True, name="sunnah: close store").start()
+
     def fetch_hadith(self):
         """
-        Fetches and displays a random Hadith from sunnah.com.
-        This is an I/O operation and should ideally be done in a separate thread.
-        For this example, we'll keep it simple and assume the app won't freeze for long.
+        Shows a random Hadith from sunnah.com.
+        A prefetched hadith is shown instantly, otherwise a fetch is started on
+        the worker pool. Any fetch still in flight from an earlier click is cancelled.
         """
-        self.hadith_label.set_text("Fetching Hadith...")
-        self.status_label.set_text("Connecting to sunnah.com...")
-        GLib.idle_add(self.do_fetch_hadith_async)
+        if self.current_cancel:
+            self.current_cancel.set()
+            self.current_cancel = None
 
-    def do_fetch_hadith_async(self):
-        """
-        Worker function to perform the web scraping.
-        """
-        try:
-            # We will fetch a random Hadith from the Sahih al-Bukhari collection.
-            # We choose a random chapter to get a random Hadith.
-            book_number = 1
-            start_hadith = 1
-            end_hadith = 7563 # Last Hadith in Sahih al-Bukhari
-            hadith_number = random.randint(start_hadith, end_hadith)
-            url = f"https://sunnah.com/bukhari:{hadith_number}"
-
-            self.status_label.set_text(f"Fetching from {url}...")
-            response = requests.get(url)
-            response.raise_for_status() # Raise an exception for bad status codes
-
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            # Find the Hadith text and its source information
-            english_text = soup.find('div', class_='hadith_text')
-            
-            # Find all relevant elements and combine them
-            content_parts = []
-            
-            # Find the main English Hadith text
-            hadith_english = soup.find('div', class_='english_hadith_full')
-            if hadith_english:
-                # Append the English text content, stripping the 'hadith_text' class
-                text_to_append = ""
-                for p in hadith_english.find_all('p'):
-                    if p.parent and 'hadith_text' in p.parent.get('class', []):
-                         text_to_append += p.get_text() + "\n"
-                    
-                # Find the reference information (e.g., Book of Revelation, Hadith 1)
-                reference_info = soup.find('div', class_='hadith_reference')
-                if reference_info:
-                    info_text = reference_info.get_text(separator=' ', strip=True)
-                    text_to_append += "\n\n" + info_text
-
-                self.hadith_label.set_label(text_to_append)
-                self.status_label.set_text(f"Fetched Hadith {hadith_number}")
-
-            else:
-                self.hadith_label.set_label("Could not find Hadith content.")
-                self.status_label.set_text("Failed to parse page.")
+        if self.prefetched:
+            hadith_number, hadith = self.prefetched.popleft()
+            self.show_hadith(hadith_number, hadith)
+            self.fill_prefetch()
+            return
+
+        hadith_number = random.randint(FIRST_HADITH, LAST_HADITH)
+        cancel = threading.Event()
+        self.current_cancel = cancel
+        self.streamed = 0
+        self.set_message("Fetching Hadith...")
+        self.status_label.set_text(f"Fetching from {SUNNAH_URL}/{COLLECTION}:{hadith_number}...")
 
+        # Paragraphs are queued to the main loop ahead of the done callback,
+        # so they are all shown by the time on_hadith_fetched runs
+        on_paragraph = lambda paragraph: GLib.idle_add(self.on_paragraph, paragraph, cancel)
+        future = self.executor.submit(fetch_hadith, hadith_number, cancel, self.store, on_paragraph)
+        future.add_done_callback(
+            lambda f: GLib.idle_add(self.on_hadith_fetched, f, hadith_number, cancel))
+
+    def on_paragraph(self, paragraph, cancel):
+        """Main-loop callback: show one more paragraph of the hadith being downloaded."""
+        if cancel.is_set():
+            return False
+        if not self.streamed:
+            self.buffer.set_text("")
+        self.append(paragraph, "hadith-text")
+        self.streamed += 1
+        return False
+
+    def on_hadith_fetched(self, future, hadith_number, cancel):
+        """Main-loop callback for the visible fetch."""
+        if cancel.is_set():
+            return False # Superseded by a newer click
+        self.current_cancel = None
+
+        try:
+            self.show_hadith(hadith_number, future.result(), streamed=self.streamed > 0)
         except requests.exceptions.RequestException as e:
-            self.hadith_label.set_label("Error: Could not connect to sunnah.com. Please check your internet connection.")
+            self.set_message("Error: Could not connect to sunnah.com. Please check your internet connection.")
             self.status_label.set_text(f"Connection error: {e}")
         except Exception as e:
-            self.hadith_label.set_label("An unexpected error occurred while fetching the Hadith.")
+            self.set_message("An unexpected error occurred while fetching the Hadith.")
             self.status_label.set_text(f"Error: {e}")
 
-        return False # Return False to stop the GLib.idle_add loop
+        self.fill_prefetch()
+        return False # Return False so GLib.idle_add runs this once
+
+    @tracing.traced("sunnah: show_hadith")
+    def show_hadith(self, hadith_number, hadith, streamed=False):
+        """
+        Display a parsed (text, reference) hadith, or a parse error if it is
+        None. With streamed=True the text is already in the buffer and only
+        the reference is added.
+        """
+        if hadith is None:
+            self.set_message("Could not find Hadith content.")
+            self.status_label.set_text("Failed to parse page.")
+            return
+        text, reference = hadith
+        if not streamed:
+            self.buffer.set_text("")
+            self.append(text, "hadith-text")
+        if reference:
+            self.append("\n" + reference, "hadith-info")
+        self.status_label.set_text(f"Fetched Hadith {hadith_number}")
+
+    def fill_prefetch(self):
+        """Top the prefetch queue back up to PREFETCH_COUNT hadiths."""
+        while len(self.prefetched) + self.prefetching < PREFETCH_COUNT:
+            hadith_number = random.randint(FIRST_HADITH, LAST_HADITH)
+            self.prefetching += 1
+            future = self.executor.submit(fetch_hadith, hadith_number, self.shutdown_event, self.store)
+            future.add_done_callback(
+                lambda f, n=hadith_number: GLib.idle_add(self.on_prefetched, f, n))
+
+    def on_prefetched(self, future, hadith_number):
+        """Main-loop callback for a background prefetch."""
+        self.prefetching -= 1
+        if self.shutdown_event.is_set() or future.cancelled() or future.exception():
+            return False
+        hadith = future.result()
+        if hadith is not None:
+            self.prefetched.append((hadith_number, hadith))
+        return False
 
 def main():
     """Entry point of the application."""
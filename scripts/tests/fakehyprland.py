@@ -0,0 +1,72 @@
+# Fake Hyprland IPC sockets for the tests
+# Listens on DIR/.socket.sock (one request per connection, reply then close,
+# like Hyprland) and DIR/.socket2.sock (event lines pushed with emit()).
+# Point hypripc at it with HYPRLAND_SOCKET_DIR=DIR. Replies come from
+# reply(command), which tests can override; every request is recorded.
+
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+
+class FakeHyprland:
+    def __init__(self):
+        self.dir = tempfile.mkdtemp(prefix="fake-hyprland-")
+        self.requests = []
+        self.clients = [{'address': "0x1", 'class': "kitty", 'workspace': {'id': 1, 'name': "1"}}]
+        self.event_conns = []
+        self.listeners = []
+        self.connected = threading.Event()
+        for name, handler in ((".socket.sock", self.serve_request), (".socket2.sock", self.serve_events)):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.bind(os.path.join(self.dir, name))
+            sock.listen(8)
+            self.listeners.append(sock)
+            threading.Thread(target=self.accept, args=(sock, handler), daemon=True).start()
+
+    def reply(self, command):
+        if command.startswith("[[BATCH]]"):
+            return "\n\n".join(self.reply(c.strip()) for c in command[len("[[BATCH]]"):].split(";"))
+        if command.startswith("dispatch "):
+            args = command.split()[1:]
+            return "ok" if args and args[0] in ("exec", "exit", "workspace", "togglespecialworkspace") \
+                else f"Invalid dispatcher {args[0] if args else ''}"
+        if command == "j/clients":
+            return json.dumps(self.clients)
+        if command == "reload":
+            return "ok"
+        return "unknown request"
+
+    def accept(self, sock, handler):
+        while True:
+            try:
+                conn, _ = sock.accept()
+            except OSError:
+                return
+            handler(conn)
+
+    def serve_request(self, conn):
+        with conn:
+            command = conn.recv(65536).decode()
+            self.requests.append(command)
+            conn.sendall(self.reply(command).encode())
+
+    def serve_events(self, conn):
+        self.event_conns.append(conn)
+        self.connected.set()
+
+    def emit(self, event, data):
+        for conn in self.event_conns:
+            conn.sendall(f"{event}>>{data}\n".encode())
+
+    def close(self):
+        for sock in self.listeners + self.event_conns:  # Safe to call twice
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+        self.event_conns = []
+        shutil.rmtree(self.dir, ignore_errors=True)
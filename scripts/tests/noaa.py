@@ -0,0 +1,89 @@
+# Independent prayer times from the NOAA solar calculator equations
+# Used to build salaat_reference.json when api.aladhan.com can't be reached:
+# the sun's declination and equation of time come from NOAA's spreadsheet
+# formulas (not the PrayTimes.org series praytimes.py uses), evaluated at
+# each event's own time, with the same MWL angles and Shafi'i Asr.
+#
+#   python3 tests/noaa.py YEAR MONTH > salaat_reference.json
+
+import calendar
+import json
+import math
+import sys
+from datetime import date, datetime, time, timedelta, timezone
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import salaat
+
+FAJR_ANGLE = 18
+ISHA_ANGLE = 17
+RISE_SET_ANGLE = 0.833
+
+def sun(moment):
+    """(declination in degrees, equation of time in minutes) at a UTC datetime"""
+    jd = moment.timestamp() / 86400 + 2440587.5
+    jc = (jd - 2451545) / 36525
+    l0 = (280.46646 + jc * (36000.76983 + jc * 0.0003032)) % 360
+    m = 357.52911 + jc * (35999.05029 - 0.0001537 * jc)
+    e = 0.016708634 - jc * (0.000042037 + 0.0000001267 * jc)
+    rad = math.radians
+    center = (math.sin(rad(m)) * (1.914602 - jc * (0.004817 + 0.000014 * jc))
+              + math.sin(rad(2 * m)) * (0.019993 - 0.000101 * jc)
+              + math.sin(rad(3 * m)) * 0.000289)
+    omega = 125.04 - 1934.136 * jc
+    apparent = l0 + center - 0.00569 - 0.00478 * math.sin(rad(omega))
+    mean_obliquity = 23 + (26 + (21.448 - jc * (46.815 + jc * (0.00059 - jc * 0.001813))) / 60) / 60
+    obliquity = mean_obliquity + 0.00256 * math.cos(rad(omega))
+    declination = math.degrees(math.asin(math.sin(rad(obliquity)) * math.sin(rad(apparent))))
+    y = math.tan(rad(obliquity / 2)) ** 2
+    eot = 4 * math.degrees(
+        y * math.sin(2 * rad(l0)) - 2 * e * math.sin(rad(m))
+        + 4 * e * y * math.sin(rad(m)) * math.cos(2 * rad(l0))
+        - 0.5 * y * y * math.sin(4 * rad(l0)) - 1.25 * e * e * math.sin(2 * rad(m)))
+    return declination, eot
+
+def event(day, altitude, side, lat, lng):
+    """UTC datetime the sun is at ALTITUDE (side -1 morning, +1 afternoon, 0 noon)"""
+    guess = datetime.combine(day, time(12), tzinfo=timezone.utc) - timedelta(hours=lng / 15)
+    for _ in range(4):
+        declination, eot = sun(guess)
+        noon = 720 - 4 * lng - eot
+        minutes = noon
+        if side:
+            target = altitude(declination) if callable(altitude) else altitude
+            cos_h = ((math.sin(math.radians(target)) - math.sin(math.radians(lat)) * math.sin(math.radians(declination)))
+                     / (math.cos(math.radians(lat)) * math.cos(math.radians(declination))))
+            minutes += side * 4 * math.degrees(math.acos(cos_h))
+        guess = datetime.combine(day, time(), tzinfo=timezone.utc) + timedelta(minutes=minutes)
+    return guess
+
+def timings(day, lat=salaat.LATITUDE, lng=salaat.LONGITUDE, tz=salaat.TIMEZONE):
+    """A day's timings as 'HH:MM' local time, rounded to the nearest minute"""
+    def asr(declination):
+        return math.degrees(math.atan(1 / (1 + math.tan(math.radians(abs(lat - declination))))))
+
+    events = {
+        'Fajr': (-FAJR_ANGLE, -1),
+        'Sunrise': (-RISE_SET_ANGLE, -1),
+        'Dhuhr': (0, 0),
+        'Asr': (asr, 1),
+        'Sunset': (-RISE_SET_ANGLE, 1),
+        'Maghrib': (-RISE_SET_ANGLE, 1),
+        'Isha': (-ISHA_ANGLE, 1),
+    }
+    zone = ZoneInfo(tz)
+    out = {}
+    for name, (altitude, side) in events.items():
+        local = event(day, altitude, side, lat, lng).astimezone(zone) + timedelta(seconds=30)
+        out[name] = local.strftime('%H:%M')
+    return out
+
+def month(year, month):
+    days = calendar.monthrange(year, month)[1]
+    return {date(year, month, d).isoformat(): timings(date(year, month, d)) for d in range(1, days + 1)}
+
+if __name__ == "__main__":
+    print(json.dumps(month(int(sys.argv[1]), int(sys.argv[2])), indent=1, sort_keys=True))
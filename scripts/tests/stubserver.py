@@ -0,0 +1,58 @@
+# Local HTTP server for the tests that talk to sunnah.com/aladhan
+# Routes map a path to (status, headers, body); a body may be a list of
+# chunks, sent DELAY seconds apart so a test can tell a streamed read from
+# one that waited for the whole response. Every request is recorded.
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+class StubServer:
+    def __init__(self, routes=None, delay=0.0):
+        self.routes = routes or {}
+        self.delay = delay
+        self.requests = []
+        self.sent_chunks = 0
+        self.finished = threading.Event()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                path = urlsplit(self.path).path
+                stub.requests.append((self.path, dict(self.headers)))
+                status, headers, body = stub.routes.get(path, (404, {}, b"not found"))
+                if callable(body):
+                    status, headers, body = body(self.headers)
+                chunks = body if isinstance(body, list) else [body]
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(sum(map(len, chunks))))
+                self.end_headers()
+                try:
+                    for i, chunk in enumerate(chunks):
+                        if i and stub.delay:
+                            stub.finished.wait(stub.delay)
+                        self.wfile.write(chunk)
+                        self.wfile.flush()
+                        stub.sent_chunks += 1
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.finished.set()
+        self.server.shutdown()
+        self.server.server_close()
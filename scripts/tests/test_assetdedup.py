@@ -0,0 +1,72 @@
+# assetdedup.py on a scratch theme: the minified SVG must keep every number's
+# value, a broken trim must be refused, and the dry-run projection must match
+# what --apply actually does.
+#
+#   python3 -m pytest scripts/tests
+
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import assetdedup
+
+SVG = """<?xml version="1.0"?>
+<!-- exported by hand -->
+<svg xmlns="http://www.w3.org/2000/svg" width="16.000" height="16.0" viewBox="0 0 16 16">
+  <metadata><rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"/></metadata>
+  <path id="a1.50" d="M1.500,2.0 L-0.0,.250 l1.05.5" opacity="0.50" stroke-width="1.050"/>
+</svg>
+"""
+
+class EquivalentTest(unittest.TestCase):
+    def test_minified_numbers_keep_their_values(self):
+        small = assetdedup.minify_svg(SVG)
+        self.assertIn('d="M1.500,2 L-0,.25 l1.05.5"', small)
+        self.assertIn('stroke-width="1.05"', small)
+        self.assertIn('id="a1.50"', small)  # Names are left alone
+        self.assertTrue(assetdedup.equivalent(SVG.encode(), small.encode()))
+
+    def test_changed_number_is_caught(self):
+        small = assetdedup.minify_svg(SVG).replace('"1.05"', '"1.5"')
+        self.assertFalse(assetdedup.equivalent(SVG.encode(), small.encode()))
+
+    def test_broken_trim_is_refused(self):
+        def broken(match):
+            return match.group(0).replace('0', '')  # '1.05' -> '1.5'
+
+        # The check has to hold up while the same broken trim is in place
+        with mock.patch.object(assetdedup, 'trim_number', broken):
+            small = assetdedup.minify_svg(SVG)
+            self.assertIn('stroke-width="1.5"', small)
+            self.assertFalse(assetdedup.equivalent(SVG.encode(), small.encode()))
+
+class ProcessThemeTest(unittest.TestCase):
+    def setUp(self):
+        self.theme = Path(tempfile.mkdtemp(prefix="assetdedup-test-"))
+        self.addCleanup(shutil.rmtree, self.theme)
+        (self.theme / "index.theme").write_text("[Icon Theme]\nName=Test\n")
+        for size in ("16x16", "32x32"):
+            directory = self.theme / size / "apps"
+            directory.mkdir(parents=True)
+            (directory / "app.svg").write_text(SVG)
+            (directory / "big.svg").write_text(SVG + "<!--" + "x" * 5000 + "-->\n")
+
+    def test_dry_run_matches_apply(self):
+        before, projected, actions = assetdedup.process_theme(self.theme, True, True, apply=False)
+        self.assertEqual(sorted(a[0] for a in actions), ['link'] * 3 + ['minify'] * 4)
+        # Dry run and a real run estimate disk usage the same way
+        self.assertEqual(before.blocks, 3 * 4096 + 2 * 8192)
+
+        again, applied, _ = assetdedup.process_theme(self.theme, True, True, apply=True)
+        self.assertEqual(vars(again), vars(before))
+        self.assertEqual(vars(applied), vars(projected))
+        self.assertEqual(applied.symlinks, 3)
+        self.assertTrue((self.theme / "32x32" / "apps" / "app.svg").is_symlink())
+
+if __name__ == "__main__":
+    unittest.main()
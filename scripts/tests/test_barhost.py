@@ -0,0 +1,82 @@
+# barhost.py scheduling: modules due together share a wakeup, a module
+# stuck in update() does not hold up the others, and one whose delay()
+# fails keeps running at its fallback interval.
+#
+#   python3 -m pytest scripts/tests
+
+import asyncio
+import contextlib
+import io
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import barhost
+
+class FakeModule(barhost.Module):
+    def __init__(self, name, interval, slack=0.01, block=None):
+        self.name = name
+        self.interval = interval
+        self.slack = slack
+        self.block = block  # Event update() waits on, like a hung network request
+        self.updates = 0
+
+    def update(self):
+        if self.block:
+            self.block.wait(5)
+        self.updates += 1
+        return {'text': str(self.updates)}
+
+    def delay(self):
+        return self.interval
+
+def run_for(host, seconds, then=None):
+    """Run the host's tick loop for SECONDS, then call THEN (still inside the loop)"""
+    async def main():
+        loop = asyncio.create_task(host.tick_loop())
+        await asyncio.sleep(seconds)
+        loop.cancel()
+        return then() if then else None
+    return asyncio.run(main())
+
+class BarHostTest(unittest.TestCase):
+    def test_blocked_module_does_not_stall_the_rest(self):
+        block = threading.Event()
+        slow = FakeModule('salaat', 60, block=block)
+        fast = FakeModule('cpu', 0.05)
+        host = barhost.BarHost([slow, fast])
+
+        def snapshot():
+            counts = slow.updates, fast.updates, host.lines.get('cpu')
+            block.set()  # Let the stuck worker finish so asyncio.run can exit
+            return counts
+        slow_updates, fast_updates, line = run_for(host, 0.5, snapshot)
+        self.assertEqual(slow_updates, 0)
+        self.assertGreaterEqual(fast_updates, 5)
+        self.assertIsNotNone(line)
+
+    def test_slack_shares_wakeups(self):
+        a = FakeModule('cpu', 0.1, slack=0.05)
+        b = FakeModule('gpu', 0.12, slack=0.05)
+        host = barhost.BarHost([a, b])
+        run_for(host, 0.55)
+        self.assertGreaterEqual(a.updates, 4)
+        self.assertLess(host.wakeups, a.updates + b.updates)
+
+    def test_failing_delay_falls_back_to_interval(self):
+        class BrokenDelay(FakeModule):
+            def delay(self):
+                raise ValueError("no schedule")
+
+        broken = BrokenDelay('salaat', 0.05)
+        host = barhost.BarHost([broken])
+        with contextlib.redirect_stderr(io.StringIO()) as err:
+            run_for(host, 0.5)
+        self.assertGreaterEqual(broken.updates, 5)
+        self.assertIn("no schedule", err.getvalue())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+# hadith_store.py: lookups, upserts keeping the FTS index in step, and
+# full-text search on user input that looks like FTS5 query syntax.
+#
+#   python3 -m pytest scripts/tests
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from hadith_store import HadithStore, fts_query
+
+class HadithStoreTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.store = HadithStore(Path(tmp.name, "hadith.db"))
+        self.addCleanup(self.store.close)
+        self.store.put_many([
+            ("bukhari", 1, "Actions are judged by intentions", "Book 1, Hadith 1"),
+            ("bukhari", 2, "A well-known saying about e-mail AND the \"quoted\" word", "Book 1, Hadith 2"),
+            ("muslim", 3, "Intentions and actions", ""),
+        ])
+
+    def numbers(self, query):
+        return sorted(number for _, number, _ in self.store.search(query))
+
+    def test_get_and_upsert(self):
+        self.assertEqual(self.store.get("bukhari", 1)[0], "Actions are judged by intentions")
+        self.assertIsNone(self.store.get("bukhari", 99))
+        self.store.put("bukhari", 1, "Replaced text")
+        self.assertEqual(self.store.get("bukhari", 1), ("Replaced text", ""))
+        self.assertEqual(self.numbers("judged"), [])
+        self.assertEqual(self.numbers("replaced"), [1])
+
+    def test_every_word_must_match(self):
+        self.assertEqual(self.numbers("intentions"), [1, 3])
+        self.assertEqual(self.numbers("intentions judged"), [1])
+
+    def test_query_syntax_is_searched_literally(self):
+        for query in ("well-known", "e-mail", "mail AND", "foo AND", 'quoted"', '"', "NOT", "*", "a OR (b"):
+            with self.subTest(query=query):
+                self.store.search(query)  # Must not raise sqlite3.OperationalError
+        self.assertEqual(self.numbers("well-known"), [2])
+        self.assertEqual(self.numbers('"quoted'), [2])
+        self.assertEqual(self.numbers("   "), [])
+
+    def test_fts_query(self):
+        self.assertEqual(fts_query('a-b  say "hi"'), '"a-b" "say" """hi"""')
+        self.assertEqual(fts_query(""), "")
+
+    def test_stats(self):
+        self.assertEqual(dict(self.store.stats()), {"bukhari": 2, "muslim": 1})
+
+if __name__ == "__main__":
+    unittest.main()
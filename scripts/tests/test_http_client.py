@@ -0,0 +1,76 @@
+# http_client.iter_content against a local stub server: the disk cache, 304
+# revalidation, and abandoning a download once the hadith has been parsed.
+#
+#   python3 -m pytest scripts/tests
+
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+SCRIPTS = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS))
+
+import http_client
+from hadith_parse import extract_hadith
+from stubserver import StubServer
+
+PAGE = (SCRIPTS / "bench" / "fixtures" / "bukhari_short.html").read_bytes()
+STALL = 5.0  # Seconds the stub waits before sending the rest of a page
+
+class IterContentTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = http_client.ResponseCache(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def cached_files(self):
+        return sorted(p.suffix for p in Path(self.tmp.name).iterdir())
+
+    def test_full_body_is_cached_and_served_without_request(self):
+        routes = {'/page': (200, {'ETag': '"v1"'}, [PAGE[:1000], PAGE[1000:]])}
+        with StubServer(routes) as stub:
+            url = stub.url + "/page"
+            first = b"".join(http_client.iter_content(url, cache=self.cache))
+            again = b"".join(http_client.iter_content(url, max_age=60, cache=self.cache))
+        self.assertEqual(first, PAGE)
+        self.assertEqual(again, PAGE)
+        self.assertEqual(len(stub.requests), 1)
+        self.assertEqual(self.cached_files(), ['.body', '.json'])
+
+    def test_stale_entry_is_revalidated(self):
+        def page(headers):
+            if headers.get('If-None-Match') == '"v1"':
+                return 304, {}, b""
+            return 200, {'ETag': '"v1"'}, PAGE
+        with StubServer({'/page': (200, {}, page)}) as stub:
+            url = stub.url + "/page"
+            b"".join(http_client.iter_content(url, cache=self.cache))
+            body = b"".join(http_client.iter_content(url, cache=self.cache))
+        self.assertEqual(body, PAGE)
+        self.assertEqual(stub.requests[1][1].get('If-None-Match'), '"v1"')
+
+    def test_early_stop_does_not_wait_for_or_cache_the_rest(self):
+        # The hadith is complete within the first two 16 KiB reads; the rest stalls
+        split = 2 * http_client.CHUNK_SIZE
+        chunks = [PAGE[:split], PAGE[split:]]
+        with StubServer({'/page': (200, {}, chunks)}, delay=STALL) as stub:
+            start = time.monotonic()
+            parsed = extract_hadith(http_client.iter_content(stub.url + "/page", cache=self.cache))
+            elapsed = time.monotonic() - start
+        self.assertIsNotNone(parsed)
+        self.assertLess(elapsed, STALL / 2)
+        self.assertEqual(self.cached_files(), [])
+
+    def test_no_store_is_not_cached(self):
+        routes = {'/page': (200, {'Cache-Control': 'no-store'}, PAGE)}
+        with StubServer(routes) as stub:
+            body = b"".join(http_client.iter_content(stub.url + "/page", cache=self.cache))
+        self.assertEqual(body, PAGE)
+        self.assertEqual(self.cached_files(), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+# hwmon.py against a fake /sys/class/hwmon tree: sensor lookup by label,
+# sampling an open input, and recovering when the hwmon index moves.
+#
+#   python3 -m pytest scripts/tests
+
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import hwmon
+
+def make_chip(root, index, name, temps):
+    """ROOT/hwmonN with a name file and {label: millidegrees} temperature inputs"""
+    chip = Path(root, f"hwmon{index}")
+    chip.mkdir()
+    (chip / "name").write_text(name + "\n")
+    for i, (label, value) in enumerate(temps.items(), 1):
+        (chip / f"temp{i}_label").write_text(label + "\n")
+        (chip / f"temp{i}_input").write_text(f"{value}\n")
+    return chip
+
+class HwmonTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix="hwmon-test-")
+        self.addCleanup(shutil.rmtree, self.root)
+        make_chip(self.root, 0, "nvme", {'Composite': 38850})
+        self.cpu = make_chip(self.root, 1, "k10temp", {'Tctl': 45250, 'Tccd1': 41000})
+        self.gpu = make_chip(self.root, 2, "amdgpu", {'edge': 50000, 'junction': 88000, 'mem': 60000})
+
+    def test_lists_labelled_inputs(self):
+        found = [(name, label) for name, label, _ in hwmon.labelled_inputs(self.root)]
+        self.assertIn(('k10temp', 'Tctl'), found)
+        self.assertIn(('amdgpu', 'junction'), found)
+        self.assertEqual(len(found), 6)
+
+    def test_prefers_the_named_chip(self):
+        make_chip(self.root, 3, "zenpower", {'Tctl': 99000})
+        self.assertEqual(hwmon.find_input('tctl', 'k10temp', self.root), str(self.cpu / "temp1_input"))
+        self.assertIsNone(hwmon.find_input('Tdie', 'k10temp', self.root))
+
+    def test_sample_classes_and_stats(self):
+        reader = hwmon.TemperatureReader('gpu', self.root)
+        first = reader.sample()
+        self.assertEqual(first['text'], "88.0°C")
+        self.assertEqual(first['class'], 'warning')
+        (self.gpu / "temp2_input").write_text("101500\n")
+        second = reader.sample()
+        self.assertEqual(second['class'], 'critical')
+        self.assertEqual(second['percentage'], 100)
+        self.assertIn("Min: 88°C", second['tooltip'])
+        self.assertIn("Max: 102°C", second['tooltip'])
+        self.assertEqual(reader.delay(), hwmon.INTERVAL)
+
+    def test_reads_the_open_input_in_place(self):
+        reader = hwmon.TemperatureReader('cpu', self.root)
+        reader.sample()
+        fd = reader.sensor.fd
+        (self.cpu / "temp1_input").write_text("47000\n")
+        self.assertEqual(reader.sample()['text'], "47.0°C")
+        self.assertEqual(reader.sensor.fd, fd)
+        reader.sensor.close()
+
+    def test_missing_sensor_then_rescan(self):
+        shutil.rmtree(self.cpu)
+        reader = hwmon.TemperatureReader('cpu', self.root)
+        self.assertEqual(reader.sample(), hwmon.ERROR_OUTPUT)
+        self.assertEqual(reader.delay(), hwmon.RESCAN_DELAY)
+        # Driver came back under a new index
+        make_chip(self.root, 7, "k10temp", {'Tctl': 52000})
+        self.assertEqual(reader.sample()['text'], "52.0°C")
+        reader.sensor.close()
+
+    def test_unreadable_input_drops_the_sensor(self):
+        reader = hwmon.TemperatureReader('cpu', self.root)
+        reader.sample()
+        (self.cpu / "temp1_input").write_text("garbage\n")
+        self.assertEqual(reader.sample(), hwmon.ERROR_OUTPUT)
+        self.assertIsNone(reader.sensor)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+# hypripc.py against a fake Hyprland: requests, dispatch errors, batches,
+# JSON queries and the event stream.
+#
+#   python3 -m pytest scripts/tests
+
+import asyncio
+import os
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import hypripc
+from fakehyprland import FakeHyprland
+
+class HyprIpcTest(unittest.TestCase):
+    def setUp(self):
+        self.hyprland = FakeHyprland()
+        self.addCleanup(self.hyprland.close)
+        env = mock.patch.dict(os.environ, {'HYPRLAND_SOCKET_DIR': self.hyprland.dir})
+        env.start()
+        self.addCleanup(env.stop)
+
+    def test_dispatch(self):
+        hypripc.dispatch("togglespecialworkspace", "binds")
+        self.assertEqual(self.hyprland.requests, ["dispatch togglespecialworkspace binds"])
+
+    def test_dispatch_error(self):
+        with self.assertRaisesRegex(hypripc.HyprlandError, "Invalid dispatcher"):
+            hypripc.dispatch("nosuchthing")
+
+    def test_batch_is_one_connection(self):
+        reply = hypripc.batch(["dispatch workspace 1", "dispatch exec kitty"])
+        self.assertEqual(self.hyprland.requests, ["[[BATCH]]dispatch workspace 1;dispatch exec kitty"])
+        self.assertEqual(reply, "ok\n\nok")
+
+    def test_query(self):
+        self.assertEqual(hypripc.query("clients")[0]['class'], "kitty")
+        self.assertEqual(self.hyprland.requests, ["j/clients"])
+        with self.assertRaisesRegex(hypripc.HyprlandError, "unknown request"):
+            hypripc.query("nonsense")
+
+    def test_events(self):
+        async def first_two():
+            stream = hypripc.events()
+            task = asyncio.ensure_future(stream.__anext__())
+            await asyncio.get_running_loop().run_in_executor(None, self.hyprland.connected.wait, 5)
+            self.hyprland.emit("workspace", "2")
+            self.hyprland.emit("activewindow", "kitty,~ >> vim")
+            received = [await task, await stream.__anext__()]
+            await stream.aclose()
+            return received
+        received = asyncio.run(asyncio.wait_for(first_two(), 5))
+        self.assertEqual(received, [("workspace", "2"), ("activewindow", "kitty,~ >> vim")])
+
+    def test_unreachable(self):
+        self.hyprland.close()
+        with self.assertRaises(hypripc.HyprlandError):
+            hypripc.dispatch("exit")
+
+class SocketDirTest(unittest.TestCase):
+    def test_needs_instance_signature(self):
+        with mock.patch.dict(os.environ, clear=True):
+            with self.assertRaisesRegex(hypripc.HyprlandError, "HYPRLAND_INSTANCE_SIGNATURE"):
+                hypripc.socket_dir()
+
+if __name__ == "__main__":
+    unittest.main()
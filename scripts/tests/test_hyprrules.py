@@ -0,0 +1,40 @@
+# hyprrules.py: folding identical rules into one ^(a|b)$ alternation, and
+# leaving unanchored patterns (which match anywhere in a name) alone.
+#
+#   python3 -m pytest scripts/tests
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import hyprrules
+
+RULES = """\
+windowrulev2 = center 1, class:filepad
+windowrulev2 = center 1, class:^(Electron)$
+windowrulev2 = center 1, class:^(HyprBinds)$
+windowrulev2 = bordersize 2, class:^(Electron)$
+"""
+
+def compiled(text):
+    with tempfile.NamedTemporaryFile('w', suffix='.conf') as f:
+        f.write(text)
+        f.flush()
+        rules, _ = hyprrules.load(f.name)
+    return [rule.text for rule in hyprrules.compile_rules(rules)]
+
+class AlternationTest(unittest.TestCase):
+    def test_anchored_patterns_are_folded(self):
+        out = compiled(RULES)
+        self.assertIn("windowrulev2 = center 1, class:^(Electron|HyprBinds)$", out)
+
+    def test_unanchored_pattern_keeps_its_own_line(self):
+        out = compiled(RULES)
+        self.assertIn("windowrulev2 = center 1, class:filepad", out)
+        self.assertFalse(any("filepad|" in line or "|filepad" in line for line in out), out)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+# iconcache.py: the binary cache format round-trips through read_cache, the
+# validator rejects damaged files, and update() only rescans what changed.
+#
+#   python3 -m pytest scripts/tests
+
+import os
+import random
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import iconcache
+
+INDEX_THEME = """\
+[Icon Theme]
+Name=Test
+Directories=16x16/apps,scalable/apps,symbolic/actions
+ScaledDirectories=16x16@2/apps
+"""
+
+def random_listing(seed, directories=4, icons=300):
+    rng = random.Random(seed)
+    names = [f"icon-{i}-{rng.choice(['a', 'é', 'x-y', 'symbolic'])}" for i in range(icons)]
+    return {f"dir{d}/apps": {name: rng.choice([1, 2, 4, 6, 8, 15]) for name in rng.sample(names, icons // 2)}
+            for d in range(directories)}
+
+class FormatTest(unittest.TestCase):
+    def test_round_trip(self):
+        for seed in range(5):
+            listing = random_listing(seed)
+            self.assertEqual(iconcache.read_cache(iconcache.build_cache(listing)), listing)
+
+    def test_empty_theme(self):
+        self.assertEqual(iconcache.read_cache(iconcache.build_cache({})), {})
+        self.assertEqual(iconcache.read_cache(iconcache.build_cache({'apps': {}})), {'apps': {}})
+
+    def test_header_and_alignment(self):
+        data = iconcache.build_cache(random_listing(1))
+        major, minor, hash_offset, directory_offset = struct.unpack_from(">HHII", data)
+        self.assertEqual((major, minor), (1, 0))
+        self.assertEqual(hash_offset % 4, 0)
+        self.assertEqual(directory_offset % 4, 0)
+        self.assertEqual(len(data) % 4, 0)
+
+    def test_icon_name_hash_matches_gtk(self):
+        # Values from GTK's icon_name_hash (signed char, h = h * 31 + c)
+        self.assertEqual(iconcache.icon_name_hash(""), 0)
+        self.assertEqual(iconcache.icon_name_hash("a"), 97)
+        self.assertEqual(iconcache.icon_name_hash("ab"), 97 * 31 + 98)
+        self.assertEqual(iconcache.icon_name_hash("é"), (-61 * 31 - 87) & 0xffffffff)
+
+    def test_rejects_damage(self):
+        data = bytearray(iconcache.build_cache(random_listing(2)))
+        with self.assertRaises(ValueError):
+            iconcache.read_cache(b"\0\2\0\0" + bytes(data[4:]))
+        with self.assertRaises(ValueError):
+            iconcache.read_cache(bytes(data[:len(data) // 2]))
+        # Point the first non-empty bucket's icon at itself
+        hash_offset = struct.unpack_from(">I", data, 4)[0]
+        n_buckets = struct.unpack_from(">I", data, hash_offset)[0]
+        for bucket in range(n_buckets):
+            icon = struct.unpack_from(">I", data, hash_offset + 4 + 4 * bucket)[0]
+            if icon != iconcache.EMPTY:
+                struct.pack_into(">I", data, icon, icon)
+                break
+        with self.assertRaisesRegex(ValueError, "loop"):
+            iconcache.read_cache(bytes(data))
+
+    @unittest.skipUnless(shutil.which("gtk-update-icon-cache"), "gtk-update-icon-cache not installed")
+    def test_same_listing_as_gtk(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "index.theme").write_text(INDEX_THEME)
+            (root / "16x16/apps").mkdir(parents=True)
+            (root / "16x16/apps/kitty.png").write_bytes(b"")
+            subprocess.run(["gtk-update-icon-cache", "-f", "-q", "-i", str(root)], check=True)
+            gtk = iconcache.read_cache((root / iconcache.CACHE_NAME).read_bytes())
+            self.assertEqual(gtk, iconcache.read_cache(iconcache.build_cache(gtk)))
+
+class UpdateTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name, "theme")
+        state = mock.patch.object(iconcache, 'STATE_DIR', Path(tmp.name, "state"))
+        state.start()
+        self.addCleanup(state.stop)
+        self.root.mkdir()
+        (self.root / "index.theme").write_text(INDEX_THEME)
+        for directory, names in (("16x16/apps", ["kitty.png", "firefox.png", "firefox.svg"]),
+                                 ("scalable/apps", ["kitty.svg", "notes.txt"]),
+                                 ("16x16@2/apps", ["kitty.png"])):
+            (self.root / directory).mkdir(parents=True)
+            for name in names:
+                (self.root / directory / name).write_bytes(b"")
+        os.symlink("missing.svg", self.root / "scalable/apps/broken.svg")
+
+    def cached(self):
+        return iconcache.read_cache((self.root / iconcache.CACHE_NAME).read_bytes())
+
+    def test_build_lists_every_directory(self):
+        iconcache.update(self.root)
+        self.assertEqual(self.cached(), {
+            '16x16/apps': {'kitty': iconcache.HAS_SUFFIX_PNG,
+                           'firefox': iconcache.HAS_SUFFIX_PNG | iconcache.HAS_SUFFIX_SVG},
+            'scalable/apps': {'kitty': iconcache.HAS_SUFFIX_SVG},
+            '16x16@2/apps': {'kitty': iconcache.HAS_SUFFIX_PNG},
+        })
+        self.assertEqual(iconcache.check(self.root), [])
+
+    def test_unchanged_theme_is_left_alone(self):
+        iconcache.update(self.root)
+        before = (self.root / iconcache.CACHE_NAME).stat().st_mtime_ns
+        self.assertIsNone(iconcache.update(self.root))
+        self.assertEqual((self.root / iconcache.CACHE_NAME).stat().st_mtime_ns, before)
+
+    def test_only_changed_directories_are_rescanned(self):
+        iconcache.update(self.root)
+        (self.root / "scalable/apps/notes.svg").write_bytes(b"")
+        self.assertEqual(iconcache.update(self.root), ["scalable/apps"])
+        self.assertIn('notes', self.cached()['scalable/apps'])
+        self.assertEqual(iconcache.check(self.root), [])
+
+    def test_check_reports_stale_cache(self):
+        iconcache.update(self.root)
+        (self.root / "16x16/apps/kitty.png").unlink()
+        problems = iconcache.check(self.root)
+        self.assertIn("16x16/apps/kitty: 4 != None", problems)
+
+if __name__ == "__main__":
+    unittest.main()
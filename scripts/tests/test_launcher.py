@@ -0,0 +1,136 @@
+# launcher.py against a fixture XDG tree: precedence and shadowing, ids for
+# subdirectories, locales, visibility rules, index reuse, frecency ranking,
+# Exec expansion and launching through a fake Hyprland.
+#
+#   python3 -m pytest scripts/tests
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import launcher
+from fakehyprland import FakeHyprland
+
+ENTRIES = {
+    # XDG_DATA_HOME: the user's copy of firefox hides the system one
+    "home/applications/firefox.desktop": "[Desktop Entry]\nType=Application\nName=Firefox\nHidden=true\n",
+    "home/applications/notes.desktop": (
+        "[Desktop Entry]\nType=Application\nName=Notes\nName[de]=Notizen\n"
+        "Keywords=memo;todo;\nExec=notes %U\nPath=/tmp/notes dir\n"),
+    "system/applications/firefox.desktop": "[Desktop Entry]\nType=Application\nName=Firefox\nExec=firefox %u\n",
+    "system/applications/kitty.desktop": (
+        "[Desktop Entry]\nType=Application\nName=kitty\nGenericName=Terminal\n"
+        "Exec=kitty\nIcon=kitty\n\n[Desktop Action new]\nName=New window\nExec=kitty --new\n"),
+    "system/applications/htop.desktop": (
+        "[Desktop Entry]\nType=Application\nName=htop\nExec=htop\nTerminal=true\n"),
+    "system/applications/gnome-only.desktop": (
+        "[Desktop Entry]\nType=Application\nName=Gnome Thing\nExec=thing\nOnlyShowIn=GNOME;\n"),
+    "system/applications/not-installed.desktop": (
+        "[Desktop Entry]\nType=Application\nName=Ghost\nExec=ghost\nTryExec=no-such-binary-here\n"),
+    "system/applications/link.desktop": "[Desktop Entry]\nType=Link\nName=Website\nURL=https://example.com\n",
+    "system/applications/kde4/okular.desktop": (
+        "[Desktop Entry]\nType=Application\nName=Okular\nExec=okular %f %i -caption %c\nIcon=okular\n"),
+}
+
+class LauncherTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tree = Path(tmp.name)
+        for name, text in ENTRIES.items():
+            path = self.tree / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text)
+
+        patches = [
+            mock.patch.dict(os.environ, {
+                'XDG_DATA_HOME': str(self.tree / "home"),
+                'XDG_DATA_DIRS': str(self.tree / "system"),
+                'XDG_CURRENT_DESKTOP': "Hyprland",
+                'LANG': "en_US.UTF-8",
+                'HYPRLAND_SOCKET_DIR': str(self.tree / "no-hyprland"),
+            }),
+            mock.patch.object(launcher, 'CACHE_DIR', self.tree / "cache"),
+            mock.patch.object(launcher, 'INDEX_FILE', self.tree / "cache" / "index.json"),
+            mock.patch.object(launcher, 'STATE_DIR', self.tree / "state"),
+            mock.patch.object(launcher, 'HISTORY_FILE', self.tree / "state" / "frecency.json"),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def visible_ids(self, now=1000):
+        return [row[0] for row in launcher.ranked(launcher.build_index(), launcher.load_history(), now)]
+
+    def test_visible_entries_alphabetically(self):
+        self.assertEqual(self.visible_ids(), ["htop.desktop", "kitty.desktop", "notes.desktop", "kde4-okular.desktop"])
+
+    def test_user_entry_shadows_system_entry(self):
+        apps = launcher.build_index()
+        self.assertTrue(apps["firefox.desktop"]['hidden'])
+        self.assertTrue(apps["firefox.desktop"]['file'].startswith(str(self.tree / "home")))
+
+    def test_only_the_desktop_entry_group_is_read(self):
+        self.assertEqual(launcher.build_index()["kitty.desktop"]['exec'], "kitty")
+
+    def test_localized_names(self):
+        with mock.patch.dict(os.environ, {'LANG': "de_DE.UTF-8"}):
+            self.assertEqual(launcher.build_index()["notes.desktop"]['name'], "Notizen")
+
+    def test_unchanged_directories_are_not_reparsed(self):
+        launcher.build_index()
+        (self.tree / "system/applications/zathura.desktop").write_text(
+            "[Desktop Entry]\nType=Application\nName=Zathura\nExec=zathura %f\n")
+        with mock.patch.object(launcher, 'scan_directory', wraps=launcher.scan_directory) as scan:
+            apps = launcher.build_index()
+        self.assertIn("zathura.desktop", apps)
+        self.assertEqual([call.args[0] for call in scan.call_args_list], [str(self.tree / "system/applications")])
+        with mock.patch.object(launcher, 'scan_directory') as scan:
+            launcher.build_index()
+        scan.assert_not_called()
+
+    def test_frecency(self):
+        launcher.record_launch("kitty.desktop", now=0)
+        launcher.record_launch("notes.desktop", now=0)
+        launcher.record_launch("notes.desktop", now=0)
+        self.assertEqual(self.visible_ids(now=0)[:2], ["notes.desktop", "kitty.desktop"])
+        # A fresh launch outweighs two launches one month ago
+        month = 30 * 86400
+        launcher.record_launch("kitty.desktop", now=month)
+        self.assertEqual(self.visible_ids(now=month)[:2], ["kitty.desktop", "notes.desktop"])
+        history = launcher.load_history()
+        self.assertAlmostEqual(launcher.score(history["notes.desktop"], month), 2 * 0.5 ** (30 / 14))
+
+    def test_expand_exec(self):
+        apps = launcher.build_index()
+        self.assertEqual(launcher.expand_exec(apps["notes.desktop"]), ["notes"])
+        self.assertEqual(launcher.expand_exec(apps["kde4-okular.desktop"]),
+                         ["okular", "--icon", "okular", "-caption", "Okular"])
+        self.assertEqual(launcher.expand_exec(apps["htop.desktop"]), [launcher.TERMINAL, "-e", "htop"])
+
+    def test_rofi_rows(self):
+        apps = launcher.build_index()
+        row = next(launcher.rofi_rows([("notes.desktop", apps["notes.desktop"], 0)]))
+        self.assertEqual(row, "Notes\0icon\x1f\x1finfo\x1fnotes.desktop\x1fmeta\x1fmemo todo notes\n")
+
+    def test_launch_through_hyprland(self):
+        hyprland = FakeHyprland()
+        self.addCleanup(hyprland.close)
+        with mock.patch.dict(os.environ, {'HYPRLAND_SOCKET_DIR': hyprland.dir}):
+            launcher.launch(launcher.build_index()["notes.desktop"])
+        self.assertEqual(hyprland.requests, ["dispatch exec cd '/tmp/notes dir' && notes"])
+
+    def test_launch_without_hyprland(self):
+        with mock.patch.object(launcher.subprocess, 'Popen') as popen:
+            launcher.launch(launcher.build_index()["kitty.desktop"])
+        popen.assert_called_once()
+        self.assertEqual(popen.call_args.args[0], ["kitty"])
+        self.assertTrue(popen.call_args.kwargs['start_new_session'])
+
+if __name__ == "__main__":
+    unittest.main()
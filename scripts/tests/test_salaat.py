@@ -0,0 +1,133 @@
+# salaat.py: the offline calculator against salaat_reference.json, the
+# daemon's refresh scheduling, and the month cache in front of a stub API.
+#
+#   python3 -m pytest scripts/tests
+
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import time
+import unittest
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import http_client
+import salaat
+from stubserver import StubServer
+
+def calendar_page():
+    """The reference month as a calendarByCity response, shaped like api.aladhan.com's"""
+    reference = json.loads(salaat.REFERENCE_FILE.read_text())
+    days = []
+    for key, timings in sorted(reference.items()):
+        d = date.fromisoformat(key)
+        days.append({
+            'timings': {name: f"{t} (SAST)" for name, t in timings.items()},
+            'date': {'gregorian': {'date': d.strftime('%d-%m-%Y')}},
+        })
+    return json.dumps({'code': 200, 'status': "OK", 'data': days}).encode()
+
+class ReferenceTest(unittest.TestCase):
+    def test_calculator_matches_reference(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            status = salaat.check_reference()
+        self.assertEqual(status, 0, out.getvalue())
+
+class BoundaryTest(unittest.TestCase):
+    TIMES = {'Fajr': '04:30', 'Sunrise': '05:48', 'Dhuhr': '11:58',
+             'Asr': '15:26', 'Maghrib': '18:08', 'Isha': '19:21'}
+
+    def test_next_prayer(self):
+        now = datetime(2026, 10, 1, 12, 0)
+        self.assertEqual(salaat.seconds_until_next_boundary(self.TIMES, now), (3 * 60 + 26) * 60)
+
+    def test_midnight_after_isha(self):
+        now = datetime(2026, 10, 1, 23, 0)
+        self.assertEqual(salaat.seconds_until_next_boundary(self.TIMES, now), 3600)
+
+    def test_unreachable_times_are_skipped(self):
+        # High latitudes in summer: no Fajr/Isha angle, so the calculator gives '-----'
+        times = dict(self.TIMES, Fajr='-----', Isha='-----')
+        now = datetime(2026, 10, 1, 18, 30)
+        self.assertEqual(salaat.seconds_until_next_boundary(times, now), 5.5 * 3600)
+        self.assertNotIn('-----', salaat.format_output(times)['text'])
+
+class HighLatitudeTest(unittest.TestCase):
+    # 70°N in June: the sun never sets, so there is no sunrise, sunset or night
+    @mock.patch.multiple(salaat, LATITUDE=70.0, LONGITUDE=25.0, TIMEZONE="Europe/Oslo")
+    def test_polar_day(self):
+        times = salaat.calculate_prayer_times(date(2026, 6, 21))
+        for name in ('Fajr', 'Sunrise', 'Maghrib', 'Isha', 'Midnight'):
+            self.assertEqual(times[name], '-----', name)
+        self.assertRegex(times['Dhuhr'], salaat.TIME_RE)
+
+        dhuhr = datetime.strptime(f"2026-06-21 {times['Dhuhr']}", '%Y-%m-%d %H:%M')
+        self.assertEqual(salaat.seconds_until_next_boundary(times, dhuhr - timedelta(hours=1)), 3600)
+        self.assertNotIn('-----', salaat.format_output(times)['text'])
+
+    @mock.patch.multiple(salaat, LATITUDE=70.0, LONGITUDE=25.0, TIMEZONE="Europe/Oslo")
+    def test_polar_night_keeps_twilight_times(self):
+        times = salaat.calculate_prayer_times(date(2026, 12, 21))
+        self.assertEqual(times['Sunrise'], '-----')
+        self.assertRegex(times['Fajr'], salaat.TIME_RE)
+        self.assertRegex(times['Isha'], salaat.TIME_RE)
+
+class ApiCacheTest(unittest.TestCase):
+    DAY = date(2026, 10, 15)
+    PATH = "/calendarByCity/2026/10"
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        tmp = Path(self.tmp.name)
+        self.patches = [
+            mock.patch.object(salaat, 'CACHE_FILE', tmp / "prayer_times.json"),
+            mock.patch.object(http_client, '_cache', http_client.ResponseCache(tmp / "http")),
+        ]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in reversed(self.patches):
+            patch.stop()
+        self.tmp.cleanup()
+
+    def test_fetch_fills_the_month_cache(self):
+        with StubServer({self.PATH: (200, {}, calendar_page())}) as stub, \
+                mock.patch.object(salaat, 'API_URL', stub.url):
+            times = salaat.fetch_prayer_times(self.DAY)
+            cached = salaat.get_cached_times(self.DAY + timedelta(days=1), max_age=60)
+        self.assertEqual(times['Fajr'], "04:14")
+        self.assertIsNotNone(cached)
+        self.assertEqual(len(stub.requests), 1)
+        self.assertIn("method=3", stub.requests[0][0])
+
+    def test_stale_cache_is_only_used_as_a_fallback(self):
+        with StubServer({self.PATH: (200, {}, calendar_page())}) as stub, \
+                mock.patch.object(salaat, 'API_URL', stub.url):
+            salaat.fetch_prayer_times(self.DAY)
+        with mock.patch.object(time, 'time', return_value=time.time() + salaat.CACHE_TTL + 1):
+            self.assertIsNone(salaat.get_cached_times(self.DAY, max_age=salaat.CACHE_TTL))
+            self.assertIsNotNone(salaat.get_cached_times(self.DAY))
+
+    def test_api_error_leaves_cache_alone(self):
+        with StubServer({self.PATH: (200, {}, b'{"code": 500, "status": "Error"}')}) as stub, \
+                mock.patch.object(salaat, 'API_URL', stub.url), \
+                contextlib.redirect_stderr(io.StringIO()):
+            self.assertIsNone(salaat.fetch_prayer_times(self.DAY))
+        self.assertFalse(salaat.CACHE_FILE.exists())
+
+    def test_cache_for_other_settings_is_ignored(self):
+        with StubServer({self.PATH: (200, {}, calendar_page())}) as stub, \
+                mock.patch.object(salaat, 'API_URL', stub.url):
+            salaat.fetch_prayer_times(self.DAY)
+        with mock.patch.object(salaat, 'METHOD', 2):
+            self.assertIsNone(salaat.get_cached_times(self.DAY))
+
+if __name__ == "__main__":
+    unittest.main()
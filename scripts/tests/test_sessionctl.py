@@ -0,0 +1,185 @@
+# sessionctl.py: the concurrent hook runner (timeouts, process-group kills,
+# name clashes), the lock path through a fake Hyprland, and the login1 calls
+# against python-dbusmock's logind template on a private system bus.
+#
+#   python3 -m pytest scripts/tests
+#
+# The logind tests need python-dbusmock and PyGObject and are skipped without.
+
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import sessionctl
+from fakehyprland import FakeHyprland
+
+HAVE_DBUSMOCK = all(importlib.util.find_spec(name) for name in ("dbusmock", "dbus", "gi"))
+
+def alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+class HookTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        for patch in (mock.patch.object(sessionctl, 'HOOK_DIR', str(self.tmp / "hooks")),
+                      mock.patch.object(sessionctl, 'LOG_FILE', str(self.tmp / "actions.log"))):
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def hook(self, event, name, body, executable=True):
+        path = self.tmp / "hooks" / f"{event}.d" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("#!/bin/sh\n" + body)
+        path.chmod(0o755 if executable else 0o644)
+        return path
+
+    def statuses(self, results):
+        return {(r.kind, r.name): r.status for r in results}
+
+    def test_scripts_run_with_the_action(self):
+        self.hook("pre-lock", "10-record", f'echo "$1" > {self.tmp}/ran\n')
+        self.hook("pre-lock", "20-fail", "exit 3\n")
+        self.hook("pre-lock", "30-disabled", "exit 0\n", executable=False)
+        results = sessionctl.SessionActions().run_hooks("lock")
+        self.assertEqual(self.statuses(results), {
+            ('script', "pre-lock/10-record"): "ok",
+            ('script', "pre-lock/20-fail"): "failed: exit status 3",
+        })
+        self.assertEqual((self.tmp / "ran").read_text(), "lock\n")
+
+    def test_poweroff_runs_logout_and_shutdown_hooks(self):
+        self.hook("pre-logout", "a", "exit 0\n")
+        self.hook("pre-shutdown", "b", "exit 0\n")
+        names = [hook.name for hook in sessionctl.SessionActions().hooks("poweroff")]
+        self.assertEqual(names, ["pre-logout/a", "pre-shutdown/b"])
+
+    def test_overrun_kills_the_process_group(self):
+        # The hook backgrounds a child that would outlive a plain kill of the hook
+        self.hook("pre-lock", "hang", f"# timeout: 0.3\nsleep 60 &\necho $! > {self.tmp}/child\nwait\n")
+        start = time.monotonic()
+        results = sessionctl.SessionActions().run_hooks("lock")
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertEqual(results[0].status, "timed out")
+        child = int((self.tmp / "child").read_text())
+        deadline = time.monotonic() + 2
+        while alive(child) and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertFalse(alive(child))
+
+    def test_hooks_run_concurrently(self):
+        for i in range(4):
+            self.hook("pre-lock", f"{i}-sleep", "sleep 0.3\n")
+        actions = sessionctl.SessionActions()
+        actions.register("pre-lock", "slow", lambda action: time.sleep(0.3))
+        start = time.monotonic()
+        results = actions.run_hooks("lock")
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertEqual([r.status for r in results], ["ok"] * 5)
+
+    def test_hung_python_hook_is_abandoned(self):
+        actions = sessionctl.SessionActions()
+        actions.register("pre-lock", "stuck", lambda action: time.sleep(30), timeout=0.2)
+        start = time.monotonic()
+        results = actions.run_hooks("lock")
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertEqual(results[0].status, "timed out")
+
+    def test_script_and_python_hook_with_the_same_name(self):
+        self.hook("pre-lock", "notify", "exit 1\n")
+        actions = sessionctl.SessionActions()
+        actions.register("pre-lock", "notify", lambda action: None)
+        self.assertEqual(self.statuses(actions.run_hooks("lock")), {
+            ('script', "pre-lock/notify"): "failed: exit status 1",
+            ('python', "pre-lock/notify"): "ok",
+        })
+        with self.assertRaises(ValueError):
+            actions.register("pre-lock", "notify", lambda action: None)
+        with self.assertRaises(ValueError):
+            actions.register("pre-suspend", "x", lambda action: None)
+
+    def test_dry_run_logs_and_does_not_act(self):
+        self.hook("pre-logout", "a", "exit 0\n")
+        actions = sessionctl.SessionActions()
+        with mock.patch.object(actions, 'act') as act, mock.patch('sys.stderr'):
+            actions.perform("logout", dry_run=True)
+        act.assert_not_called()
+        log = (self.tmp / "actions.log").read_text()
+        self.assertIn("logout: script hook pre-logout/a ok", log)
+        self.assertIn("(dry run)", log)
+
+class LockTest(unittest.TestCase):
+    def test_lock_goes_through_hyprland(self):
+        hyprland = FakeHyprland()
+        self.addCleanup(hyprland.close)
+        with mock.patch.dict(os.environ, {'HYPRLAND_SOCKET_DIR': hyprland.dir}):
+            sessionctl.SessionActions().act("lock")
+        self.assertEqual(hyprland.requests, [f"dispatch exec {sessionctl.LOCK_COMMAND}"])
+
+    def test_lock_without_hyprland(self):
+        with mock.patch.dict(os.environ, {'HYPRLAND_SOCKET_DIR': "/nonexistent"}), \
+                mock.patch.object(sessionctl.subprocess, 'Popen') as popen:
+            sessionctl.SessionActions().act("lock")
+        self.assertEqual(popen.call_args.args[0], ["sh", "-c", sessionctl.LOCK_COMMAND])
+
+@unittest.skipUnless(HAVE_DBUSMOCK, "python-dbusmock and PyGObject are needed")
+class LogindTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        import dbus
+        import dbusmock
+        cls.dbusmock = dbusmock
+        dbusmock.DBusTestCase.start_system_bus()
+        cls.server, manager = dbusmock.DBusTestCase.spawn_server_template('logind', {}, system_bus=True)
+        cls.mock = dbus.Interface(manager, dbusmock.MOCK_IFACE)
+        cls.mock.AddMethod("org.freedesktop.login1.Manager", "TerminateSession", "s", "", "")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.terminate()
+        cls.server.wait()
+        cls.dbusmock.DBusTestCase.tearDownClass()
+
+    def setUp(self):
+        self.mock.ClearCalls()
+        patches = [
+            mock.patch.object(sessionctl, 'HOOK_DIR', "/nonexistent"),
+            mock.patch.object(sessionctl, 'LOG_FILE', os.devnull),
+            mock.patch.dict(os.environ, {'HYPRLAND_SOCKET_DIR': "/nonexistent", 'XDG_SESSION_ID': "c1"}),
+            mock.patch('sys.stderr'),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def calls(self):
+        return [(str(call[1]), [str(arg) for arg in call[2]]) for call in self.mock.GetCalls()]
+
+    def test_poweroff_and_reboot(self):
+        actions = sessionctl.SessionActions()
+        actions.perform("poweroff")
+        actions.perform("reboot")
+        self.assertEqual([name for name, _ in self.calls()], ["PowerOff", "Reboot"])
+
+    def test_logout_falls_back_to_terminate_session(self):
+        sessionctl.SessionActions().perform("logout")
+        self.assertEqual(self.calls(), [("TerminateSession", ["c1"])])
+
+    def test_errors_become_session_errors(self):
+        with self.assertRaises(sessionctl.SessionError):
+            sessionctl.SessionActions().call_login1("NoSuchMethod")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+
+# Shared pywal theme layer for the GTK scripts
+# Loads the wal palette and renders each window's CSS template into
+# ~/.cache/neon-theme, keyed by palette hash and template version. A repeat
+# launch reads the finished CSS back; a new palette (or a bumped template
+# version) produces a new key, so stale CSS is never used. The palette is
+# kept in memory until the wal files' mtimes change, so long-lived windows
+# (popups.py) can call apply_css on every show and only pay for a stat.
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+WAL_DIR = Path.home() / ".cache" / "wal"
+CACHE_DIR = Path.home() / ".cache" / "neon-theme"
+
+# Fallback colors if pywal isn't available
+FALLBACK_PALETTE = {
+    'background': '#282a36',
+    'foreground': '#f8f8f2',
+    'cursor': '#f8f8f2',
+    'color0': '#21222c', 'color1': '#ff5555', 'color2': '#50fa7b', 'color3': '#ffb86c',
+    'color4': '#bd93f9', 'color5': '#ff79c6', 'color6': '#8be9fd', 'color7': '#f8f8f2',
+    'color8': '#6272a4', 'color9': '#ff6e6e', 'color10': '#69ff94', 'color11': '#ffffa5',
+    'color12': '#d6acff', 'color13': '#ff92df', 'color14': '#a4ffff', 'color15': '#ffffff',
+}
+
+_palette = None
+_palette_hash = None
+_wal_stat = None  # (mtime_ns, size) of the wal files _palette was read from
+_applied = {}  # Name -> (cache key, provider) currently on the screen
+
+def _read(path):
+    try:
+        return path.read_bytes()
+    except OSError:
+        return b""
+
+def _check_wal():
+    """Forget the in-memory palette if wal has written new files since it was read"""
+    global _palette, _palette_hash, _wal_stat
+    stat = []
+    for name in ("colors.json", "colors"):
+        try:
+            st = (WAL_DIR / name).stat()
+            stat.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            stat.append(None)
+    if stat != _wal_stat:
+        _palette = _palette_hash = None
+        _wal_stat = stat
+
+def palette_hash():
+    """Hash of the raw wal files; changes whenever wal writes a new palette"""
+    global _palette_hash
+    _check_wal()
+    if _palette_hash is None:
+        digest = hashlib.sha1()
+        digest.update(_read(WAL_DIR / "colors.json"))
+        digest.update(b"\0")
+        digest.update(_read(WAL_DIR / "colors"))
+        _palette_hash = digest.hexdigest()[:16]
+    return _palette_hash
+
+def load_palette():
+    """
+    Return the wal palette as a flat dict: background, foreground, cursor and
+    color0..color15. Prefers colors.json, falls back to the plain colors file
+    and then to FALLBACK_PALETTE for anything missing.
+    """
+    global _palette
+    _check_wal()
+    if _palette is not None:
+        return _palette
+
+    palette = dict(FALLBACK_PALETTE)
+    try:
+        data = json.loads(_read(WAL_DIR / "colors.json"))
+        palette.update(data['colors'])
+        palette.update(data['special'])
+    except (ValueError, KeyError, TypeError):
+        lines = _read(WAL_DIR / "colors").decode(errors='replace').split()
+        for i, color in enumerate(lines[:16]):
+            palette[f'color{i}'] = color
+        if lines:
+            palette['background'] = palette['color0']
+            palette['foreground'] = palette['cursor'] = palette['color15']
+    _palette = palette
+    return palette
+
+def css_key(name, version):
+    return f"{name}-v{version}-{palette_hash()}"
+
+def render_css(name, template, version):
+    """
+    Return the CSS for a template (str.format placeholders such as {color0})
+    as bytes, from the cache when this palette/version was rendered before.
+    """
+    key = css_key(name, version)
+    path = CACHE_DIR / f"{key}.css"
+    try:
+        return key, path.read_bytes()
+    except OSError:
+        pass
+
+    css = template.format(**load_palette()).encode()
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(css)
+        tmp.replace(path)
+        # Drop renders of this template for older palettes or versions
+        for old in CACHE_DIR.glob(f"{name}-v*.css"):
+            if old != path:
+                old.unlink(missing_ok=True)
+    except OSError:
+        pass
+    return key, css
+
+def apply_css(name, template, version):
+    """
+    Render (or load) a window's CSS and add it to the default screen. Cheap to
+    call again: nothing happens unless the palette changed, in which case the
+    new CSS replaces the provider added last time.
+    """
+    import gi
+    gi.require_version('Gtk', '3.0')
+    from gi.repository import Gtk, Gdk
+
+    previous = _applied.get(name)
+    if previous and previous[0] == css_key(name, version):
+        return
+    key, css = render_css(name, template, version)
+    screen = Gdk.Screen.get_default()
+    if previous:
+        Gtk.StyleContext.remove_provider_for_screen(screen, previous[1])
+    provider = Gtk.CssProvider()
+    provider.load_from_data(css)
+    Gtk.StyleContext.add_provider_for_screen(
+        screen,
+        provider,
+        Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
+    )
+    _applied[name] = (key, provider)
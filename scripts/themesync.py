@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+
+# Theme propagation engine (replaces the copy-everything colors.sh)
+# Copies wal's generated color files to kitty, Hyprland and waybar only when
+# their content changed, with atomic writes fanned out over a thread pool,
+# then asks the affected programs to reload instead of restarting them:
+#   kitty   SIGUSR1 (reloads kitty.conf, which includes colors.conf)
+#   waybar  SIGUSR2 (reloads config and style)
+#   hyprland  reload over the IPC socket
+# The palette is only extracted when the wallpaper changed (palette.py, or wal
+# without numpy/Pillow), and pywalfox only runs when a target was rewritten.
+# A no-op login stats a handful of files and exits.
+#
+#   themesync.py            Sync once (autostart)
+#   themesync.py --watch    Sync, then keep watching ~/.cache/wal and the wallpaper
+#   themesync.py --force    Rewrite and reload everything
+
+import hashlib
+import json
+import os
+import select
+import signal
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import hypripc
+from inotify import Inotify
+
+HOME = Path.home()
+WAL_DIR = HOME / ".cache" / "wal"
+WALLPAPER = HOME / ".config" / "hypr" / "bg" / "bg.jpg"
+STATE_FILE = HOME / ".cache" / "neon-theme" / "sync.json"
+DEBOUNCE = 0.3  # wal writes its files in a burst; wait for it to settle
+
+# wal output -> (destination, consumer to reload)
+TARGETS = {
+    "colors-kitty.conf": (HOME / ".config" / "kitty" / "colors.conf", "kitty"),
+    "colors-hyprland.conf": (HOME / ".config" / "hypr" / "colors.conf", "hyprland"),
+    "colors-waybar.css": (HOME / ".config" / "waybar" / "colors.css", "waybar"),
+}
+
+def file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def stat_key(path):
+    """(mtime_ns, size) or None; enough to skip unchanged files without reading them"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+def load_state():
+    try:
+        with open(STATE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_state(state):
+    STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = STATE_FILE.with_suffix('.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp, STATE_FILE)
+
+def atomic_write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+def run_wal(state, force=False):
+    """Regenerate the palette only if the wallpaper changed since the last run"""
+    key = stat_key(WALLPAPER)
+    if key is None:
+        return False
+    if not force and state.get('wallpaper') == key and (WAL_DIR / "colors.json").exists():
+        return False
+    digest = file_hash(WALLPAPER)
+    if not force and state.get('wallpaper_hash') == digest and (WAL_DIR / "colors.json").exists():
+        state['wallpaper'] = key  # Touched but identical
+        return False
+    try:
+        import palette
+        palette.generate(WALLPAPER)
+    except ImportError:
+        # No numpy/Pillow: let wal do the extraction (-n: hyprpaper sets the wallpaper)
+        result = subprocess.run(["wal", "-i", str(WALLPAPER), "--cols16", "-n", "-q"])
+        if result.returncode != 0:
+            print(f"themesync: wal exited with {result.returncode}", file=sys.stderr)
+            return False
+    state['wallpaper'] = key
+    state['wallpaper_hash'] = digest
+    return True
+
+def sync_target(name, state, force=False):
+    """
+    Copy one wal output to its destination if the content differs.
+    Returns (name, new state entry, changed).
+    """
+    source = WAL_DIR / name
+    dest, _consumer = TARGETS[name]
+    entry = state.get(name, {})
+    source_key, dest_key = stat_key(source), stat_key(dest)
+    if source_key is None:
+        return name, entry, False
+    # Fast path: neither side was touched since we last wrote it
+    if not force and entry.get('source') == source_key and entry.get('dest') == dest_key:
+        return name, entry, False
+
+    with open(source, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha1(data).hexdigest()
+    changed = force or dest_key is None or digest != entry.get('hash') or file_hash(dest) != digest
+    if changed:
+        atomic_write(dest, data)
+    return name, {'source': source_key, 'dest': stat_key(dest), 'hash': digest}, changed
+
+def find_pids(name):
+    """PIDs of this user's processes whose comm is `name`"""
+    uid = os.getuid()
+    pids = []
+    for entry in os.scandir("/proc"):
+        if not entry.name.isdigit():
+            continue
+        try:
+            if entry.stat().st_uid != uid:
+                continue
+            with open(f"/proc/{entry.name}/comm") as f:
+                if f.read().strip() == name:
+                    pids.append(int(entry.name))
+        except OSError:
+            continue
+    return pids
+
+def signal_all(name, sig):
+    for pid in find_pids(name):
+        try:
+            os.kill(pid, sig)
+        except OSError:
+            pass
+
+def reload_consumers(consumers):
+    if 'kitty' in consumers:
+        signal_all("kitty", signal.SIGUSR1)
+    if 'waybar' in consumers:
+        signal_all("waybar", signal.SIGUSR2)
+    if 'hyprland' in consumers:
+        try:
+            hypripc.request("reload")
+        except hypripc.HyprlandError as e:
+            print(f"themesync: {e}", file=sys.stderr)
+    try:
+        subprocess.Popen(["pywalfox", "update"],
+                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except FileNotFoundError:
+        pass
+
+def sync(force=False):
+    """Run wal if needed, propagate changed files and reload their consumers"""
+    state = load_state()
+    before = json.dumps(state, sort_keys=True)
+    run_wal(state, force)
+
+    with ThreadPoolExecutor(max_workers=len(TARGETS)) as pool:
+        results = list(pool.map(lambda name: sync_target(name, state, force), TARGETS))
+
+    consumers = set()
+    for name, entry, changed in results:
+        state[name] = entry
+        if changed:
+            consumers.add(TARGETS[name][1])
+            print(f"themesync: updated {TARGETS[name][0]}", file=sys.stderr)
+    if consumers:
+        reload_consumers(consumers)
+    if json.dumps(state, sort_keys=True) != before:
+        save_state(state)
+    return consumers
+
+def watch(force=False):
+    """Sync on every change to the wal cache or the wallpaper"""
+    sync(force)
+    inotify = Inotify()
+    WAL_DIR.mkdir(parents=True, exist_ok=True)
+    inotify.add_watch(WAL_DIR)
+    if WALLPAPER.parent.is_dir():
+        inotify.add_watch(WALLPAPER.parent)
+    watched = {WAL_DIR.name, WALLPAPER.name, *TARGETS}
+    poller = select.poll()
+    poller.register(inotify.fileno(), select.POLLIN)
+
+    while True:
+        poller.poll()
+        relevant = any(name in watched for _path, name, _mask in inotify.read())
+        # Coalesce the rest of the burst before syncing
+        while poller.poll(DEBOUNCE * 1000):
+            relevant |= any(name in watched for _path, name, _mask in inotify.read())
+        if relevant:
+            sync()
+
+def main():
+    force = '--force' in sys.argv
+    try:
+        if '--watch' in sys.argv:
+            watch(force)
+        else:
+            sync(force)
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+
+# Opt-in phase tracing for the GTK scripts
+# Set NEON_TRACE to a file path to record where startup and fetch time goes:
+#   NEON_TRACE=/tmp/binds.json   Chrome trace (open in chrome://tracing or Perfetto)
+#   NEON_TRACE=/tmp/binds.jsonl  One JSON object per event, appended as it happens
+# Timestamps are CLOCK_BOOTTIME microseconds, the clock /proc/<pid>/stat uses,
+# so the process exec shows up as the first event and every phase lines up
+# against it (interpreter start and the gi import included).
+#
+# With NEON_TRACE unset, traced() hands back the undecorated function, span()
+# returns a shared no-op context manager and first_draw() does nothing.
+
+import json
+import os
+import threading
+import time
+
+TRACE_FILE = os.environ.get("NEON_TRACE")
+ENABLED = bool(TRACE_FILE)
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+def _now_us():
+    return time.clock_gettime_ns(time.CLOCK_BOOTTIME) // 1000
+
+class _Recorder:
+    def __init__(self, path):
+        self.path = path
+        self.chrome = not path.endswith(".jsonl")
+        self.lock = threading.Lock()
+        self.events = []
+        self.pid = os.getpid()
+        if not self.chrome:
+            self.file = open(path, "a", buffering=1)
+
+    def emit(self, name, phase, ts, dur=None, args=None):
+        event = {'name': name, 'ph': phase, 'ts': ts, 'pid': self.pid,
+                 'tid': threading.get_native_id()}
+        if dur is not None:
+            event['dur'] = dur
+        if args:
+            event['args'] = args
+        with self.lock:
+            if self.chrome:
+                self.events.append(event)
+            else:
+                self.file.write(json.dumps(event) + "\n")
+
+    def flush(self):
+        if self.chrome:
+            with self.lock:
+                with open(self.path, "w") as f:
+                    json.dump({'traceEvents': self.events, 'displayTimeUnit': 'ms'}, f)
+        else:
+            self.file.flush()
+
+class _Span:
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = _now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        args = self.args
+        if exc_type is not None:
+            args = dict(args or {}, error=exc_type.__name__)
+        _recorder.emit(self.name, 'X', self.start, _now_us() - self.start, args)
+        return False
+
+def span(name, **args):
+    """Context manager timing one phase"""
+    if not ENABLED:
+        return _NULL_SPAN
+    return _Span(name, args)
+
+def instant(name, **args):
+    """A point-in-time marker"""
+    if ENABLED:
+        _recorder.emit(name, 'i', _now_us(), args=args)
+
+def traced(name=None):
+    """Decorator recording each call as a span; returns the function untouched when disabled"""
+    def decorate(func):
+        if not ENABLED:
+            return func
+        label = name or func.__qualname__
+
+        def wrapper(*args, **kwargs):
+            with _Span(label, None):
+                return func(*args, **kwargs)
+        wrapper.__name__ = func.__name__
+        wrapper.__qualname__ = func.__qualname__
+        wrapper.__doc__ = func.__doc__
+        return wrapper
+    return decorate
+
+def first_draw(widget, name):
+    """Span from now until the widget's first draw signal"""
+    if not ENABLED:
+        return
+    start = _now_us()
+
+    def on_draw(w, cr):
+        _recorder.emit(f"{name}: first frame", 'X', start, _now_us() - start)
+        w.disconnect(handler)
+        _recorder.flush()  # Resident windows (popups.py) may never reach atexit
+        return False
+    handler = widget.connect("draw", on_draw)
+
+def flush():
+    """Write out buffered events (Chrome format writes the whole file each time)"""
+    if ENABLED:
+        _recorder.flush()
+
+def exec_time_us():
+    """When this process was exec'd, in CLOCK_BOOTTIME microseconds"""
+    with open("/proc/self/stat") as f:
+        # Field 22 (starttime) counts clock ticks since boot; skip past "(comm)"
+        start_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+    return start_ticks * 1_000_000 // os.sysconf('SC_CLK_TCK')
+
+def process_age():
+    """Seconds since this process was exec'd, interpreter startup included"""
+    return (_now_us() - exec_time_us()) / 1_000_000
+
+if ENABLED:
+    import atexit
+    import sys
+    _recorder = _Recorder(TRACE_FILE)
+    _exec = exec_time_us()
+    _recorder.emit("process_name", 'M', 0, args={'name': os.path.basename(sys.argv[0]) or "python"})
+    _recorder.emit("exec -> tracing import", 'X', _exec, _now_us() - _exec)
+    atexit.register(flush)
@@ -1,4 +1,4 @@
 #!/bin/bash
 
-killall waybar
-waybar
+# Reload a running waybar in place (config + style), start it otherwise
+pkill -x -USR2 waybar || waybar
@@ -131,6 +131,10 @@ sudo cp -r /home/$USER/dots/hypr/bg/bg.jpg /usr/share/bg/
 sudo cp -r /home/$USER/dots/.icons/oomox-anime_room /usr/share/icons/
 sudo cp -r /home/$USER/dots/.themes/oomox-anime_room /usr/share/themes/
 
+# Icon caches, so GTK doesn't scan the theme's ~7,000 icons on every start
+python3 /home/$USER/dots/scripts/iconcache.py /home/$USER/dots/.icons/oomox-anime_room
+sudo python3 /home/$USER/dots/scripts/iconcache.py /usr/share/icons/oomox-anime_room
+
 #-----Apply-Theme-----#
 echo "Applying Theme"
 Sleep 3